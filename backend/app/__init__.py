@@ -6,7 +6,10 @@ from dotenv import load_dotenv
 import importlib
 import logging
 
-db = SQLAlchemy()
+from app.utils.database import RoutingSession, check_replica, database_config, init_engines
+
+# Reads during GET requests may go to a replica bind (see app/utils/database.py)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 def create_app():
     app = Flask(__name__)
@@ -14,12 +17,27 @@ def create_app():
     # Configuration
     load_dotenv()
     app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
-    app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///policypulse.db')
+    # Primary database, optional read replica, and engine options for each
+    app.config.update(database_config(
+        os.environ.get('DATABASE_URL', 'sqlite:///policypulse.db'),
+        os.environ.get('DATABASE_REPLICA_URL'),
+    ))
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     
     # Initialize extensions
     db.init_app(app)
-    CORS(app)
+    init_engines(app, db)
+    # Freshness headers of /api/policies/recent must be readable by the dashboard
+    CORS(app, expose_headers=['X-Data-Age', 'X-Refresh-In-Progress'])
+
+    # Topic mention counters are written from background scrapes too
+    from app.services.mention_counter import mention_counter
+    mention_counter.init_app(app)
+    # Models for the write-maintained policy counters must exist before create_all
+    from app.services.policy_stats import policy_stats
+    # Policy source text is written to the compressed blob store on flush
+    from app.services.policy_text_store import policy_text_store
+    policy_text_store.init_app(app)
     
     # Register blueprints
     from app.routes.policies import policies_bp
@@ -78,6 +96,24 @@ def create_app():
     
     # Create tables
     with app.app_context():
-        db.create_all()
+        # Schema changes go to the primary only; a replica gets them through replication
+        db.create_all(bind_key=None)
+        # create_all skips existing tables; add columns and indexes declared since they were created
+        from app.utils.schema import ensure_columns, ensure_indexes
+        ensure_columns(db)
+        ensure_indexes(db)
+    
+    # Full-text index for /api/policies/search (FTS5 on SQLite, tsvector on Postgres)
+    from app.services.policy_search import init_search_index
+    init_search_index(app)
+    # Only once the primary's schema is complete: the replica must have all of it
+    check_replica(app, db)
+    
+    # Counters behind /api/policies/stats and /ministries, kept current on every flush
+    policy_stats.init_app(app)
+
+    # /api/policies/recent refreshes stale policy data on a background thread
+    from app.services.policy_ingest import policy_refresher
+    policy_refresher.init_app(app)
     
     return app
@@ -1,9 +1,14 @@
 from app import db
 from datetime import datetime
+from sqlalchemy.orm import deferred
 import json
 
 class PolicyCard(db.Model):
     __tablename__ = 'policy_cards'
+    __table_args__ = (
+        # Keyset pagination walks (publication_date, id) newest first
+        db.Index('ix_policy_cards_publication_date_id', 'publication_date', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(500), nullable=False)
@@ -13,7 +18,12 @@ class PolicyCard(db.Model):
     effective_date = db.Column(db.DateTime)
     
     # Policy content
-    original_text = db.Column(db.Text)
+    # Full gazette text can run to megabytes and to_dict never emits it. It is
+    # stored compressed in policy_text_blobs under its SHA-256 (see the
+    # original_text property and services/policy_text_store.py); the legacy
+    # column only holds text written before that, until it is migrated.
+    _legacy_text = deferred(db.Column('original_text', db.Text))
+    text_sha256 = db.Column(db.String(64), index=True)
     summary_english = db.Column(db.Text)
     summary_nepali = db.Column(db.Text)
     
@@ -35,36 +45,64 @@ class PolicyCard(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    def to_dict(self):
-        """Convert policy card to dictionary for JSON serialization"""
+    # Exactly the columns serialize() reads; list queries select only these
+    SERIALIZED_COLUMNS = (
+        'id', 'title', 'ministry', 'notification_number', 'publication_date', 'effective_date',
+        'summary_english', 'summary_nepali', 'what_changed', 'who_affected', 'what_to_do',
+        'source_url', 'gazette_type', 'status', 'missing_dates', 'missing_officer_info',
+        'missing_urls', 'created_at', 'updated_at',
+    )
+
+    @classmethod
+    def serialized_columns(cls):
+        return [getattr(cls, name) for name in cls.SERIALIZED_COLUMNS]
+
+    @staticmethod
+    def serialize(p):
+        """JSON-ready dict from a PolicyCard or a row of serialized_columns()"""
         return {
-            'id': self.id,
-            'title': self.title,
-            'ministry': self.ministry,
-            'notification_number': self.notification_number,
-            'publication_date': self.publication_date.isoformat() if self.publication_date else None,
-            'effective_date': self.effective_date.isoformat() if self.effective_date else None,
+            'id': p.id,
+            'title': p.title,
+            'ministry': p.ministry,
+            'notification_number': p.notification_number,
+            'publication_date': p.publication_date.isoformat() if p.publication_date else None,
+            'effective_date': p.effective_date.isoformat() if p.effective_date else None,
             'summary': {
-                'english': self.summary_english,
-                'nepali': self.summary_nepali
+                'english': p.summary_english,
+                'nepali': p.summary_nepali
             },
             'details': {
-                'what_changed': self.what_changed,
-                'who_affected': self.who_affected,
-                'what_to_do': self.what_to_do
+                'what_changed': p.what_changed,
+                'who_affected': p.who_affected,
+                'what_to_do': p.what_to_do
             },
-            'source_url': self.source_url,
-            'gazette_type': self.gazette_type,
-            'status': self.status,
+            'source_url': p.source_url,
+            'gazette_type': p.gazette_type,
+            'status': p.status,
             'operational_gaps': {
-                'missing_dates': self.missing_dates,
-                'missing_officer_info': self.missing_officer_info,
-                'missing_urls': self.missing_urls
+                'missing_dates': p.missing_dates,
+                'missing_officer_info': p.missing_officer_info,
+                'missing_urls': p.missing_urls
             },
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': p.created_at.isoformat() if p.created_at else None,
+            'updated_at': p.updated_at.isoformat() if p.updated_at else None
         }
     
+    @property
+    def original_text(self):
+        """Source text, decompressed from the blob store on first access"""
+        from app.services.policy_text_store import policy_text_store
+        return policy_text_store.text_of(self)
+
+    @original_text.setter
+    def original_text(self, value):
+        from app.services.policy_text_store import policy_text_store
+        policy_text_store.assign(self, value)
+
+    def to_dict(self):
+        """Convert policy card to dictionary for JSON serialization"""
+        return self.serialize(self)
+
     def __repr__(self):
         return f'<PolicyCard {self.notification_number}: {self.title[:50]}...>'
 
@@ -73,6 +111,9 @@ from datetime import datetime as _dt_rti
 
 class UserComplaint(db.Model):
     __tablename__ = 'user_complaints'
+    __table_args__ = (
+        db.Index('ix_user_complaints_created_at_id', 'created_at', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     url = db.Column(db.String(1000), nullable=False)
@@ -0,0 +1,36 @@
+from app import db
+from datetime import datetime
+
+
+class PolicyAggregate(db.Model):
+    """A named policy counter (total, with_gaps, missing_dates, ...) maintained on write"""
+    __tablename__ = 'policy_aggregates'
+
+    key = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<PolicyAggregate {self.key}={self.value}>'
+
+
+class MinistryPolicyCount(db.Model):
+    """Number of policy cards per ministry; rows at zero are kept and filtered on read"""
+    __tablename__ = 'ministry_policy_counts'
+
+    ministry = db.Column(db.String(200), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<MinistryPolicyCount {self.ministry}: {self.count}>'
+
+
+class PolicyDailyCount(db.Model):
+    """Number of policy cards published on each day (by publication_date)"""
+    __tablename__ = 'policy_daily_counts'
+
+    day = db.Column(db.Date, primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<PolicyDailyCount {self.day}: {self.count}>'
@@ -0,0 +1,21 @@
+from app import db
+from datetime import datetime
+
+
+class PolicyTextBlob(db.Model):
+    """Compressed policy source text, stored once per distinct content.
+    Keyed by the SHA-256 of the UTF-8 text, so identical documents share a row.
+    """
+    __tablename__ = 'policy_text_blobs'
+
+    sha256 = db.Column(db.String(64), primary_key=True)
+    codec = db.Column(db.String(10), nullable=False)  # zstd, zlib
+    length = db.Column(db.Integer, nullable=False)  # characters once decompressed
+    raw_bytes = db.Column(db.Integer, nullable=False)
+    stored_bytes = db.Column(db.Integer, nullable=False)
+    data = db.Column(db.LargeBinary, nullable=False)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<PolicyTextBlob {self.sha256[:12]} {self.codec} {self.stored_bytes}/{self.raw_bytes}B>'
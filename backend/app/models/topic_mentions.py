@@ -0,0 +1,31 @@
+from app import db
+from datetime import datetime
+
+
+class TopicMentionBucket(db.Model):
+    """Mentions of one topic by one audience within one hour (bucket_start is the UTC hour)"""
+    __tablename__ = 'topic_mention_buckets'
+    __table_args__ = (
+        db.UniqueConstraint('topic', 'audience', 'bucket_start', name='uq_topic_mention_bucket'),
+        # Window rollups are a range scan on bucket_start grouped by topic and audience
+        db.Index('ix_topic_mentions_bucket_start', 'bucket_start', 'topic', 'audience'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    topic = db.Column(db.String(100), nullable=False)
+    audience = db.Column(db.String(20), nullable=False)  # youth, political
+    bucket_start = db.Column(db.DateTime, nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'topic': self.topic,
+            'audience': self.audience,
+            'bucket_start': self.bucket_start.isoformat() if self.bucket_start else None,
+            'count': self.count,
+        }
+
+    def __repr__(self):
+        return f'<TopicMentionBucket {self.topic}/{self.audience} @ {self.bucket_start}: {self.count}>'
@@ -1,12 +1,16 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from flask import Response, stream_with_context
 import requests
-from bs4 import BeautifulSoup
 import re
 import time
-import random
 from datetime import datetime
 import os
+from app.services.topic_taxonomy import youth_keyword_matcher
+from app.services.topic_scoring import score_topics
+from app.services.rss_reader import read_feed
+from app.services.mention_counter import WINDOWS, mention_counter
+from app.utils.refresh_cache import RefreshingCache
+from app.services.stream_deltas import DeltaPublisher
 
 missing_topics_bp = Blueprint('missing_topics', __name__)
 
@@ -52,17 +56,19 @@ def try_scrape_real_data():
     }
     
     scraped_topics = []
+    # Clean texts already collected; set lookups keep dedup O(1) per item
+    seen_texts = set()
     successful_sources = []
     successful_source_links = []
     
     for source in accessible_sources:
         try:
             print(f"Trying {source['name']}...")
-            response = requests.get(source['url'], headers=headers, timeout=10)
-            response.raise_for_status()
             
             # Parse content based on type
             if source['type'] == 'reddit_json':
+                response = requests.get(source['url'], headers=headers, timeout=10)
+                response.raise_for_status()
                 try:
                     data = response.json()
                     posts = data.get('data', {}).get('children', [])
@@ -80,21 +86,15 @@ def try_scrape_real_data():
                             clean_content = re.sub(r'[^\w\s-]', '', content)
                             clean_content = re.sub(r'\s+', ' ', clean_content).strip()
                             
-                            if clean_content and clean_content not in [t['text'] for t in scraped_topics]:
+                            if clean_content and clean_content not in seen_texts:
                                 # Extract youth-relevant keywords
-                                youth_keywords = ['student', 'youth', 'teenager', 'young', 'college', 'university', 'school',
-                                               'education', 'job', 'career', 'future', 'dream', 'aspiration', 'startup',
-                                               'entrepreneur', 'technology', 'social media', 'mental health', 'climate',
-                                               'environment', 'politics', 'government', 'policy', 'reform', 'change']
-                                
-                                content_lower = content.lower()
-                                found_keywords = [kw for kw in youth_keywords if kw in content_lower]
+                                found_keywords = youth_keyword_matcher.find(content)
                                 
                                 # Only include posts with youth relevance
                                 if found_keywords:
+                                    seen_texts.add(clean_content)
                                     scraped_topics.append({
                                         'text': clean_content[:200],  # Limit length
-                                        'value': random.randint(20, 50),
                                         'source': source['name'],
                                         'score': post.get('score', 0),
                                         'keywords': found_keywords
@@ -104,23 +104,18 @@ def try_scrape_real_data():
                     continue
                         
             else:
-                # Parse RSS/XML content
-                soup = BeautifulSoup(response.content, 'xml')
-                
-                # Look for titles in RSS feeds
-                titles = soup.find_all(['title', 'headline'])
-                
-                for title in titles[:10]:  # Limit to prevent spam
-                    title_text = title.get_text(strip=True)
+                # Stream RSS/Atom items; the download stops after the first 10
+                for item in read_feed(source['url'], max_items=10, headers=headers):
+                    title_text = item['title']
                     if len(title_text) > 10 and len(title_text) < 200:
                         # Clean up the title
                         clean_title = re.sub(r'[^\w\s-]', '', title_text)
                         clean_title = re.sub(r'\s+', ' ', clean_title).strip()
                         
-                        if clean_title and clean_title not in [t['text'] for t in scraped_topics]:
+                        if clean_title and clean_title not in seen_texts:
+                            seen_texts.add(clean_title)
                             scraped_topics.append({
                                 'text': clean_title,
-                                'value': random.randint(15, 45),
                                 'source': source['name']
                             })
             
@@ -226,79 +221,130 @@ def build_topic_description(topic: str, youth_mentions: int, politician_mentions
     except Exception:
         return f"{topic}: Context summary unavailable."
 
+# Scraping all feeds takes 25s+, so requests are served from a cache refreshed in the background
+MISSING_TOPICS_TTL = int(os.getenv('MISSING_TOPICS_TTL', '900'))
+# How soon to retry when no live result has been scraped yet
+MISSING_TOPICS_RETRY_TTL = int(os.getenv('MISSING_TOPICS_RETRY_TTL', '120'))
+MISSING_TOPICS_BACKGROUND_REFRESH = os.getenv('MISSING_TOPICS_BACKGROUND_REFRESH', 'true').lower() == 'true'
+
+
+def build_missing_topics_payload():
+    """Scrape and score live headlines, or fall back to curated data"""
+    # First, try to scrape real data
+    success, scraped_data, source_info, source_links = try_scrape_real_data()
+    
+    if success and len(scraped_data) > 5:
+        print(f"Successfully scraped data from: {source_info}")
+        # Feed the hourly topic counters used by windowed queries
+        mention_counter.record_headlines(scraped_data)
+        
+        # Deterministic TF-IDF scoring, one row per cluster of near-identical headlines
+        comparison = []
+        for row in score_topics(scraped_data):
+            comparison.append({
+                'topic': row['topic'],
+                'youth_mentions': row['youth_mentions'],
+                'politician_mentions': row['politician_mentions'],
+                'gap_score': row['gap_score'],
+                'description': build_topic_description(
+                    row['topic'], row['youth_mentions'], row['politician_mentions'], row['frequency']
+                ),
+                'data_source': 'live_scraped'
+            })
+        
+        return {
+            'data': comparison,
+            'metadata': {
+                'timestamp': datetime.now().isoformat(),
+                'data_source': 'live_scraped',
+                'sources': source_info,
+                'source_links': source_links,
+                'note': 'Data scraped from live RSS feeds and news sources'
+            }
+        }
+    
+    # Fall back to curated data
+    print("Live scraping failed or insufficient data, using fallback")
+    fallback_data, source_info = get_fallback_data()
+    # Enrich with descriptions
+    for t in fallback_data:
+        t['description'] = build_topic_description(t['topic'], t.get('youth_mentions', 0), t.get('politician_mentions', 0))
+    return {
+        'data': fallback_data,
+        'metadata': {
+            'timestamp': datetime.now().isoformat(),
+            'data_source': 'curated_fallback',
+            'sources': source_info,
+            'source_links': [],
+            'note': 'Live scraping unavailable. Using curated data based on current Indian political and youth issues.'
+        }
+    }
+
+
+MISSING_TOPICS_CHANNEL = 'missing_topics'
+# Stream subscribers get rank and count changes per topic rather than the whole list
+missing_topics_publisher = DeltaPublisher(MISSING_TOPICS_CHANNEL, ('data',), key=lambda row: row['topic'])
+
+
+def publish_missing_topics(payload):
+    """Push a freshly scraped payload to /api/stream/missing-topics subscribers"""
+    missing_topics_publisher.publish(payload)
+
+
+# A curated fallback never replaces the last live result
+missing_topics_cache = RefreshingCache(
+    build_missing_topics_payload,
+    ttl=MISSING_TOPICS_TTL,
+    retry_ttl=MISSING_TOPICS_RETRY_TTL,
+    is_good=lambda payload: payload['metadata']['data_source'] == 'live_scraped',
+    name='missing_topics',
+    background=MISSING_TOPICS_BACKGROUND_REFRESH,
+    on_refresh=publish_missing_topics
+)
+
+
+def windowed_topics_payload(window):
+    """Topic gaps for a 24h/7d/30d window from the stored mention counters, or None if empty"""
+    rows = mention_counter.rollup(window)
+    if not rows:
+        return None
+    for row in rows:
+        row['description'] = build_topic_description(
+            row['topic'], row['youth_mentions'], row['politician_mentions'], row['frequency']
+        )
+        row['data_source'] = 'mention_counters'
+    return {
+        'data': rows,
+        'metadata': {
+            'timestamp': datetime.now().isoformat(),
+            'data_source': 'mention_counters',
+            'window': window,
+            'note': f'Topic mentions counted from every scrape over the last {window}'
+        }
+    }
+
+
 @missing_topics_bp.route('', methods=['GET'])
 def get_missing_topics():
     print(f"API called at {datetime.now()}")
     
     try:
-        # First, try to scrape real data
-        success, scraped_data, source_info, source_links = try_scrape_real_data()
+        window = request.args.get('window')
+        if window:
+            if window not in WINDOWS:
+                return jsonify({'error': f"window must be one of {', '.join(WINDOWS)}"}), 400
+            payload = windowed_topics_payload(window)
+            if payload:
+                return jsonify(payload)
         
-        if success and len(scraped_data) > 5:
-            print(f"Successfully scraped data from: {source_info}")
-            
-            # Process scraped data into comparison format
-            comparison = []
-            for item in scraped_data:
-                # Simulate youth vs politician mentions based on topic keywords
-                topic_text = item['text'].lower()
-                
-                # Youth-relevant keywords
-                youth_keywords = ['student', 'job', 'education', 'climate', 'mental health', 
-                                'social media', 'technology', 'startup', 'youth']
-                
-                # Political keywords  
-                political_keywords = ['government', 'minister', 'policy', 'parliament', 
-                                    'election', 'budget', 'scheme', 'law']
-                
-                youth_relevance = sum(1 for kw in youth_keywords if kw in topic_text)
-                political_relevance = sum(1 for kw in political_keywords if kw in topic_text)
-                
-                youth_score = random.randint(20, 50) + (youth_relevance * 8)
-                political_score = random.randint(15, 40) + (political_relevance * 6)
-                
-                ym = min(youth_score, 60)
-                pm = min(political_score, 50)
-                comparison.append({
-                    'topic': item['text'],
-                    'youth_mentions': ym,
-                    'politician_mentions': pm,
-                    'gap_score': ym - pm,
-                    'description': build_topic_description(item['text'], ym, pm),
-                    'data_source': 'live_scraped'
-                })
-            
-            # Sort by gap score
-            comparison.sort(key=lambda x: x['gap_score'], reverse=True)
-            
-            return jsonify({
-                'data': comparison,
-                'metadata': {
-                    'timestamp': datetime.now().isoformat(),
-                    'data_source': 'live_scraped',
-                    'sources': source_info,
-                    'source_links': source_links,
-                    'note': 'Data scraped from live RSS feeds and news sources'
-                }
-            })
+        payload, cache_info = missing_topics_cache.get()
+        if payload is None:
+            raise RuntimeError(cache_info.get('last_error') or 'No missing topics data available')
         
-        else:
-            # Fall back to curated data
-            print("Live scraping failed or insufficient data, using fallback")
-            fallback_data, source_info = get_fallback_data()
-            # Enrich with descriptions
-            for t in fallback_data:
-                t['description'] = build_topic_description(t['topic'], t.get('youth_mentions', 0), t.get('politician_mentions', 0))
-            return jsonify({
-                'data': fallback_data,
-                'metadata': {
-                    'timestamp': datetime.now().isoformat(),
-                    'data_source': 'curated_fallback',
-                    'sources': source_info,
-                    'source_links': [],
-                    'note': 'Live scraping unavailable. Using curated data based on current Indian political and youth issues.'
-                }
-            })
+        return jsonify({
+            'data': payload['data'],
+            'metadata': dict(payload['metadata'], cache=cache_info)
+        })
             
     except Exception as e:
         print(f"Error in get_missing_topics: {e}")
@@ -1,10 +1,16 @@
 from flask import Blueprint, request, jsonify, current_app
 from app.models.policy import PolicyCard, UserComplaint, RTIRequest
-from app.services.policy_fetcher import GovernmentPolicyFetcher
-from app.services.policy_summarizer import PolicySummarizer
 from app.services.policy_service import EnhancedPolicyService
 from app.services.gemini_gap_analyzer import GeminiGapAnalyzer
 from app.services.live_policy_fetcher import LiveGovernmentDataFetcher
+from app.services.pdf_ingest import fetch_pdf_text, looks_like_pdf
+from app.services.policy_stats import policy_stats
+from app.services.policy_ingest import policy_refresher
+from app.services.policy_text_store import policy_text_store
+from app.services.policy_search import search_backend, search_policies as run_policy_search
+from app.utils.pagination import InvalidCursor, keyset_page, page_metadata, page_size
+from app.utils.conditional import add_validators, is_not_modified, make_etag, not_modified
+from app.utils.database import replica_reads
 from app import db
 from datetime import datetime, timedelta
 import logging
@@ -22,72 +28,80 @@ except Exception:
 
 policies_bp = Blueprint('policies', __name__)
 
+# Polled listings always revalidate (a 304 is cheap); slower-moving data may be reused for a while
+RECENT_CACHE_CONTROL = 'public, no-cache'
+STATS_CACHE_CONTROL = 'public, no-cache'
+MINISTRIES_CACHE_CONTROL = 'public, max-age=300'
+POLICY_CACHE_CONTROL = 'public, max-age=60'
+# /recent freshness travels in headers, which a 304 updates on the client's cached copy; a body field would go stale
+DATA_AGE_HEADER = 'X-Data-Age'
+REFRESH_HEADER = 'X-Refresh-In-Progress'
+
+
+def _clock_bucket(unit: str) -> datetime:
+    """Start of the current UTC hour or day, for responses that change with time as well as data"""
+    now = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+    return now.replace(hour=0) if unit == 'day' else now
+
+
+def _with_freshness(response, freshness):
+    if freshness['data_age'] is not None:
+        response.headers[DATA_AGE_HEADER] = str(freshness['data_age'])
+    response.headers[REFRESH_HEADER] = 'true' if freshness['refresh_in_progress'] else 'false'
+    return response
+
+
+def _listing_validators(name, bucket=None, *parts):
+    """ETag and Last-Modified for a response built from policy data, from the generation counter"""
+    generation, modified = policy_stats.version()
+    if bucket is not None:
+        modified = max(modified, bucket) if modified else bucket
+    return make_etag(name, generation, bucket.isoformat() if bucket else '', *parts), modified
+
+
 @policies_bp.route('/recent', methods=['GET'])
+@replica_reads
 def get_recent_policies():
-    """Get recent policy cards from this week"""
+    """Get recent policy cards from this week, a page at a time (?cursor=, ?limit=).
+    X-Data-Age is seconds since the last ingest; X-Refresh-In-Progress is true while one runs.
+    Both are sent with 304s too, so they stay current while the cached page is reused.
+    """
     try:
         days_back = request.args.get('days', 7, type=int)
-        # Prefer entries created recently to avoid refetching on every load
-        cached_policies = PolicyCard.query.filter(
-            PolicyCard.created_at >= datetime.utcnow() - timedelta(days=1)
-        ).order_by(PolicyCard.publication_date.desc()).all()
-
-        if not cached_policies:
-            # Fetch fresh
-            fetcher = GovernmentPolicyFetcher()
-            new_policies = fetcher.fetch_recent_policies(days_back)
-
-            summarizer = PolicySummarizer()
-            for policy_data in new_policies:
-                existing_policy = PolicyCard.query.filter_by(
-                    notification_number=policy_data['notification_number']
-                ).first()
-                if existing_policy:
-                    continue
-
-                summary_card = summarizer.generate_policy_card(
-                    policy_data.get('original_text', ''),
-                    policy_data['title']
-                )
-                if not summary_card:
-                    continue
-
-                policy = PolicyCard(
-                    title=policy_data['title'],
-                    ministry=policy_data['ministry'],
-                    notification_number=policy_data['notification_number'],
-                    publication_date=policy_data['publication_date'],
-                    effective_date=policy_data.get('effective_date'),
-                    original_text=policy_data.get('original_text'),
-                    summary_english=summary_card['summary_english'],
-                    summary_nepali=summary_card['summary_nepali'],
-                    what_changed=summary_card['what_changed'],
-                    who_affected=summary_card['who_affected'],
-                    what_to_do=summary_card['what_to_do'],
-                    source_url=policy_data.get('source_url'),
-                    gazette_type=policy_data.get('gazette_type', 'Ordinary'),
-                    status=policy_data.get('status', 'New'),
-                    missing_dates=policy_data.get('missing_dates', False),
-                    missing_officer_info=policy_data.get('missing_officer_info', False),
-                    missing_urls=policy_data.get('missing_urls', False)
-                )
-                db.session.add(policy)
-
-            db.session.commit()
-            cached_policies = PolicyCard.query.filter(
-                PolicyCard.publication_date >= datetime.utcnow() - timedelta(days=days_back)
-            ).order_by(PolicyCard.publication_date.desc()).all()
-
-        policy_cards = [p.to_dict() for p in cached_policies]
-        return jsonify({'success': True, 'count': len(policy_cards), 'policies': policy_cards})
-
+        limit = page_size(request.args.get('limit', type=int))
+        cursor = request.args.get('cursor')
+        # Serve what is stored; stale data is refreshed in the background, never inside the request
+        freshness = policy_refresher.refresh_if_stale()
+
+        # The window slides with the clock, so the tag also changes hourly
+        etag, modified = _listing_validators('recent', _clock_bucket('hour'), days_back, limit, cursor or '')
+        if is_not_modified(etag, modified):
+            return _with_freshness(not_modified(etag, modified, RECENT_CACHE_CONTROL), freshness)
+
+        # Plain rows of the serialized columns: no original_text, no ORM objects
+        window = db.session.query(*PolicyCard.serialized_columns()).filter(
+            PolicyCard.publication_date >= datetime.utcnow() - timedelta(days=days_back)
+        )
+        rows, next_cursor = keyset_page(
+            window, [PolicyCard.publication_date, PolicyCard.id], f'recent:{days_back}', cursor, limit
+        )
+        policy_cards = [PolicyCard.serialize(row) for row in rows]
+        response = jsonify(dict({'success': True, 'count': len(policy_cards), 'policies': policy_cards},
+                                **page_metadata(next_cursor, limit)))
+        return _with_freshness(add_validators(response, etag, modified, RECENT_CACHE_CONTROL), freshness)
+
+    except InvalidCursor as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         logging.error(f"Error fetching policies: {e}")
         return jsonify({'success': False, 'error': 'Failed to fetch policy data'}), 500
 
 
 def scrape_policy_from_url(url: str) -> str:
-    """Extract main article text from a policy URL using newspaper3k, fallback to requests+BeautifulSoup."""
+    """Extract main text from a policy URL. PDFs are streamed page by page through pdf_ingest;
+    HTML uses newspaper3k, falling back to requests+BeautifulSoup."""
+    if looks_like_pdf(url):
+        return fetch_pdf_text(url)
     try:
         if NEWSPAPER_AVAILABLE:
             art = Article(url)
@@ -99,9 +113,13 @@ def scrape_policy_from_url(url: str) -> str:
         pass
     try:
         headers = {'User-Agent': os.getenv('SCRAPING_USER_AGENT', 'CivicLens-PolicyBot/1.0')}
-        r = requests.get(url, timeout=20, headers=headers)
+        r = requests.get(url, timeout=20, headers=headers, stream=True)
         if r.status_code != 200:
+            r.close()
             return ''
+        # Gazette links often serve PDFs without a .pdf extension
+        if looks_like_pdf(url, r.headers.get('Content-Type')):
+            return fetch_pdf_text(url, response=r)
         from bs4 import BeautifulSoup
         soup = BeautifulSoup(r.text, 'lxml')
         paras = [p.get_text(strip=True) for p in soup.find_all('p')]
@@ -114,45 +132,9 @@ def scrape_policy_from_url(url: str) -> str:
 def refresh_policies():
     """Manually refresh policy data"""
     try:
-        fetcher = GovernmentPolicyFetcher()
-        policies = fetcher.fetch_recent_policies(days_back=7)
-        summarizer = PolicySummarizer()
-        new_count = 0
-        for policy_data in policies:
-            existing_policy = PolicyCard.query.filter_by(
-                notification_number=policy_data['notification_number']
-            ).first()
-            if existing_policy:
-                continue
-            summary_card = summarizer.generate_policy_card(
-                policy_data.get('original_text', ''),
-                policy_data['title']
-            )
-            if not summary_card:
-                continue
-            policy = PolicyCard(
-                title=policy_data['title'],
-                ministry=policy_data['ministry'],
-                notification_number=policy_data['notification_number'],
-                publication_date=policy_data['publication_date'],
-                effective_date=policy_data.get('effective_date'),
-                original_text=policy_data.get('original_text'),
-                summary_english=summary_card['summary_english'],
-                summary_nepali=summary_card['summary_nepali'],
-                what_changed=summary_card['what_changed'],
-                who_affected=summary_card['who_affected'],
-                what_to_do=summary_card['what_to_do'],
-                source_url=policy_data.get('source_url'),
-                gazette_type=policy_data.get('gazette_type', 'Ordinary'),
-                status=policy_data.get('status', 'New'),
-                missing_dates=policy_data.get('missing_dates', False),
-                missing_officer_info=policy_data.get('missing_officer_info', False),
-                missing_urls=policy_data.get('missing_urls', False)
-            )
-            db.session.add(policy)
-            new_count += 1
-        db.session.commit()
-        return jsonify({'success': True, 'message': f'Refreshed {new_count} new policies', 'new_policies': new_count, 'total_checked': len(policies)})
+        result = policy_refresher.refresh(days_back=7)
+        return jsonify({'success': True, 'message': f"Refreshed {result['new_policies']} new policies",
+                        'new_policies': result['new_policies'], 'total_checked': result['total_checked']})
     except Exception as e:
         logging.error(f"Error refreshing policies: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -216,16 +198,60 @@ def verify_data_sources():
 
 
 @policies_bp.route('/<int:policy_id>', methods=['GET'])
+@replica_reads
 def get_policy_details(policy_id):
-    """Get detailed information for a specific policy"""
+    """Get detailed information for a specific policy (the source text is at /<id>/text)"""
     try:
-        policy = PolicyCard.query.get_or_404(policy_id)
-        return jsonify({'success': True, 'policy': policy.to_dict()})
+        updated_at = db.session.query(PolicyCard.updated_at).filter(PolicyCard.id == policy_id).first()
+        if updated_at is None:
+            return jsonify({'success': False, 'error': 'Policy not found'}), 404
+        modified = updated_at[0]
+        etag = make_etag('policy', policy_id, modified.isoformat() if modified else '')
+        if is_not_modified(etag, modified):
+            return not_modified(etag, modified, POLICY_CACHE_CONTROL)
+        row = db.session.query(*PolicyCard.serialized_columns()).filter(PolicyCard.id == policy_id).first()
+        response = jsonify({'success': True, 'policy': PolicyCard.serialize(row)})
+        return add_validators(response, etag, modified, POLICY_CACHE_CONTROL)
     except Exception:
         return jsonify({'success': False, 'error': 'Policy not found'}), 404
 
 
+@policies_bp.route('/<int:policy_id>/text', methods=['GET'])
+@replica_reads
+def get_policy_text(policy_id):
+    """The scraped source text of a policy, optionally a slice (?offset=, ?max_chars=)"""
+    try:
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        max_chars = request.args.get('max_chars', type=int)
+        row = db.session.query(PolicyCard.text_sha256).filter(PolicyCard.id == policy_id).first()
+        if row is None:
+            return jsonify({'success': False, 'error': 'Policy not found'}), 404
+        if row.text_sha256 is not None:
+            # Compressed blob: decompressed whole (and cached by hash), then sliced
+            full_text = policy_text_store.get(row.text_sha256) or ''
+            end = offset + max_chars if max_chars is not None and max_chars >= 0 else None
+            text, length = full_text[offset:end], len(full_text)
+        else:
+            # Not migrated yet: slice in SQL so a long text is not read whole just to return part of it
+            text_column = PolicyCard._legacy_text
+            if max_chars is not None and max_chars >= 0:
+                selected = db.func.substr(text_column, offset + 1, max_chars)
+            elif offset:
+                selected = db.func.substr(text_column, offset + 1)
+            else:
+                selected = text_column
+            text, length = db.session.query(selected, db.func.length(text_column)).filter(
+                PolicyCard.id == policy_id
+            ).first()
+        return jsonify({'success': True, 'policy_id': policy_id, 'original_text': text,
+                        'offset': offset, 'total_length': length or 0})
+    except Exception as e:
+        logging.error(f"Error reading text of policy {policy_id}: {e}")
+        return jsonify({'success': False, 'error': 'Failed to read policy text'}), 500
+
+
 @policies_bp.route('/<int:policy_id>/gaps', methods=['GET'])
+@replica_reads
 def get_policy_gaps(policy_id):
     """Get operational gaps for RTI generation"""
     try:
@@ -243,72 +269,68 @@ def get_policy_gaps(policy_id):
 
 
 @policies_bp.route('/search', methods=['GET'])
+@replica_reads
 def search_policies():
-    """Search policies by title, ministry, or content"""
+    """Search policies by title, ministry, or content.
+    Full-text ranked with prefix matching; each result carries a rank and highlighted snippet.
+    """
     try:
         query = request.args.get('q', '').strip()
         ministry = request.args.get('ministry', '').strip()
         if not query and not ministry:
             return jsonify({'success': False, 'error': 'Search query or ministry filter required'}), 400
-        search_query = PolicyCard.query
-        if query:
-            search_query = search_query.filter(
-                db.or_(
-                    PolicyCard.title.contains(query),
-                    PolicyCard.summary_english.contains(query),
-                    PolicyCard.what_changed.contains(query),
-                    PolicyCard.who_affected.contains(query)
-                )
-            )
-        if ministry:
-            search_query = search_query.filter(PolicyCard.ministry.contains(ministry))
-        policies = search_query.order_by(PolicyCard.publication_date.desc()).limit(20).all()
-        return jsonify({'success': True, 'count': len(policies), 'policies': [p.to_dict() for p in policies]})
+        limit = page_size(request.args.get('limit', type=int))
+        policies, next_cursor = run_policy_search(query, ministry, limit, cursor=request.args.get('cursor'))
+        return jsonify(dict({'success': True, 'count': len(policies), 'policies': policies,
+                             'search_backend': search_backend()}, **page_metadata(next_cursor, limit)))
+    except InvalidCursor as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         logging.error(f"Error searching policies: {e}")
         return jsonify({'success': False, 'error': 'Search failed'}), 500
 
 
 @policies_bp.route('/ministries', methods=['GET'])
+@replica_reads
 def get_ministries():
     """Get list of all ministries with policy counts"""
     try:
-        ministries = db.session.query(
-            PolicyCard.ministry,
-            db.func.count(PolicyCard.id).label('count')
-        ).group_by(PolicyCard.ministry).all()
-        ministry_list = [{'name': ministry, 'policy_count': count} for ministry, count in ministries]
-        return jsonify({'success': True, 'ministries': ministry_list})
+        etag, modified = _listing_validators('ministries')
+        if is_not_modified(etag, modified):
+            return not_modified(etag, modified, MINISTRIES_CACHE_CONTROL)
+        response = jsonify({'success': True, 'ministries': policy_stats.ministries()})
+        return add_validators(response, etag, modified, MINISTRIES_CACHE_CONTROL)
     except Exception:
         return jsonify({'success': False, 'error': 'Failed to fetch ministries'}), 500
 
 
 @policies_bp.route('/stats', methods=['GET'])
+@replica_reads
 def get_policy_stats():
-    """Get policy statistics"""
+    """Get policy statistics from the counters maintained on write"""
     try:
-        total_policies = PolicyCard.query.count()
-        recent_policies = PolicyCard.query.filter(
-            PolicyCard.publication_date >= datetime.utcnow() - timedelta(days=7)
-        ).count()
-        policies_with_gaps = PolicyCard.query.filter(
-            db.or_(
-                PolicyCard.missing_dates == True,
-                PolicyCard.missing_officer_info == True,
-                PolicyCard.missing_urls == True
-            )
-        ).count()
-        ministry_count = db.session.query(PolicyCard.ministry).distinct().count()
-        return jsonify({'success': True, 'stats': {
-            'total_policies': total_policies,
-            'recent_policies': recent_policies,
-            'policies_with_gaps': policies_with_gaps,
-            'ministry_count': ministry_count,
-            'gap_percentage': round((policies_with_gaps / total_policies * 100), 2) if total_policies > 0 else 0
-        }})
+        # recent_policies counts by publication day, so the tag also changes daily
+        etag, modified = _listing_validators('stats', _clock_bucket('day'))
+        if is_not_modified(etag, modified):
+            return not_modified(etag, modified, STATS_CACHE_CONTROL)
+        response = jsonify({'success': True, 'stats': policy_stats.stats()})
+        return add_validators(response, etag, modified, STATS_CACHE_CONTROL)
     except Exception:
         return jsonify({'success': False, 'error': 'Failed to fetch statistics'}), 500
 
+
+@policies_bp.route('/stats/consistency', methods=['GET', 'POST'])
+def policy_stats_consistency():
+    """Compare the stats counters with the policy table; POST rebuilds them if they drifted"""
+    try:
+        report = policy_stats.check()
+        if request.method == 'POST' and not report['consistent']:
+            report.update(policy_stats.rebuild())
+        return jsonify(dict({'success': True}, **report))
+    except Exception as e:
+        logging.error(f"Policy stats consistency check failed: {e}")
+        return jsonify({'success': False, 'error': 'Consistency check failed'}), 500
+
 # --- RTI Blueprint and Endpoints ---
 rti_bp = Blueprint('rti', __name__)
 
@@ -338,6 +360,26 @@ def rti_submit_complaint():
     db.session.commit()
     return jsonify({'success': True, 'id': uc.id, 'is_valid_government_url': is_gov})
 
+@rti_bp.route('/complaints', methods=['GET'])
+@replica_reads
+def rti_list_complaints():
+    """Complaints newest first, a page at a time (?cursor=, ?limit=, ?status=pending|valid|invalid)"""
+    try:
+        limit = page_size(request.args.get('limit', type=int))
+        status = request.args.get('status', '').strip()
+        query = UserComplaint.query
+        if status:
+            query = query.filter(UserComplaint.validation_status == status)
+        complaints, next_cursor = keyset_page(
+            query, [UserComplaint.created_at, UserComplaint.id], f'complaints:{status}',
+            request.args.get('cursor'), limit
+        )
+        items = [c.to_dict() for c in complaints]
+        return jsonify(dict({'success': True, 'count': len(items), 'complaints': items},
+                            **page_metadata(next_cursor, limit)))
+    except InvalidCursor as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
 @rti_bp.route('/validate/<int:cid>', methods=['GET'])
 def rti_validate(cid: int):
     uc = UserComplaint.query.get_or_404(cid)
@@ -0,0 +1,32 @@
+from flask import Blueprint, jsonify
+from datetime import datetime
+from app.services.scraping_metrics import scraping_metrics
+
+scraping_status_bp = Blueprint('scraping_status', __name__)
+
+
+@scraping_status_bp.route('', methods=['GET'])
+def scraping_status():
+    """Per-source run, latency and yield metrics, slowest sources first"""
+    sources = scraping_metrics.snapshot()
+    budget = sorted(
+        (
+            {
+                'source': source,
+                'total_seconds': stats['durations']['total']['sum'],
+                'fetch_seconds': stats['durations']['fetch']['sum'],
+                'parse_seconds': stats['durations']['parse']['sum'],
+                'sentiment_seconds': stats['durations']['sentiment']['sum'],
+                'items_yielded': stats['items_yielded'],
+                'errors': stats['errors'],
+            }
+            for source, stats in sources.items()
+        ),
+        key=lambda row: -(row['total_seconds'] + row['sentiment_seconds']),
+    )
+    return jsonify({
+        "success": True,
+        "budget": budget,
+        "sources": sources,
+        "metadata": {"timestamp": datetime.utcnow().isoformat()},
+    })
@@ -1,5 +1,6 @@
 from flask import Blueprint, jsonify
 from datetime import datetime
+from app.services.sentiment_cache import sentiment_cache
 
 social_media_status_bp = Blueprint('social_media_status', __name__)
 
@@ -12,5 +13,6 @@ def social_status():
             "twitter": {"status": "ok"},
             "youtube": {"status": "ok"},
         },
+        "sentiment_cache": sentiment_cache.stats(),
         "metadata": {"timestamp": datetime.utcnow().isoformat()},
     })
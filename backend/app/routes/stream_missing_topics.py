@@ -1,31 +1,22 @@
-from flask import Blueprint, Response, stream_with_context
-import json
-import time
-from datetime import datetime
+from flask import Blueprint, Response, request, stream_with_context
+from app.services.broadcaster import broadcaster, parse_event_id
+from app.routes.missing_topics import (
+    MISSING_TOPICS_CHANNEL, missing_topics_cache, missing_topics_publisher, publish_missing_topics
+)
 
 stream_missing_topics_bp = Blueprint('stream_missing_topics', __name__)
 
-
-def sse_format(payload: dict) -> str:
-    return f"data: {json.dumps(payload)}\n\n"
+SSE_HEADERS = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
 
 
 @stream_missing_topics_bp.route('/', methods=['GET'])
 def stream_missing_topics():
-    def generate():
-        data = [
-            {"topic": "Unemployment and Job Crisis", "youth_mentions": 52, "politician_mentions": 17, "gap_score": 35},
-            {"topic": "Mental Health Awareness", "youth_mentions": 48, "politician_mentions": 16, "gap_score": 32},
-            {"topic": "Education System Reform", "youth_mentions": 44, "politician_mentions": 22, "gap_score": 22},
-        ]
-        payload = {
-            "data": data,
-            "metadata": {
-                "timestamp": datetime.utcnow().isoformat(),
-                "data_source": "stream_placeholder",
-                "note": "SSE preview of missing topics",
-            },
-        }
-        yield sse_format(payload)
-        time.sleep(1)
-    return Response(stream_with_context(generate()), mimetype='text/event-stream')
+    """Missing-topics Server-Sent Events: a snapshot on connect, then a delta per cache refresh"""
+    last_event_id = parse_event_id(request.headers.get('Last-Event-ID') or request.args.get('lastEventId'))
+    if not broadcaster.snapshot(MISSING_TOPICS_CHANNEL):
+        # First subscriber before any refresh: publish whatever the cache holds
+        payload, _ = missing_topics_cache.get()
+        if payload is not None and not missing_topics_publisher.has_state():
+            publish_missing_topics(payload)
+    frames = broadcaster.stream_with_snapshot(MISSING_TOPICS_CHANNEL, last_event_id)
+    return Response(stream_with_context(frames), mimetype='text/event-stream', headers=SSE_HEADERS)
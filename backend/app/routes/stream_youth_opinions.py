@@ -1,38 +1,61 @@
-from flask import Blueprint, Response, stream_with_context
-import json
+from flask import Blueprint, Response, request, stream_with_context
+import os
 import time
 from datetime import datetime
+from app.services.broadcaster import PeriodicProducer, broadcaster, parse_event_id
+from app.services.stream_deltas import DeltaPublisher, post_id
 
 stream_youth_opinions_bp = Blueprint('stream_youth_opinions', __name__)
 
+YOUTH_OPINIONS_CHANNEL = 'youth_opinions'
+# Seconds between full scrapes, and the minimum gap between partial updates during one
+YOUTH_STREAM_INTERVAL = int(os.getenv('YOUTH_STREAM_INTERVAL', '300'))
+YOUTH_STREAM_PUBLISH_SECONDS = float(os.getenv('YOUTH_STREAM_PUBLISH_SECONDS', '2'))
+YOUTH_STREAM_TOP_K = int(os.getenv('YOUTH_STREAM_TOP_K', '50'))
 
-def sse_format(payload: dict) -> str:
-    return f"data: {json.dumps(payload)}\n\n"
+SSE_HEADERS = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+
+
+def youth_payload(result, complete):
+    # Ids let stream deltas name added and removed posts
+    posts = [dict(post, id=post_id(post)) for post in result['posts']]
+    return {
+        "success": True,
+        "data": {"posts": posts, "trends": result['trends']},
+        "metadata": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "data_source": "live_scraped",
+            "complete": complete,
+        },
+    }
+
+
+def produce_youth_opinions():
+    """One scrape; trends are published as posts arrive, at most every YOUTH_STREAM_PUBLISH_SECONDS"""
+    if not broadcaster.acquire_producer(YOUTH_OPINIONS_CHANNEL, YOUTH_STREAM_INTERVAL * 2):
+        return
+    from app.services.social_media_scraper import social_media_scraper
+
+    last_published = [0.0]
+
+    def on_post(pipeline):
+        now = time.monotonic()
+        if now - last_published[0] >= YOUTH_STREAM_PUBLISH_SECONDS:
+            last_published[0] = now
+            youth_publisher.publish(youth_payload(pipeline.result(), False))
+
+    result = social_media_scraper.get_comprehensive_youth_opinions(YOUTH_STREAM_TOP_K, on_post=on_post)
+    youth_publisher.publish(youth_payload(result, True))
+
+
+youth_publisher = DeltaPublisher(YOUTH_OPINIONS_CHANNEL, ('data', 'posts'), key=lambda post: post['id'])
+youth_producer = PeriodicProducer(YOUTH_OPINIONS_CHANNEL, YOUTH_STREAM_INTERVAL, produce_youth_opinions)
 
 
 @stream_youth_opinions_bp.route('/', methods=['GET'])
 def stream_youth():
-    def generate():
-        posts = [
-            {
-                "platform": "twitter",
-                "sentiment": {"overall": "positive", "confidence": 0.86},
-                "content": "Campus hiring drives picking up this quarter!",
-                "created_at": datetime.utcnow().isoformat(),
-                "score": 123,
-                "youth_keywords": ["jobs", "campus", "hiring"],
-                "relevance_score": 0.78,
-                "url": "https://twitter.com/example/status/1",
-            }
-        ]
-        trends = {
-            "sentiment_distribution": {"positive": 45, "neutral": 40, "negative": 15},
-            "top_keywords": [["jobs", 15], ["education", 12], ["mental health", 9]],
-            "platform_distribution": {"Twitter": 110, "Reddit": 70, "YouTube": 35},
-            "total_posts": 215,
-            "analysis_timestamp": datetime.utcnow().isoformat(),
-        }
-        payload = {"success": True, "data": {"posts": posts, "trends": trends}}
-        yield sse_format(payload)
-        time.sleep(1)
-    return Response(stream_with_context(generate()), mimetype='text/event-stream')
+    """Youth opinion Server-Sent Events from a single shared scraper: a snapshot, then deltas"""
+    youth_producer.ensure_started()
+    last_event_id = parse_event_id(request.headers.get('Last-Event-ID') or request.args.get('lastEventId'))
+    frames = broadcaster.stream_with_snapshot(YOUTH_OPINIONS_CHANNEL, last_event_id)
+    return Response(stream_with_context(frames), mimetype='text/event-stream', headers=SSE_HEADERS)
@@ -1,13 +1,32 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from datetime import datetime
 
+from app.services.mention_counter import WINDOWS, mention_counter
+
 
 youth_topics_bp = Blueprint('youth_topics', __name__)
 
 
 @youth_topics_bp.route('/', methods=['GET'])
 def get_youth_topics():
-    """Trending youth topics derived shape compatible with friend's frontend."""
+    """Trending youth topics derived shape compatible with friend's frontend.
+
+    ?window=24h|7d|30d answers from the stored hourly mention counters.
+    """
+    window = request.args.get('window')
+    if window:
+        if window not in WINDOWS:
+            return jsonify({"success": False, "error": f"window must be one of {', '.join(WINDOWS)}"}), 400
+        rows = mention_counter.rollup(window)
+        if rows:
+            rows.sort(key=lambda x: (-x["youth_mentions"], x["topic"]))
+            return jsonify({
+                "success": True,
+                "data": rows,
+                "metadata": {"timestamp": datetime.utcnow().isoformat(), "window": window,
+                             "note": "Hourly topic mention counters"},
+            })
+
     keywords = [
         ("jobs", 15), ("mental health", 11), ("education", 13),
         ("inflation", 9), ("housing", 8), ("climate", 7), ("women safety", 6),
@@ -3,12 +3,13 @@ Additional accessible social media sources for youth opinion scraping
 These sources don't require API keys and are more accessible
 """
 
-import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
 import time
 import logging
 
+from .scraping_metrics import scraping_metrics
+
 logger = logging.getLogger(__name__)
 
 class AdditionalSocialSources:
@@ -20,8 +21,9 @@ class AdditionalSocialSources:
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
         }
     
+    @scraping_metrics.instrument('quora')
     def scrape_quora_topics(self):
-        """Scrape Quora topics related to Indian youth"""
+        """Scrape Quora topics related to Indian youth (generator)"""
         try:
             # Quora topics that are accessible
             topics = [
@@ -31,10 +33,9 @@ class AdditionalSocialSources:
                 'https://www.quora.com/topic/Indian-Technology'
             ]
             
-            posts = []
             for topic_url in topics:
                 try:
-                    response = requests.get(topic_url, headers=self.headers, timeout=10)
+                    response = scraping_metrics.get(topic_url, headers=self.headers, timeout=10)
                     response.raise_for_status()
                     
                     soup = BeautifulSoup(response.content, 'html.parser')
@@ -45,14 +46,14 @@ class AdditionalSocialSources:
                     for question in questions:
                         question_text = question.get_text(strip=True)
                         if len(question_text) > 20:
-                            posts.append({
+                            yield {
                                 'platform': 'quora',
                                 'content': question_text,
                                 'title': question_text[:100],
                                 'url': topic_url,
                                 'source': 'Quora Topics',
                                 'created_at': datetime.now()
-                            })
+                            }
                     
                     time.sleep(3)  # Rate limiting
                     
@@ -60,14 +61,12 @@ class AdditionalSocialSources:
                     logger.error(f"Error scraping Quora topic {topic_url}: {e}")
                     continue
             
-            return posts
-            
         except Exception as e:
             logger.error(f"Error in Quora scraping: {e}")
-            return []
     
+    @scraping_metrics.instrument('medium')
     def scrape_medium_articles(self):
-        """Scrape Medium articles related to Indian youth topics"""
+        """Scrape Medium articles related to Indian youth topics (generator)"""
         try:
             # Medium tags that are accessible
             tags = [
@@ -77,10 +76,9 @@ class AdditionalSocialSources:
                 'https://medium.com/tag/indian-technology'
             ]
             
-            posts = []
             for tag_url in tags:
                 try:
-                    response = requests.get(tag_url, headers=self.headers, timeout=10)
+                    response = scraping_metrics.get(tag_url, headers=self.headers, timeout=10)
                     response.raise_for_status()
                     
                     soup = BeautifulSoup(response.content, 'html.parser')
@@ -98,14 +96,14 @@ class AdditionalSocialSources:
                             content = f"{title} {excerpt}".strip()
                             
                             if len(content) > 20:
-                                posts.append({
+                                yield {
                                     'platform': 'medium',
                                     'content': content,
                                     'title': title,
                                     'url': tag_url,
                                     'source': 'Medium Articles',
                                     'created_at': datetime.now()
-                                })
+                                }
                     
                     time.sleep(3)  # Rate limiting
                     
@@ -113,14 +111,12 @@ class AdditionalSocialSources:
                     logger.error(f"Error scraping Medium tag {tag_url}: {e}")
                     continue
             
-            return posts
-            
         except Exception as e:
             logger.error(f"Error in Medium scraping: {e}")
-            return []
     
+    @scraping_metrics.instrument('devto')
     def scrape_dev_to_articles(self):
-        """Scrape Dev.to articles related to Indian developers"""
+        """Scrape Dev.to articles related to Indian developers (generator)"""
         try:
             # Dev.to tags
             tags = [
@@ -129,10 +125,9 @@ class AdditionalSocialSources:
                 'https://dev.to/t/indian-tech'
             ]
             
-            posts = []
             for tag_url in tags:
                 try:
-                    response = requests.get(tag_url, headers=self.headers, timeout=10)
+                    response = scraping_metrics.get(tag_url, headers=self.headers, timeout=10)
                     response.raise_for_status()
                     
                     soup = BeautifulSoup(response.content, 'html.parser')
@@ -150,14 +145,14 @@ class AdditionalSocialSources:
                             content = f"{title} {excerpt}".strip()
                             
                             if len(content) > 20:
-                                posts.append({
+                                yield {
                                     'platform': 'devto',
                                     'content': content,
                                     'title': title,
                                     'url': tag_url,
                                     'source': 'Dev.to Articles',
                                     'created_at': datetime.now()
-                                })
+                                }
                     
                     time.sleep(3)  # Rate limiting
                     
@@ -165,32 +160,29 @@ class AdditionalSocialSources:
                     logger.error(f"Error scraping Dev.to tag {tag_url}: {e}")
                     continue
             
-            return posts
-            
         except Exception as e:
             logger.error(f"Error in Dev.to scraping: {e}")
-            return []
     
+    @scraping_metrics.instrument('hackernews')
     def scrape_hackernews(self):
-        """Scrape Hacker News for India-related posts"""
+        """Scrape Hacker News for India-related posts (generator)"""
         try:
             # Hacker News search for India
             search_url = 'https://hn.algolia.com/api/v1/search?query=india&tags=story'
             
-            response = requests.get(search_url, headers=self.headers, timeout=10)
+            response = scraping_metrics.get(search_url, headers=self.headers, timeout=10)
             response.raise_for_status()
             
             data = response.json()
             hits = data.get('hits', [])[:10]  # Limit to 10 posts
             
-            posts = []
             for hit in hits:
                 title = hit.get('title', '')
                 story_text = hit.get('story_text', '')
                 content = f"{title} {story_text}".strip()
                 
                 if len(content) > 20:
-                    posts.append({
+                    yield {
                         'platform': 'hackernews',
                         'content': content,
                         'title': title,
@@ -198,48 +190,29 @@ class AdditionalSocialSources:
                         'source': 'Hacker News',
                         'created_at': datetime.fromtimestamp(hit.get('created_at_i', 0)),
                         'points': hit.get('points', 0)
-                    })
-            
-            return posts
+                    }
             
         except Exception as e:
             logger.error(f"Error in Hacker News scraping: {e}")
-            return []
     
+    @scraping_metrics.instrument('additional_sources')
     def scrape_all_additional_sources(self):
-        """Scrape all additional social media sources"""
-        all_posts = []
-        
-        # Scrape different platforms
-        try:
-            quora_posts = self.scrape_quora_topics()
-            all_posts.extend(quora_posts)
-            logger.info(f"Scraped {len(quora_posts)} Quora posts")
-        except Exception as e:
-            logger.error(f"Quora scraping failed: {e}")
-        
-        try:
-            medium_posts = self.scrape_medium_articles()
-            all_posts.extend(medium_posts)
-            logger.info(f"Scraped {len(medium_posts)} Medium posts")
-        except Exception as e:
-            logger.error(f"Medium scraping failed: {e}")
-        
-        try:
-            devto_posts = self.scrape_dev_to_articles()
-            all_posts.extend(devto_posts)
-            logger.info(f"Scraped {len(devto_posts)} Dev.to posts")
-        except Exception as e:
-            logger.error(f"Dev.to scraping failed: {e}")
-        
-        try:
-            hn_posts = self.scrape_hackernews()
-            all_posts.extend(hn_posts)
-            logger.info(f"Scraped {len(hn_posts)} Hacker News posts")
-        except Exception as e:
-            logger.error(f"Hacker News scraping failed: {e}")
-        
-        return all_posts
+        """Scrape all additional social media sources, yielding posts as they arrive"""
+        sources = [
+            ('Quora', self.scrape_quora_topics),
+            ('Medium', self.scrape_medium_articles),
+            ('Dev.to', self.scrape_dev_to_articles),
+            ('Hacker News', self.scrape_hackernews),
+        ]
+        for label, scrape in sources:
+            count = 0
+            try:
+                for post in scrape():
+                    count += 1
+                    yield post
+                logger.info(f"Scraped {count} {label} posts")
+            except Exception as e:
+                logger.error(f"{label} scraping failed: {e}")
 
 # Global instance
 additional_social_sources = AdditionalSocialSources()
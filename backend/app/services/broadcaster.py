@@ -0,0 +1,400 @@
+"""
+Pub/sub fan-out for the Server-Sent Event streams.
+
+A producer publishes each update once. It is encoded to an SSE frame a
+single time, kept in a per-channel ring buffer for ``Last-Event-ID``
+resume, and handed to every subscriber's bounded queue. A slow client that
+falls behind loses its oldest queued frames instead of growing memory;
+idle connections get periodic heartbeat comments so proxies keep them open.
+
+With REDIS_URL set (and the redis package installed), events are published
+through Redis so every worker process delivers them. Event ids come from a
+shared counter and the ring lives in Redis as well, so a client can resume
+against any worker.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Set, Tuple
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+SSE_RING_SIZE = int(os.getenv('SSE_RING_SIZE', '256'))
+SSE_QUEUE_SIZE = int(os.getenv('SSE_QUEUE_SIZE', '64'))
+SSE_HEARTBEAT_SECONDS = float(os.getenv('SSE_HEARTBEAT_SECONDS', '15'))
+SSE_RETRY_MS = int(os.getenv('SSE_RETRY_MS', '3000'))
+REDIS_URL = os.getenv('REDIS_URL', '')
+REDIS_PREFIX = 'civiclens:sse:'
+
+HEARTBEAT_FRAME = ': keepalive\n\n'
+
+
+def encode_data(data: Any) -> str:
+    return json.dumps(data, default=str, separators=(',', ':'))
+
+
+def format_frame(event_id: int, event: str, payload: str) -> str:
+    # A multi-line payload would need one data: line per line; compact JSON has none
+    return f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n"
+
+
+def encode_event(event_id: int, event: str, data: Any) -> str:
+    return format_frame(event_id, event, encode_data(data))
+
+
+def parse_event_id(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+class Subscription:
+    """Bounded frame queue for one client; the oldest frames are dropped when it is full"""
+
+    def __init__(self, channel: str, max_size: int = SSE_QUEUE_SIZE):
+        self.channel = channel
+        self.max_size = max_size
+        self.dropped = 0
+        # Set when events this client needed were no longer in the ring
+        self.missed = False
+        self._frames: Deque[Tuple[int, str]] = deque()
+        self._cond = threading.Condition()
+        self.closed = False
+
+    def put(self, event_id: int, frame: str) -> None:
+        with self._cond:
+            if len(self._frames) >= self.max_size:
+                self._frames.popleft()
+                self.dropped += 1
+            self._frames.append((event_id, frame))
+            self._cond.notify()
+
+    def get(self, timeout: float) -> Optional[Tuple[int, str]]:
+        """Next (event id, frame), or None if nothing arrived within timeout"""
+        with self._cond:
+            if not self._frames and not self.closed:
+                self._cond.wait(timeout)
+            return self._frames.popleft() if self._frames else None
+
+    def close(self) -> None:
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class _Channel:
+    def __init__(self, ring_size: int):
+        self.ring: Deque[Tuple[int, str]] = deque(maxlen=ring_size)
+        self.subscribers: Set[Subscription] = set()
+        self.last_id = 0
+        # (event id, encoded JSON) of the latest full state, for channels that publish deltas
+        self.snapshot: Optional[Tuple[int, str]] = None
+
+
+class Broadcaster:
+    def __init__(self, ring_size: int = SSE_RING_SIZE, queue_size: int = SSE_QUEUE_SIZE,
+                 heartbeat: float = SSE_HEARTBEAT_SECONDS, redis_url: str = REDIS_URL):
+        self.ring_size = ring_size
+        self.queue_size = queue_size
+        self.heartbeat = heartbeat
+        self._channels: Dict[str, _Channel] = {}
+        self._lock = threading.Lock()
+        self.published = 0
+        self._redis = None
+        self._listener: Optional[threading.Thread] = None
+        if redis_url and REDIS_AVAILABLE:
+            try:
+                self._redis = redis.Redis.from_url(redis_url)
+                self._redis.ping()
+            except Exception as e:
+                logger.warning(f"Redis unavailable for SSE fan-out, using in-process only: {e}")
+                self._redis = None
+        elif redis_url:
+            logger.warning("REDIS_URL is set but the redis package is not installed; SSE fan-out is in-process only")
+
+    @property
+    def backend(self) -> str:
+        return 'redis' if self._redis is not None else 'memory'
+
+    def _channel(self, name: str) -> _Channel:
+        channel = self._channels.get(name)
+        if channel is None:
+            channel = self._channels[name] = _Channel(self.ring_size)
+        return channel
+
+    def publish(self, channel: str, data: Any, event: str = 'message', snapshot: Any = None) -> int:
+        """Publish one event to every subscriber of channel; returns its id.
+
+        ``snapshot`` is the full state as of this event, served to clients that connect
+        (or fall behind) later; see stream_with_snapshot.
+        """
+        snapshot_payload = encode_data(snapshot) if snapshot is not None else None
+        if self._redis is not None:
+            try:
+                return self._publish_redis(channel, data, event, snapshot_payload)
+            except Exception as e:
+                logger.error(f"Redis publish failed, delivering locally only: {e}")
+        payload = encode_data(data)
+        with self._lock:
+            # Allocate, append and fan out under one lock so concurrent publishers
+            # get distinct ids and every subscriber sees them in id order
+            channel_state = self._channel(channel)
+            event_id = channel_state.last_id + 1
+            self._append(channel_state, event_id, format_frame(event_id, event, payload), snapshot_payload)
+        return event_id
+
+    def _deliver(self, channel_name: str, event_id: int, frame: str, snapshot_payload: Optional[str] = None) -> None:
+        """Append an event whose id was allocated elsewhere (the shared Redis counter)"""
+        with self._lock:
+            channel = self._channel(channel_name)
+            if event_id <= channel.last_id:
+                # Published concurrently and overtaken by a later id; replaying it would
+                # reorder the stream, and clients resync from the snapshot on the gap
+                logger.debug(f"Dropping late SSE event {event_id} on {channel_name}")
+                return
+            self._append(channel, event_id, frame, snapshot_payload)
+
+    def _append(self, channel: _Channel, event_id: int, frame: str, snapshot_payload: Optional[str]) -> None:
+        # Caller holds self._lock; Subscription.put never blocks
+        channel.last_id = event_id
+        channel.ring.append((event_id, frame))
+        if snapshot_payload is not None:
+            channel.snapshot = (event_id, snapshot_payload)
+        self.published += 1
+        for subscription in channel.subscribers:
+            subscription.put(event_id, frame)
+
+    def subscribe(self, channel_name: str, last_event_id: Optional[int] = None,
+                  replay_latest: bool = True) -> Subscription:
+        """Register a client. Events after last_event_id are replayed from the ring; a new
+        client (no id) gets the latest event so it has something to render immediately.
+        """
+        self._ensure_listener()
+        subscription = Subscription(channel_name, self.queue_size)
+        with self._lock:
+            channel = self._channel(channel_name)
+            ring = self._ring(channel_name, channel)
+            if last_event_id is not None:
+                if last_event_id < channel.last_id and (not ring or ring[0][0] > last_event_id + 1):
+                    subscription.missed = True
+                backlog = [entry for entry in ring if entry[0] > last_event_id]
+            else:
+                backlog = ring[-1:] if replay_latest else []
+            for event_id, frame in backlog:
+                subscription.put(event_id, frame)
+            channel.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscription.close()
+        with self._lock:
+            channel = self._channels.get(subscription.channel)
+            if channel:
+                channel.subscribers.discard(subscription)
+
+    def stream(self, channel: str, last_event_id: Optional[int] = None,
+               on_connect: Optional[Callable[[Subscription], Iterator[str]]] = None) -> Iterator[str]:
+        """SSE frames for one client: retry hint, optional connect frames, then live events"""
+        subscription = self.subscribe(channel, last_event_id)
+        try:
+            yield f"retry: {SSE_RETRY_MS}\n\n"
+            if on_connect:
+                yield from on_connect(subscription)
+            while True:
+                item = subscription.get(self.heartbeat)
+                if item is None:
+                    yield HEARTBEAT_FRAME
+                else:
+                    yield item[1]
+        finally:
+            self.unsubscribe(subscription)
+
+    def stream_with_snapshot(self, channel: str, last_event_id: Optional[int] = None) -> Iterator[str]:
+        """SSE frames for a channel that publishes deltas against a snapshot.
+
+        A new client first gets a ``snapshot`` event with the full state, then only the
+        events after it. A resuming client gets the events it missed from the ring. If
+        they are gone, or this client's queue dropped frames, it gets a ``resync`` event
+        with the full state instead, so every delta it receives applies to the state it has.
+        """
+        subscription = self.subscribe(channel, last_event_id, replay_latest=False)
+        try:
+            yield f"retry: {SSE_RETRY_MS}\n\n"
+            last: Optional[int] = last_event_id
+            if last is None or subscription.missed or last > self.last_event_id(channel):
+                snapshot = self.snapshot(channel)
+                if snapshot:
+                    yield format_frame(snapshot[0], 'snapshot' if last is None else 'resync', snapshot[1])
+                    last = snapshot[0]
+                else:
+                    last = None
+            while True:
+                item = subscription.get(self.heartbeat)
+                if item is None:
+                    yield HEARTBEAT_FRAME
+                    continue
+                event_id, frame = item
+                if last is not None and event_id <= last:
+                    continue
+                if last is not None and event_id != last + 1:
+                    snapshot = self.snapshot(channel)
+                    if snapshot and snapshot[0] >= event_id:
+                        yield format_frame(snapshot[0], 'resync', snapshot[1])
+                        last = snapshot[0]
+                        continue
+                yield frame
+                last = event_id
+        finally:
+            self.unsubscribe(subscription)
+
+    def snapshot(self, channel_name: str) -> Optional[Tuple[int, str]]:
+        """(event id, encoded JSON) of the channel's latest full state"""
+        if self._redis is not None:
+            try:
+                raw = self._redis.get(f"{REDIS_PREFIX}snapshot:{channel_name}")
+                if raw is not None:
+                    entry = json.loads(raw)
+                    return int(entry['id']), entry['payload']
+            except Exception as e:
+                logger.warning(f"Reading SSE snapshot from Redis failed: {e}")
+        with self._lock:
+            return self._channel(channel_name).snapshot
+
+    def last_event_id(self, channel_name: str) -> int:
+        with self._lock:
+            channel = self._channel(channel_name)
+            ring = self._ring(channel_name, channel)
+            return ring[-1][0] if ring else 0
+
+    def acquire_producer(self, name: str, ttl: float) -> bool:
+        """True if this process should run producer name for the next ttl seconds.
+        Always true in memory; with Redis only one worker holds the lease at a time.
+        """
+        if self._redis is None:
+            return True
+        key = f"{REDIS_PREFIX}producer:{name}"
+        try:
+            owner = f"{os.getpid()}:{id(self)}"
+            if self._redis.set(key, owner, nx=True, ex=max(1, int(ttl))):
+                return True
+            current = self._redis.get(key)
+            if current is not None and current.decode('utf-8') == owner:
+                self._redis.expire(key, max(1, int(ttl)))
+                return True
+            return False
+        except Exception as e:
+            logger.warning(f"Producer lease check failed, producing locally: {e}")
+            return True
+
+    def subscriber_count(self, channel: Optional[str] = None) -> int:
+        with self._lock:
+            channels = [self._channels.get(channel)] if channel else list(self._channels.values())
+            return sum(len(c.subscribers) for c in channels if c)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'backend': self.backend,
+                'published': self.published,
+                'channels': {
+                    name: {'subscribers': len(c.subscribers), 'last_event_id': c.last_id,
+                           'dropped': sum(s.dropped for s in c.subscribers)}
+                    for name, c in self._channels.items()
+                },
+            }
+
+    # --- Redis fan-out ---
+    def _ring(self, channel_name: str, channel: _Channel) -> List[Tuple[int, str]]:
+        if self._redis is None:
+            return list(channel.ring)
+        try:
+            raw = self._redis.lrange(f"{REDIS_PREFIX}ring:{channel_name}", 0, -1)
+            entries = [json.loads(item) for item in raw]
+            ring = [(int(entry['id']), entry['frame']) for entry in entries]
+            if ring:
+                channel.last_id = max(channel.last_id, ring[-1][0])
+            return ring
+        except Exception as e:
+            logger.warning(f"Reading SSE ring from Redis failed: {e}")
+            return list(channel.ring)
+
+    def _publish_redis(self, channel: str, data: Any, event: str, snapshot_payload: Optional[str]) -> int:
+        event_id = int(self._redis.incr(f"{REDIS_PREFIX}seq:{channel}"))
+        message = json.dumps({'id': event_id, 'frame': encode_event(event_id, event, data)})
+        pipe = self._redis.pipeline()
+        if snapshot_payload is not None:
+            pipe.set(f"{REDIS_PREFIX}snapshot:{channel}", json.dumps({'id': event_id, 'payload': snapshot_payload}))
+        pipe.rpush(f"{REDIS_PREFIX}ring:{channel}", message)
+        pipe.ltrim(f"{REDIS_PREFIX}ring:{channel}", -self.ring_size, -1)
+        pipe.publish(f"{REDIS_PREFIX}events:{channel}", message)
+        pipe.execute()
+        return event_id
+
+    def _ensure_listener(self) -> None:
+        if self._redis is None or (self._listener is not None and self._listener.is_alive()):
+            return
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(target=self._listen, name='sse-redis-listener', daemon=True)
+                self._listener.start()
+
+    def _listen(self) -> None:
+        """One Redis subscription per process, fanned out to local subscribers"""
+        prefix = f"{REDIS_PREFIX}events:"
+        while True:
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(f"{prefix}*")
+                for message in pubsub.listen():
+                    channel = message['channel']
+                    if isinstance(channel, bytes):
+                        channel = channel.decode('utf-8')
+                    entry = json.loads(message['data'])
+                    self._deliver(channel[len(prefix):], int(entry['id']), entry['frame'])
+            except Exception as e:
+                logger.error(f"SSE Redis listener failed, reconnecting: {e}")
+                time.sleep(1)
+
+
+broadcaster = Broadcaster()
+
+
+class PeriodicProducer:
+    """Runs a publish function on a single background thread, started on first use"""
+
+    def __init__(self, name: str, interval: float, produce: Callable[[], None]):
+        self.name = name
+        self.interval = interval
+        self.produce = produce
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name=f'{self.name}-producer', daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.produce()
+            except Exception as e:
+                logger.error(f"{self.name} producer failed: {e}")
+            self._stop.wait(self.interval)
+
+    def stop(self) -> None:
+        self._stop.set()
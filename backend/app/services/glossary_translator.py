@@ -0,0 +1,85 @@
+"""
+Offline glossary translation for bilingual policy summaries.
+
+Glossaries live in app/data/glossary_<language>.json. Each one compiles to a
+single regex, factored into a prefix trie, that is applied in one pass: the
+longest term wins at each position and replaced text is never rescanned, so
+"Income Tax" becomes one term instead of having "tax" rewritten inside it.
+Terms only match whole words, case-insensitively. Results are cached per
+summary text because the same summaries are rendered over and over.
+"""
+
+import os
+import re
+import json
+import logging
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from app.utils.keyword_matcher import trie_alternation
+
+logger = logging.getLogger(__name__)
+
+GLOSSARY_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+GLOSSARY_CACHE_SIZE = int(os.getenv('GLOSSARY_CACHE_SIZE', '4096'))
+
+
+class GlossaryTranslator:
+    """Longest-match, single-pass term replacement for one language"""
+
+    def __init__(self, terms: Dict[str, str], untranslated_template: Optional[str] = None,
+                 language: str = '', cache_size: int = GLOSSARY_CACHE_SIZE):
+        self.language = language
+        self.untranslated_template = untranslated_template
+        self._terms = {term.lower(): translation for term, translation in terms.items()}
+        self._pattern = re.compile(rf'(?<!\w)(?:{trie_alternation(self._terms)})(?!\w)', re.IGNORECASE)
+        self._cached = lru_cache(maxsize=cache_size)(self._translate)
+
+    def _translate(self, text: str) -> Tuple[str, int]:
+        replaced = 0
+
+        def substitute(match):
+            nonlocal replaced
+            replaced += 1
+            return self._terms[match.group(0).lower()]
+
+        return self._pattern.sub(substitute, text), replaced
+
+    def translate_terms(self, text: str) -> Tuple[str, int]:
+        """Return (translated text, number of terms replaced)"""
+        return self._cached(text or '')
+
+    def translate(self, text: str) -> str:
+        """Translate glossary terms; text with no known terms gets the untranslated notice"""
+        translated, replaced = self.translate_terms(text)
+        if not replaced and self.untranslated_template:
+            return self.untranslated_template.format(excerpt=(text or '')[:50])
+        return translated
+
+    def cache_info(self):
+        return self._cached.cache_info()
+
+
+def load_glossary(language: str) -> Dict:
+    path = os.path.join(GLOSSARY_DIR, f'glossary_{language}.json')
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def get_translator(language: str) -> GlossaryTranslator:
+    """Translator for a language code ('ne', 'hi'), compiled once per process"""
+    try:
+        glossary = load_glossary(language)
+    except Exception as e:
+        logger.error(f"Could not load {language} glossary: {e}")
+        glossary = {}
+    return GlossaryTranslator(
+        glossary.get('terms', {}),
+        untranslated_template=glossary.get('untranslated_template'),
+        language=language
+    )
+
+
+def translate_summary(text: str, language: str) -> str:
+    return get_translator(language).translate(text)
@@ -7,6 +7,8 @@ from typing import List, Dict, Any
 import requests
 from bs4 import BeautifulSoup
 
+from app.services.scraping_metrics import scraping_metrics
+
 try:
     # Optional: for dynamic sites; only used if available
     from selenium import webdriver
@@ -54,12 +56,13 @@ class LiveGovernmentDataFetcher:
     def _within_days(self, date_obj: datetime, days_back: int) -> bool:
         return date_obj >= (datetime.now() - timedelta(days=days_back))
 
+    @scraping_metrics.instrument('pib')
     def scrape_pib_releases(self, days_back: int = 7) -> List[Dict[str, Any]]:
         """Scrape Press Information Bureau for recent releases.
         Extract: title, date, ministry (if present), brief content, source_url
         """
         url = self.sources['pib_releases']
-        r = self.session.get(url, timeout=20)
+        r = scraping_metrics.get(url, session=self.session, timeout=20)
         r.raise_for_status()
         soup = BeautifulSoup(r.text, 'lxml')
 
@@ -75,7 +78,7 @@ class LiveGovernmentDataFetcher:
             source_url = href if href.startswith('http') else f"https://pib.gov.in/{href.lstrip('/')}"
             # Fetch detail page briefly to extract date and content snippet
             try:
-                detail = self.session.get(source_url, timeout=20)
+                detail = scraping_metrics.get(source_url, session=self.session, timeout=20)
                 if detail.status_code != 200:
                     continue
                 dsoup = BeautifulSoup(detail.text, 'lxml')
@@ -112,10 +115,11 @@ class LiveGovernmentDataFetcher:
                 continue
         return items[:15]  # limit for performance
 
+    @scraping_metrics.instrument('sebi')
     def scrape_sebi_updates(self, days_back: int = 7) -> List[Dict[str, Any]]:
         """Scrape SEBI recent updates page for titles and links."""
         url = self.sources['sebi_updates']
-        r = self.session.get(url, timeout=20)
+        r = scraping_metrics.get(url, session=self.session, timeout=20)
         r.raise_for_status()
         soup = BeautifulSoup(r.text, 'lxml')
         items: List[Dict[str, Any]] = []
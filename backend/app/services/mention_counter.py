@@ -0,0 +1,241 @@
+"""
+Persistent, hour-bucketed mention counters per topic and audience.
+
+Every scrape feeds its texts in: each text is mapped to the topic categories
+it mentions and the counts are added to the current UTC hour's bucket for
+that audience (youth or political). Window queries (24h/7d/30d) are then a
+single indexed range sum over the buckets instead of a fresh scrape, and the
+preceding window of the same length comes back in the same query for trends.
+
+Scrapes overlap heavily (the same hot posts and headlines come back on every
+poll), so texts already counted recently are skipped using a bounded set of
+content hashes kept in memory.
+"""
+
+import os
+import hashlib
+import logging
+import threading
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from flask import has_app_context
+from sqlalchemy import case, func, select
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models.topic_mentions import TopicMentionBucket
+from app.services.topic_taxonomy import topic_categories, topic_relevance
+from app.utils.simhash import normalize_content
+
+logger = logging.getLogger(__name__)
+
+YOUTH = 'youth'
+POLITICAL = 'political'
+AUDIENCES = (YOUTH, POLITICAL)
+
+WINDOWS = {
+    '24h': timedelta(hours=24),
+    '7d': timedelta(days=7),
+    '30d': timedelta(days=30),
+}
+
+# Content hashes remembered to avoid counting the same text on every scrape
+MENTION_SEEN_CAPACITY = int(os.getenv('MENTION_SEEN_CAPACITY', '50000'))
+# Tries of the read-modify-write fallback before giving up (and logging the loss)
+MENTION_WRITE_ATTEMPTS = 3
+
+
+def bucket_start(at: Optional[datetime] = None) -> datetime:
+    """Start of the UTC hour containing ``at``"""
+    return (at or datetime.utcnow()).replace(minute=0, second=0, microsecond=0)
+
+
+class MentionCounter:
+    def __init__(self, seen_capacity: int = MENTION_SEEN_CAPACITY):
+        self.app = None
+        self.seen_capacity = seen_capacity
+        self._seen: 'OrderedDict[str, None]' = OrderedDict()
+        self._seen_lock = threading.Lock()
+
+    def init_app(self, app) -> None:
+        """Remember the app so scrapes on background threads can write counters"""
+        self.app = app
+
+    @contextmanager
+    def _app_context(self):
+        if has_app_context():
+            yield True
+        elif self.app is not None:
+            with self.app.app_context():
+                yield True
+        else:
+            yield False
+
+    def _first_sighting(self, audience: str, text: str) -> bool:
+        key = hashlib.sha1(f"{audience}\0{normalize_content(text)}".encode('utf-8')).hexdigest()
+        with self._seen_lock:
+            if key in self._seen:
+                self._seen.move_to_end(key)
+                return False
+            self._seen[key] = None
+            while len(self._seen) > self.seen_capacity:
+                self._seen.popitem(last=False)
+            return True
+
+    def count_topics(self, texts: Iterable[str], audience: Optional[str] = None) -> Counter:
+        """Topic mention counts for texts; with an audience, texts counted before are skipped"""
+        counts: Counter = Counter()
+        for text in texts:
+            if not text or (audience and not self._first_sighting(audience, text)):
+                continue
+            counts.update(topic_categories(text))
+        return counts
+
+    def record(self, counts: Mapping[str, int], audience: str, at: Optional[datetime] = None) -> int:
+        """Add counts to the hour bucket for ``at``; returns the number of mentions written"""
+        counts = {topic: n for topic, n in counts.items() if n > 0}
+        if not counts:
+            return 0
+        if audience not in AUDIENCES:
+            raise ValueError(f"Unknown audience: {audience}")
+        start = bucket_start(at)
+
+        with self._app_context() as ready:
+            if not ready:
+                logger.debug("Mention counter has no app configured; skipping")
+                return 0
+            try:
+                if not self._upsert(counts, audience, start):
+                    self._read_modify_write(counts, audience, start)
+                return sum(counts.values())
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Failed to record topic mentions: {e}")
+                return 0
+        return 0
+
+    def _upsert(self, counts: Mapping[str, int], audience: str, start: datetime) -> bool:
+        """Add counts with one INSERT ... ON CONFLICT DO UPDATE; False if the dialect has none"""
+        dialect = db.engine.dialect.name
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        elif dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            return False
+        table = TopicMentionBucket.__table__
+        now = datetime.utcnow()
+        statement = insert(table).values([
+            {'topic': topic, 'audience': audience, 'bucket_start': start, 'count': n, 'updated_at': now}
+            for topic, n in counts.items()
+        ])
+        statement = statement.on_conflict_do_update(
+            index_elements=['topic', 'audience', 'bucket_start'],
+            set_={'count': table.c.count + statement.excluded['count'], 'updated_at': now},
+        )
+        db.session.execute(statement)
+        db.session.commit()
+        return True
+
+    def _read_modify_write(self, counts: Mapping[str, int], audience: str, start: datetime) -> None:
+        """Fallback for databases without ON CONFLICT; reads stay on the primary"""
+        for attempt in range(MENTION_WRITE_ATTEMPTS):
+            try:
+                existing = {
+                    row.topic: row for row in db.session.execute(
+                        select(TopicMentionBucket).filter(
+                            TopicMentionBucket.audience == audience,
+                            TopicMentionBucket.bucket_start == start,
+                            TopicMentionBucket.topic.in_(list(counts))
+                        ),
+                        bind_arguments={'bind': db.engine},
+                    ).scalars()
+                }
+                for topic, n in counts.items():
+                    row = existing.get(topic)
+                    if row is not None:
+                        # Increment in SQL so concurrent writers do not lose updates
+                        row.count = TopicMentionBucket.count + n
+                    else:
+                        db.session.add(TopicMentionBucket(
+                            topic=topic, audience=audience, bucket_start=start, count=n
+                        ))
+                db.session.commit()
+                return
+            except IntegrityError:
+                # Another writer created the bucket first; retry as an update
+                db.session.rollback()
+        raise RuntimeError(f"bucket {start.isoformat()} for {audience} kept conflicting "
+                           f"after {MENTION_WRITE_ATTEMPTS} attempts; {sum(counts.values())} mentions dropped")
+
+    def record_texts(self, texts: Iterable[str], audience: str, at: Optional[datetime] = None) -> int:
+        return self.record(self.count_topics(texts, audience), audience, at)
+
+    def record_headlines(self, items: Iterable[Dict[str, Any]], text_key: str = 'text',
+                         at: Optional[datetime] = None) -> int:
+        """News headlines count for youth and/or political audiences by their topic keywords"""
+        youth_texts, political_texts = [], []
+        for item in items:
+            text = item.get(text_key) or ''
+            youth, political = topic_relevance(text)
+            if youth:
+                youth_texts.append(text)
+            if political:
+                political_texts.append(text)
+        return self.record_texts(youth_texts, YOUTH, at) + self.record_texts(political_texts, POLITICAL, at)
+
+    def rollup(self, window: str = '7d', now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Per-topic totals for the window, plus the preceding window of equal length for trend.
+
+        Returns rows sorted by gap (youth minus political), largest first.
+        """
+        if window not in WINDOWS:
+            raise ValueError(f"Unknown window: {window}")
+        span = WINDOWS[window]
+        now = now or datetime.utcnow()
+        since = bucket_start(now) - span + timedelta(hours=1)
+        previous_since = since - span
+
+        with self._app_context() as ready:
+            if not ready:
+                return []
+            in_window = TopicMentionBucket.bucket_start >= since
+            rows = db.session.query(
+                TopicMentionBucket.topic,
+                TopicMentionBucket.audience,
+                func.sum(case((in_window, TopicMentionBucket.count), else_=0)),
+                func.sum(case((in_window, 0), else_=TopicMentionBucket.count)),
+            ).filter(
+                TopicMentionBucket.bucket_start >= previous_since,
+                TopicMentionBucket.bucket_start <= now
+            ).group_by(TopicMentionBucket.topic, TopicMentionBucket.audience).all()
+
+        totals: Dict[str, Dict[str, int]] = {}
+        for topic, audience, current, previous in rows:
+            entry = totals.setdefault(topic, {'youth': 0, 'political': 0, 'previous_youth': 0, 'previous_political': 0})
+            entry[audience] = int(current or 0)
+            entry[f'previous_{audience}'] = int(previous or 0)
+
+        result = []
+        for topic, entry in totals.items():
+            if not (entry['youth'] or entry['political']):
+                continue
+            result.append({
+                'topic': topic,
+                'youth_mentions': entry['youth'],
+                'politician_mentions': entry['political'],
+                'gap_score': entry['youth'] - entry['political'],
+                'frequency': entry['youth'] + entry['political'],
+                'trend': {
+                    'youth_change': entry['youth'] - entry['previous_youth'],
+                    'political_change': entry['political'] - entry['previous_political'],
+                },
+            })
+        result.sort(key=lambda row: (-row['gap_score'], -row['frequency'], row['topic']))
+        return result
+
+
+mention_counter = MentionCounter()
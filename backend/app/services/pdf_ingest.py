@@ -0,0 +1,132 @@
+"""
+Streaming text extraction for gazette and policy PDFs.
+
+The download is streamed to a temporary file in fixed-size chunks, then the
+file is memory-mapped and handed to the PDF reader, so the document itself is
+paged in by the OS instead of being held on the heap. Text comes out one page
+at a time from a generator that stops at a page or character budget, which
+keeps peak memory bounded by the budget rather than by the size of the PDF.
+"""
+
+import os
+import mmap
+import logging
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+try:
+    from pypdf import PdfReader
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PYPDF_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+PDF_MAX_PAGES = int(os.getenv('PDF_MAX_PAGES', '40'))
+PDF_MAX_CHARS = int(os.getenv('PDF_MAX_CHARS', '200000'))
+# Downloads larger than this are abandoned rather than written to disk
+PDF_MAX_DOWNLOAD_BYTES = int(os.getenv('PDF_MAX_DOWNLOAD_BYTES', str(50 * 1024 * 1024)))
+PDF_DOWNLOAD_TIMEOUT = int(os.getenv('PDF_DOWNLOAD_TIMEOUT', '30'))
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class PdfIngestError(Exception):
+    """The PDF could not be downloaded or read"""
+
+
+def looks_like_pdf(url: str, content_type: Optional[str] = None) -> bool:
+    if content_type and 'application/pdf' in content_type.lower():
+        return True
+    return urlparse(url or '').path.lower().endswith('.pdf')
+
+
+@contextmanager
+def download_to_tempfile(url: str, max_bytes: int = PDF_MAX_DOWNLOAD_BYTES,
+                         timeout: int = PDF_DOWNLOAD_TIMEOUT, response=None):
+    """Stream url into a temporary file and yield its path; the file is removed afterwards.
+
+    An already opened streaming ``response`` can be passed in to avoid a second request.
+    """
+    headers = {'User-Agent': os.getenv('SCRAPING_USER_AGENT', 'CivicLens-PolicyBot/1.0')}
+    fd, path = tempfile.mkstemp(prefix='civiclens-', suffix='.pdf')
+    try:
+        resp = response or requests.get(url, stream=True, timeout=timeout, headers=headers)
+        try:
+            if resp.status_code != 200:
+                raise PdfIngestError(f"HTTP {resp.status_code} for {url}")
+            written = 0
+            with os.fdopen(fd, 'wb') as f:
+                fd = None
+                for chunk in resp.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    written += len(chunk)
+                    if written > max_bytes:
+                        raise PdfIngestError(f"{url} is larger than {max_bytes} bytes")
+                    f.write(chunk)
+        finally:
+            resp.close()
+        yield path
+    finally:
+        if fd is not None:
+            os.close(fd)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def iter_pdf_pages(path: str, max_pages: int = PDF_MAX_PAGES,
+                   max_chars: int = PDF_MAX_CHARS) -> Iterator[Tuple[int, str]]:
+    """Yield (page_number, text) from a PDF on disk until a budget is reached.
+
+    Pages are parsed lazily, one at a time; the last page is truncated to fit
+    the character budget.
+    """
+    if not PYPDF_AVAILABLE:
+        raise PdfIngestError("pypdf is not installed")
+
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            try:
+                reader = PdfReader(mapped)
+                page_count = len(reader.pages)
+            except Exception as e:
+                raise PdfIngestError(f"Unreadable PDF: {e}")
+
+            remaining = max_chars
+            for index in range(min(page_count, max_pages)):
+                try:
+                    text = (reader.pages[index].extract_text() or '').strip()
+                except Exception as e:
+                    logger.warning(f"Skipping PDF page {index + 1}: {e}")
+                    continue
+                if not text:
+                    continue
+                text = text[:remaining]
+                remaining -= len(text)
+                yield index + 1, text
+                if remaining <= 0:
+                    break
+        finally:
+            mapped.close()
+
+
+def extract_pdf_text(path: str, max_pages: int = PDF_MAX_PAGES, max_chars: int = PDF_MAX_CHARS) -> str:
+    return '\n'.join(text for _, text in iter_pdf_pages(path, max_pages, max_chars))
+
+
+def fetch_pdf_text(url: str, max_pages: int = PDF_MAX_PAGES, max_chars: int = PDF_MAX_CHARS,
+                   response=None) -> str:
+    """Download a PDF and return up to the budgeted text; empty string on failure"""
+    try:
+        with download_to_tempfile(url, response=response) as path:
+            return extract_pdf_text(path, max_pages, max_chars)
+    except Exception as e:
+        logger.warning(f"PDF ingest failed for {url}: {e}")
+        return ''
@@ -3,10 +3,15 @@ from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 import re
 import json
+import os
 from app.models.policy import PolicyCard
+from app.services.pdf_ingest import fetch_pdf_text, looks_like_pdf
 from app import db
 import logging
 
+# Download linked gazette PDFs and use their text instead of the short summary
+FETCH_POLICY_PDFS = os.getenv('FETCH_POLICY_PDFS', 'false').lower() == 'true'
+
 class GovernmentPolicyFetcher:
     def __init__(self):
         self.sources = {
@@ -149,6 +154,11 @@ class GovernmentPolicyFetcher:
                 'status': 'New'
             }
             
+            if FETCH_POLICY_PDFS and looks_like_pdf(notification['source_url']):
+                pdf_text = fetch_pdf_text(notification['source_url'])
+                if pdf_text:
+                    policy_data['original_text'] = pdf_text
+            
             # Check for missing information
             policy_data['missing_dates'] = 'effective_date' not in notification
             policy_data['missing_officer_info'] = 'contact' not in notification
@@ -0,0 +1,213 @@
+"""
+Policy ingestion and the background refresh behind /api/policies/recent.
+
+``ingest_recent_policies`` fetches recent notifications, summarizes the ones
+not stored yet, saves them and counts their topics as political mentions.
+/api/policies/refresh runs it directly. /recent never runs it inline: it
+serves whatever is stored and asks ``policy_refresher`` to refresh in the
+background when the data is older than ``POLICY_STALE_AFTER_SECONDS``.
+
+Only one refresh runs at a time per process. With Redis configured, a lease
+through the broadcaster also keeps other workers from starting their own.
+After an attempt (successful or not) no new one starts for
+``POLICY_REFRESH_RETRY_SECONDS``, so a failing source is not hammered by every
+page load.
+"""
+
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from flask import has_app_context
+from sqlalchemy import func
+
+from app import db
+from app.models.policy import PolicyCard
+from app.services.broadcaster import broadcaster
+from app.services.mention_counter import POLITICAL, mention_counter
+from app.services.policy_fetcher import GovernmentPolicyFetcher
+from app.services.policy_summarizer import PolicySummarizer
+from app.services.policy_stats import LAST_REFRESH, policy_stats
+
+logger = logging.getLogger(__name__)
+
+POLICY_STALE_AFTER_SECONDS = int(os.getenv('POLICY_STALE_AFTER_SECONDS', str(24 * 3600)))
+POLICY_REFRESH_RETRY_SECONDS = int(os.getenv('POLICY_REFRESH_RETRY_SECONDS', '600'))
+POLICY_REFRESH_DAYS = int(os.getenv('POLICY_REFRESH_DAYS', '7'))
+
+
+def _policy_card(policy_data: Dict[str, Any], summary_card: Dict[str, Any]) -> PolicyCard:
+    return PolicyCard(
+        title=policy_data['title'],
+        ministry=policy_data['ministry'],
+        notification_number=policy_data['notification_number'],
+        publication_date=policy_data['publication_date'],
+        effective_date=policy_data.get('effective_date'),
+        original_text=policy_data.get('original_text'),
+        summary_english=summary_card['summary_english'],
+        summary_nepali=summary_card['summary_nepali'],
+        what_changed=summary_card['what_changed'],
+        who_affected=summary_card['who_affected'],
+        what_to_do=summary_card['what_to_do'],
+        source_url=policy_data.get('source_url'),
+        gazette_type=policy_data.get('gazette_type', 'Ordinary'),
+        status=policy_data.get('status', 'New'),
+        missing_dates=policy_data.get('missing_dates', False),
+        missing_officer_info=policy_data.get('missing_officer_info', False),
+        missing_urls=policy_data.get('missing_urls', False)
+    )
+
+
+def ingest_recent_policies(days_back: int = POLICY_REFRESH_DAYS) -> Dict[str, int]:
+    """Fetch, summarize and store policies from the last days_back days that are not stored yet"""
+    policies = GovernmentPolicyFetcher().fetch_recent_policies(days_back)
+    summarizer = PolicySummarizer()
+    new_policies = []
+    try:
+        for policy_data in policies:
+            exists = db.session.query(PolicyCard.id).filter_by(
+                notification_number=policy_data['notification_number']
+            ).first()
+            if exists:
+                continue
+            summary_card = summarizer.generate_policy_card(
+                policy_data.get('original_text', ''),
+                policy_data['title']
+            )
+            if not summary_card:
+                continue
+            policy = _policy_card(policy_data, summary_card)
+            db.session.add(policy)
+            new_policies.append(policy)
+        policy_stats.bump(LAST_REFRESH)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    mention_counter.record_texts([f"{p.title} {p.summary_english or ''}" for p in new_policies], POLITICAL)
+    return {'new_policies': len(new_policies), 'total_checked': len(policies)}
+
+
+class PolicyRefresher:
+    def __init__(self, ingest: Callable[[int], Dict[str, int]] = ingest_recent_policies,
+                 stale_after: float = POLICY_STALE_AFTER_SECONDS,
+                 retry_after: float = POLICY_REFRESH_RETRY_SECONDS,
+                 days_back: int = POLICY_REFRESH_DAYS, name: str = 'policy-refresh'):
+        self.app = None
+        self.ingest = ingest
+        self.stale_after = stale_after
+        self.retry_after = retry_after
+        self.days_back = days_back
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._inflight: Optional[threading.Event] = None
+        self._last_attempt = 0.0
+        self.last_result: Optional[Dict[str, int]] = None
+        self.last_error: Optional[str] = None
+        self.refreshes = 0
+        self.failures = 0
+
+    def init_app(self, app) -> None:
+        """Remember the app so background refreshes can open a context"""
+        self.app = app
+
+    @contextmanager
+    def _app_context(self):
+        if has_app_context():
+            yield
+        elif self.app is not None:
+            with self.app.app_context():
+                yield
+        else:
+            raise RuntimeError(f"{self.name} needs init_app before refreshing in the background")
+
+    @property
+    def in_progress(self) -> bool:
+        with self._lock:
+            return self._inflight is not None
+
+    def data_age(self) -> Optional[float]:
+        """Seconds since the last ingest, or None if nothing was ever ingested"""
+        _, refreshed_at = policy_stats.marker(LAST_REFRESH)
+        if refreshed_at is None:
+            # Databases filled before ingests were recorded
+            refreshed_at = db.session.query(func.max(PolicyCard.created_at)).scalar()
+        if refreshed_at is None:
+            return None
+        return max(0.0, (datetime.utcnow() - refreshed_at).total_seconds())
+
+    def _claim(self) -> Optional[threading.Event]:
+        with self._lock:
+            if self._inflight is not None:
+                return None
+            self._inflight = threading.Event()
+            self._last_attempt = time.time()
+            return self._inflight
+
+    def _run(self, event: threading.Event, days_back: int) -> Optional[Dict[str, int]]:
+        try:
+            with self._app_context():
+                result = self.ingest(days_back)
+            self.last_result, self.last_error = result, None
+            self.refreshes += 1
+            logger.info(f"{self.name}: {result}")
+            return result
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            logger.error(f"{self.name} failed: {e}")
+            return None
+        finally:
+            with self._lock:
+                self._inflight = None
+            event.set()
+
+    def start(self) -> bool:
+        """Start a background refresh unless one is running or one was attempted recently"""
+        with self._lock:
+            if self._inflight is not None or time.time() - self._last_attempt < self.retry_after:
+                return False
+        if not broadcaster.acquire_producer(self.name, self.retry_after):
+            return False
+        event = self._claim()
+        if event is None:
+            return False
+        threading.Thread(target=self._run, args=(event, self.days_back), name=self.name, daemon=True).start()
+        return True
+
+    def refresh(self, days_back: Optional[int] = None, wait_timeout: float = 300.0) -> Optional[Dict[str, int]]:
+        """Refresh now; a caller arriving while a refresh is running waits for that one instead"""
+        event = self._claim()
+        if event is None:
+            with self._lock:
+                running = self._inflight
+            if running is not None:
+                running.wait(wait_timeout)
+            if self.last_error:
+                raise RuntimeError(self.last_error)
+            return self.last_result
+        result = self._run(event, days_back or self.days_back)
+        if result is None:
+            raise RuntimeError(self.last_error or 'policy refresh failed')
+        return result
+
+    def refresh_if_stale(self) -> Dict[str, Any]:
+        """Start a background refresh when the data is stale; returns data_age and refresh_in_progress"""
+        age = self.data_age()
+        if age is None or age >= self.stale_after:
+            self.start()
+        return {'data_age': round(age) if age is not None else None, 'refresh_in_progress': self.in_progress}
+
+    def stats(self) -> Dict[str, Any]:
+        return {'refresh_in_progress': self.in_progress, 'refreshes': self.refreshes,
+                'failures': self.failures, 'last_result': self.last_result, 'last_error': self.last_error,
+                'stale_after_seconds': self.stale_after}
+
+
+# Global instance
+policy_refresher = PolicyRefresher()
@@ -0,0 +1,239 @@
+"""
+Full-text search over policy cards.
+
+- SQLite: an FTS5 table (``policy_cards_fts``) over title, summary,
+  what-changed and who-affected. It is an external-content table, so the text
+  is not stored twice, and triggers keep it in sync on insert, update and
+  delete.
+- PostgreSQL: a stored generated ``tsvector`` column with a GIN index, so
+  Postgres keeps it current itself.
+
+Both give ranked results (BM25 / ts_rank_cd with the title weighted
+highest), prefix matching on every query word and highlighted snippets.
+Words are indexed unstemmed: a stemmer would turn "education" into "educ"
+and the prefix "educat" would stop matching while the user types.
+Databases without either feature fall back to the substring scan the
+endpoint used before.
+"""
+
+import re
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from app import db
+from app.models.policy import PolicyCard
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_page
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'policy_cards_fts'
+SEARCH_COLUMNS = ('title', 'summary_english', 'what_changed', 'who_affected')
+# BM25 / setweight weights, in SEARCH_COLUMNS order
+COLUMN_WEIGHTS = (10.0, 4.0, 2.0, 2.0)
+PG_WEIGHT_LABELS = ('A', 'B', 'C', 'C')
+HIGHLIGHT_START, HIGHLIGHT_END = '<mark>', '</mark>'
+SNIPPET_TOKENS = 16
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+_SQLITE_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        {', '.join(SEARCH_COLUMNS)},
+        content='policy_cards', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS policy_cards_fts_insert AFTER INSERT ON policy_cards BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {', '.join(SEARCH_COLUMNS)})
+        VALUES (new.id, {', '.join('new.' + c for c in SEARCH_COLUMNS)});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS policy_cards_fts_delete AFTER DELETE ON policy_cards BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {', '.join(SEARCH_COLUMNS)})
+        VALUES ('delete', old.id, {', '.join('old.' + c for c in SEARCH_COLUMNS)});
+    END""",
+    # Only reindex when a searched column changed, not on every status or timestamp update
+    f"""CREATE TRIGGER IF NOT EXISTS policy_cards_fts_update
+        AFTER UPDATE OF {', '.join(SEARCH_COLUMNS)} ON policy_cards BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {', '.join(SEARCH_COLUMNS)})
+        VALUES ('delete', old.id, {', '.join('old.' + c for c in SEARCH_COLUMNS)});
+        INSERT INTO {FTS_TABLE}(rowid, {', '.join(SEARCH_COLUMNS)})
+        VALUES (new.id, {', '.join('new.' + c for c in SEARCH_COLUMNS)});
+    END""",
+]
+
+_PG_VECTOR = ' || '.join(
+    f"setweight(to_tsvector('simple', coalesce({column}, '')), '{label}')"
+    for column, label in zip(SEARCH_COLUMNS, PG_WEIGHT_LABELS)
+)
+_PG_DDL = [
+    f"ALTER TABLE policy_cards ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    f"GENERATED ALWAYS AS ({_PG_VECTOR}) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_policy_cards_search_vector ON policy_cards USING GIN (search_vector)",
+]
+
+# Backend chosen per database URL by init_search_index: 'fts5', 'postgres' or 'like'
+_backends: Dict[str, str] = {}
+
+
+def query_terms(query: str) -> List[str]:
+    return _WORD_RE.findall(query.lower())
+
+
+def fts5_query(terms: List[str]) -> str:
+    """Every word must match, each as a prefix; words are quoted so FTS syntax is inert"""
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def tsquery(terms: List[str]) -> str:
+    return ' & '.join(f'{term}:*' for term in terms)
+
+
+def _sqlite_has_fts5(connection) -> bool:
+    try:
+        options = {row[0] for row in connection.execute(text('PRAGMA compile_options'))}
+        return 'ENABLE_FTS5' in options
+    except Exception:
+        return False
+
+
+def init_search_index(app) -> str:
+    """Create the full-text index for the app's database if needed; returns the backend used"""
+    url = app.config['SQLALCHEMY_DATABASE_URI']
+    with app.app_context():
+        engine = db.engine
+        backend = 'like'
+        try:
+            with engine.begin() as connection:
+                if engine.dialect.name == 'sqlite' and _sqlite_has_fts5(connection):
+                    existed = connection.execute(text(
+                        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=:name"
+                    ), {'name': FTS_TABLE}).first() is not None
+                    for statement in _SQLITE_DDL:
+                        connection.execute(text(statement))
+                    if not existed:
+                        # Index rows written before the table existed
+                        connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+                    backend = 'fts5'
+                elif engine.dialect.name == 'postgresql':
+                    for statement in _PG_DDL:
+                        connection.execute(text(statement))
+                    backend = 'postgres'
+        except Exception as e:
+            logger.warning(f"Full-text index unavailable, policy search will scan: {e}")
+            backend = 'like'
+    _backends[url] = backend
+    return backend
+
+
+def search_backend() -> str:
+    from flask import current_app
+    return _backends.get(current_app.config['SQLALCHEMY_DATABASE_URI'], 'like')
+
+
+def _ranked_ids(terms: List[str], ministry: str, limit: int, backend: str,
+                after: Optional[List[Any]] = None) -> List[Tuple[int, float, str]]:
+    """(id, rank, snippet) for one page; after is the (rank, id) of the previous page's last row.
+
+    Snippets are built only for the rows on the page, not for every match.
+    """
+    params: Dict[str, Any] = {'limit': limit}
+    ministry_filter = ''
+    if ministry:
+        ministry_filter = 'AND p.ministry LIKE :ministry'
+        params['ministry'] = f'%{ministry}%'
+    page_filter = ''
+    if after is not None:
+        params['after_rank'], params['after_id'] = after
+
+    if backend == 'fts5':
+        params['match'] = fts5_query(terms)
+        weights = ', '.join(str(weight) for weight in COLUMN_WEIGHTS)
+        if after is not None:
+            # bm25 is lower-is-better
+            page_filter = 'WHERE rank > :after_rank OR (rank = :after_rank AND id > :after_id)'
+        sql = f"""
+            SELECT id, rank FROM (
+                SELECT p.id AS id, bm25({FTS_TABLE}, {weights}) AS rank
+                FROM {FTS_TABLE} JOIN policy_cards p ON p.id = {FTS_TABLE}.rowid
+                WHERE {FTS_TABLE} MATCH :match {ministry_filter}
+            ) {page_filter}
+            ORDER BY rank, id LIMIT :limit"""
+        ranked = [(row[0], row[1]) for row in db.session.execute(text(sql), params)]
+        if not ranked:
+            return []
+        ids = ', '.join(str(int(policy_id)) for policy_id, _ in ranked)
+        snippets = dict(db.session.execute(text(f"""
+            SELECT rowid, snippet({FTS_TABLE}, -1, :start, :end, '…', {SNIPPET_TOKENS})
+            FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match AND rowid IN ({ids})"""),
+            {'match': params['match'], 'start': HIGHLIGHT_START, 'end': HIGHLIGHT_END}).all())
+        return [(policy_id, rank, snippets.get(policy_id)) for policy_id, rank in ranked]
+
+    params['query'] = tsquery(terms)
+    params['options'] = (f'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, '
+                         f'MaxWords={SNIPPET_TOKENS * 2}, MinWords={SNIPPET_TOKENS // 2}')
+    if after is not None:
+        page_filter = ('AND (ts_rank_cd(p.search_vector, q) < :after_rank OR '
+                       '(ts_rank_cd(p.search_vector, q) = :after_rank AND p.id > :after_id))')
+    sql = f"""
+        SELECT r.id, r.rank,
+               ts_headline('simple', coalesce(p.summary_english, p.title), q, :options) AS snippet
+        FROM (
+            SELECT p.id, ts_rank_cd(p.search_vector, q) AS rank
+            FROM policy_cards p, to_tsquery('simple', :query) q
+            WHERE p.search_vector @@ q {ministry_filter} {page_filter}
+            ORDER BY rank DESC, p.id LIMIT :limit
+        ) r JOIN policy_cards p ON p.id = r.id, to_tsquery('simple', :query) q
+        ORDER BY r.rank DESC, r.id"""
+    return [(row[0], float(row[1]), row[2]) for row in db.session.execute(text(sql), params)]
+
+
+def _like_search(query: str, ministry: str, limit: int, cursor: Optional[str], kind: str):
+    search_query = db.session.query(*PolicyCard.serialized_columns())
+    if query:
+        search_query = search_query.filter(
+            db.or_(
+                PolicyCard.title.contains(query),
+                PolicyCard.summary_english.contains(query),
+                PolicyCard.what_changed.contains(query),
+                PolicyCard.who_affected.contains(query)
+            )
+        )
+    if ministry:
+        search_query = search_query.filter(PolicyCard.ministry.contains(ministry))
+    return keyset_page(search_query, [PolicyCard.publication_date, PolicyCard.id], kind, cursor, limit)
+
+
+def search_policies(query: str, ministry: str = '', limit: int = 20, cursor: Optional[str] = None,
+                    backend: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """One page of policies matching query (and ministry), best first, and the next page's cursor.
+    Each policy is to_dict() plus a 'search' block with its rank and snippet.
+    """
+    backend = backend or search_backend()
+    terms = query_terms(query)
+    # Cursors only resume the listing they came from
+    kind = 'search:' + hashlib.sha1(f'{backend}|{query}|{ministry}'.encode('utf-8')).hexdigest()[:12]
+    if not terms or backend == 'like':
+        rows, next_cursor = _like_search(query, ministry, limit, cursor, kind)
+        return [dict(PolicyCard.serialize(row), search={'rank': None, 'snippet': None}) for row in rows], next_cursor
+
+    after = decode_cursor(cursor, kind, 2)
+    ranked = _ranked_ids(terms, ministry, limit + 1, backend, after)
+    next_cursor = None
+    if len(ranked) > limit:
+        ranked = ranked[:limit]
+        next_cursor = encode_cursor(kind, [ranked[-1][1], ranked[-1][0]])
+    policies = {
+        row.id: row for row in db.session.query(*PolicyCard.serialized_columns()).filter(
+            PolicyCard.id.in_([r[0] for r in ranked])
+        )
+    }
+    # Report higher-is-better ranks on both backends
+    sign = -1 if backend == 'fts5' else 1
+    results = [
+        dict(PolicyCard.serialize(policies[policy_id]), search={'rank': round(sign * rank, 4), 'snippet': snippet})
+        for policy_id, rank, snippet in ranked
+        if policy_id in policies
+    ]
+    return results, next_cursor
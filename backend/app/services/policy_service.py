@@ -4,6 +4,8 @@ import logging
 
 from app.services.live_policy_fetcher import LiveGovernmentDataFetcher
 from app.services.gemini_gap_analyzer import GeminiGapAnalyzer
+from app.services.glossary_translator import translate_summary
+from app.services.mention_counter import POLITICAL, mention_counter
 from app.models.policy import PolicyCard
 from app import db
 
@@ -33,7 +35,8 @@ class EnhancedPolicyService:
 
                 # Map Gemini outputs into existing schema (no schema changes)
                 summary_en = summary.get('english') or f"Policy update: {title}"
-                summary_hi = summary.get('hindi') or "हिंदी सारांश उपलब्ध नहीं"
+                # Offline glossary translation when Gemini gives no Hindi summary
+                summary_hi = summary.get('hindi') or translate_summary(summary_en, 'hi')
 
                 # Approximate missing flags from gap analysis if available
                 def _flag_contains(gtype: str) -> bool:
@@ -84,4 +87,6 @@ class EnhancedPolicyService:
                 continue
 
         db.session.commit()
+        # New notifications count as political mentions of their topics
+        mention_counter.record_texts([f"{p.title} {p.summary_english or ''}" for p in processed], POLITICAL)
         return processed
@@ -0,0 +1,278 @@
+"""
+Policy statistics maintained on write.
+
+The dashboard's /stats and /ministries used to count and group the whole
+policy table on every load. The counts now live in three small tables:
+
+- ``policy_aggregates``: total and gap-flag counters
+- ``ministry_policy_counts``: policies per ministry
+- ``policy_daily_counts``: policies per publication day. The recent count
+  sums the whole days inside the last ``RECENT_DAYS`` x 24 hours and counts
+  the partly covered first day from the publication-date index, so it is the
+  same rolling window as before.
+
+A ``before_flush`` hook turns every PolicyCard insert, delete or change to a
+counted field into increments on those rows. The hook runs on the flush's
+own connection, so the counters commit or roll back together with the
+policies, whichever code path wrote them. Bulk Core statements and raw SQL
+bypass the hook. ``check`` compares the counters with the policy table and
+``rebuild`` recomputes them after such writes or any other drift.
+
+The same hook bumps a ``generation`` marker on every flush that changes a
+policy. Its value and timestamp are the validators for conditional GETs on
+the policy endpoints (see ``version``). Ingestion bumps ``last_refresh``.
+"""
+
+import logging
+import threading
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models.policy import PolicyCard
+from app.models.policy_stats import MinistryPolicyCount, PolicyAggregate, PolicyDailyCount
+
+logger = logging.getLogger(__name__)
+
+GAP_FLAGS = ('missing_dates', 'missing_officer_info', 'missing_urls')
+COUNTED_FIELDS = ('ministry', 'publication_date') + GAP_FLAGS
+RECENT_DAYS = 7
+# Aggregate rows that are markers, not policy counts: check and rebuild leave them alone.
+# The generation counts flushes that changed any policy; last_refresh counts policy ingests.
+GENERATION = 'generation'
+LAST_REFRESH = 'last_refresh'
+MARKERS = (GENERATION, LAST_REFRESH)
+
+# Delta keys: ('aggregate', name), ('ministry', name) or ('day', date)
+DeltaKey = Tuple[str, Any]
+
+
+def _contributions(values: Dict[str, Any]) -> Counter:
+    """The counters one policy card with these field values adds to"""
+    flags = [bool(values.get(flag)) for flag in GAP_FLAGS]
+    contributions = Counter({('aggregate', 'total'): 1})
+    for flag, value in zip(GAP_FLAGS, flags):
+        if value:
+            contributions[('aggregate', flag)] += 1
+    if any(flags):
+        contributions[('aggregate', 'with_gaps')] += 1
+    # Policies without a ministry are not listed under one; _expected skips them too
+    if values.get('ministry'):
+        contributions[('ministry', values['ministry'])] += 1
+    published = values.get('publication_date')
+    if published:
+        contributions[('day', published.date() if isinstance(published, datetime) else published)] += 1
+    return contributions
+
+
+def _current_values(card: PolicyCard) -> Dict[str, Any]:
+    return {field: getattr(card, field) for field in COUNTED_FIELDS}
+
+
+def _previous_values(card: PolicyCard) -> Optional[Dict[str, Any]]:
+    """Field values as last flushed, or None if no counted field changed"""
+    state = inspect(card)
+    values, changed = {}, False
+    for field in COUNTED_FIELDS:
+        history = state.attrs[field].history
+        if history.deleted:
+            values[field] = history.deleted[0]
+            changed = True
+        elif history.unchanged:
+            values[field] = history.unchanged[0]
+        else:
+            values[field] = getattr(card, field)
+    return values if changed else None
+
+
+def _apply(connection, deltas: Counter) -> None:
+    """Add deltas to the counter rows, creating rows that do not exist yet"""
+    targets = {
+        'aggregate': (PolicyAggregate.__table__, 'key', 'value'),
+        'ministry': (MinistryPolicyCount.__table__, 'ministry', 'count'),
+        'day': (PolicyDailyCount.__table__, 'day', 'count'),
+    }
+    for (kind, key), delta in deltas.items():
+        if not delta:
+            continue
+        table, key_column, value_column = targets[kind]
+        column = table.c[value_column]
+        result = connection.execute(
+            table.update().where(table.c[key_column] == key).values({value_column: column + delta})
+        )
+        if result.rowcount == 0:
+            connection.execute(table.insert().values({key_column: key, value_column: delta}))
+
+
+def _before_flush(session, flush_context, instances) -> None:
+    deltas: Counter = Counter()
+    changed = False
+    for obj in session.new:
+        if isinstance(obj, PolicyCard):
+            deltas.update(_contributions(_current_values(obj)))
+            changed = True
+    for obj in session.deleted:
+        if isinstance(obj, PolicyCard):
+            deltas.subtract(_contributions(_previous_values(obj) or _current_values(obj)))
+            changed = True
+    for obj in session.dirty:
+        if isinstance(obj, PolicyCard) and obj not in session.deleted and session.is_modified(obj):
+            changed = True
+            previous = _previous_values(obj)
+            if previous is not None:
+                deltas.subtract(_contributions(previous))
+                deltas.update(_contributions(_current_values(obj)))
+    if changed:
+        deltas[('aggregate', GENERATION)] += 1
+    if any(deltas.values()):
+        _apply(session.connection(), deltas)
+
+
+_listener_lock = threading.Lock()
+_listening = False
+
+
+class PolicyStats:
+    def init_app(self, app) -> None:
+        """Start maintaining the counters, seeding them once if the tables are new"""
+        global _listening
+        with _listener_lock:
+            if not _listening:
+                event.listen(Session, 'before_flush', _before_flush)
+                _listening = True
+        with app.app_context():
+            try:
+                if db.session.get(PolicyAggregate, 'total') is None and PolicyCard.query.first() is not None:
+                    logger.info("Seeding policy aggregates from existing policies")
+                    self.rebuild()
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Failed to seed policy aggregates: {e}")
+
+    def aggregates(self) -> Dict[str, int]:
+        return {row.key: row.value for row in PolicyAggregate.query.all()}
+
+    def marker(self, key: str) -> Tuple[int, Optional[datetime]]:
+        """(value, last bumped) of a marker row - one primary-key lookup"""
+        row = db.session.query(PolicyAggregate.value, PolicyAggregate.updated_at).filter(
+            PolicyAggregate.key == key
+        ).first()
+        return (row.value, row.updated_at) if row else (0, None)
+
+    def bump(self, key: str) -> None:
+        """Bump a marker row in the current transaction; the caller commits"""
+        _apply(db.session.connection(), Counter({('aggregate', key): 1}))
+
+    def version(self) -> Tuple[int, Optional[datetime]]:
+        """(generation, time of the last policy write)"""
+        return self.marker(GENERATION)
+
+    def stats(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """The /stats payload from the counter tables"""
+        now = now or datetime.utcnow()
+        aggregates = self.aggregates()
+        total = aggregates.get('total', 0)
+        with_gaps = aggregates.get('with_gaps', 0)
+        recent = self.recent_count(now)
+        ministry_count = MinistryPolicyCount.query.filter(MinistryPolicyCount.count > 0).count()
+        return {
+            'total_policies': total,
+            'recent_policies': recent,
+            'policies_with_gaps': with_gaps,
+            'ministry_count': ministry_count,
+            'gap_percentage': round((with_gaps / total * 100), 2) if total > 0 else 0,
+            'gap_flags': {flag: aggregates.get(flag, 0) for flag in GAP_FLAGS},
+        }
+
+    def recent_count(self, now: datetime) -> int:
+        """Policies published in the RECENT_DAYS x 24 hours before now (or later)"""
+        cutoff = now - timedelta(days=RECENT_DAYS)
+        first_whole_day = cutoff.date() + timedelta(days=1)
+        whole_days = db.session.query(func.coalesce(func.sum(PolicyDailyCount.count), 0)).filter(
+            PolicyDailyCount.day >= first_whole_day
+        ).scalar()
+        # Only part of the cutoff day is inside the window
+        partial_day = PolicyCard.query.filter(
+            PolicyCard.publication_date >= cutoff,
+            PolicyCard.publication_date < datetime.combine(first_whole_day, datetime.min.time()),
+        ).count()
+        return int(whole_days) + partial_day
+
+    def ministries(self):
+        rows = MinistryPolicyCount.query.filter(MinistryPolicyCount.count > 0).order_by(
+            MinistryPolicyCount.ministry
+        ).all()
+        return [{'name': row.ministry, 'policy_count': row.count} for row in rows]
+
+    def _expected(self) -> Counter:
+        """Every counter recomputed from the policy table"""
+        expected: Counter = Counter()
+        expected[('aggregate', 'total')] = PolicyCard.query.count()
+        for flag in GAP_FLAGS:
+            expected[('aggregate', flag)] = PolicyCard.query.filter(getattr(PolicyCard, flag) == True).count()
+        expected[('aggregate', 'with_gaps')] = PolicyCard.query.filter(
+            db.or_(*[getattr(PolicyCard, flag) == True for flag in GAP_FLAGS])
+        ).count()
+        for ministry, count in db.session.query(PolicyCard.ministry, func.count(PolicyCard.id)).group_by(
+            PolicyCard.ministry
+        ):
+            if ministry:
+                expected[('ministry', ministry)] = count
+        day = func.date(PolicyCard.publication_date)
+        for published, count in db.session.query(day, func.count(PolicyCard.id)).group_by(day):
+            if published is not None:
+                if isinstance(published, str):
+                    published = date.fromisoformat(published)
+                expected[('day', published)] = count
+        return expected
+
+    def _stored(self) -> Counter:
+        stored: Counter = Counter()
+        for row in PolicyAggregate.query.filter(PolicyAggregate.key.notin_(MARKERS)):
+            stored[('aggregate', row.key)] = row.value
+        for row in MinistryPolicyCount.query.all():
+            stored[('ministry', row.ministry)] = row.count
+        for row in PolicyDailyCount.query.all():
+            stored[('day', row.day)] = row.count
+        return stored
+
+    def check(self) -> Dict[str, Any]:
+        """Compare the counters with the policy table; drift lists stored vs expected values"""
+        expected, stored = self._expected(), self._stored()
+        drift = []
+        for key in sorted(set(expected) | set(stored), key=lambda k: (k[0], str(k[1]))):
+            if expected.get(key, 0) != stored.get(key, 0):
+                drift.append({'counter': key[0], 'key': str(key[1]),
+                              'stored': stored.get(key, 0), 'expected': expected.get(key, 0)})
+        return {'consistent': not drift, 'drift': drift}
+
+    def rebuild(self) -> Dict[str, Any]:
+        """Recompute every counter from the policy table in one transaction.
+        The generation is kept and bumped, since the served stats may change.
+        """
+        expected = self._expected()
+        try:
+            PolicyAggregate.query.filter(PolicyAggregate.key.notin_(MARKERS)).delete()
+            MinistryPolicyCount.query.delete()
+            PolicyDailyCount.query.delete()
+            for (kind, key), value in expected.items():
+                if kind == 'aggregate':
+                    db.session.add(PolicyAggregate(key=key, value=value))
+                elif kind == 'ministry':
+                    db.session.add(MinistryPolicyCount(ministry=key, count=value))
+                else:
+                    db.session.add(PolicyDailyCount(day=key, count=value))
+            self.bump(GENERATION)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return {'rebuilt': True, 'counters': len(expected)}
+
+
+# Global instance
+policy_stats = PolicyStats()
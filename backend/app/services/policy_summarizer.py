@@ -1,11 +1,133 @@
 import re
 import logging
 from datetime import datetime
+from functools import lru_cache
+
+from app.services.glossary_translator import translate_summary
+from app.utils.keyword_matcher import trie_alternation
+
+# Fragments kept per keyword, and per category across all of its keywords
+MAX_MATCHES_PER_KEYWORD = 2
+MAX_MATCHES_PER_CATEGORY = 3
+
+
+class PolicyTextExtractor:
+    """Single-pass extractor for change, action and affected-party cues.
+
+    One compiled lookahead alternation, factored into a prefix trie, reports
+    every keyword start in a single walk over the text instead of one full scan
+    per keyword. Output matches the per-keyword scans it replaces: a fragment
+    runs from the keyword to the end of its sentence, a keyword counts once per
+    sentence, each keyword keeps at most two fragments and categories are
+    ordered by keyword order. The walk stops as soon as the first fragments of
+    both categories are settled; parties still missing at that point are
+    looked up in the remaining text directly.
+    """
+
+    def __init__(self, change_keywords, action_keywords, party_keywords):
+        self.change_keywords = list(change_keywords)
+        self.action_keywords = list(action_keywords)
+        self.parties = list(party_keywords)
+        # lowercase keyword -> [(category, key)]
+        self._lookup = {}
+        for keyword in self.change_keywords:
+            self._lookup.setdefault(keyword.lower(), []).append(('changes', keyword))
+        for keyword in self.action_keywords:
+            self._lookup.setdefault(keyword.lower(), []).append(('actions', keyword))
+        self._party_keywords = {}
+        for party, keywords in party_keywords.items():
+            self._party_keywords[party] = [keyword.lower() for keyword in keywords]
+            for keyword in keywords:
+                self._lookup.setdefault(keyword.lower(), []).append(('parties', party))
+        self._pattern = self._compile(self._lookup)
+
+    @staticmethod
+    def _compile(keywords):
+        # Zero-width lookahead so keywords overlapping in the text are all reported.
+        # Patterns run case-sensitively over lowercased text: re.IGNORECASE defeats
+        # the engine's literal prefix scan and is several times slower.
+        return re.compile(f'(?=({trie_alternation(keywords)}))')
+
+    @staticmethod
+    def _lower(text):
+        lowered = text.lower()
+        # A few characters change length when lowercased; offsets must stay aligned
+        return lowered if len(lowered) == len(text) else ''.join(ch.lower()[:1] for ch in text)
+
+    @staticmethod
+    def _settled(hits, keywords):
+        """True once more matches can no longer change the first fragments of a category"""
+        taken = 0
+        for keyword in keywords:
+            taken += len(hits[keyword])
+            if taken >= MAX_MATCHES_PER_CATEGORY:
+                return True
+            if len(hits[keyword]) < MAX_MATCHES_PER_KEYWORD:
+                return False
+        return True
+
+    def _collect_parties(self, lowered, pos, parties):
+        """Add parties still missing that have a keyword at or after pos"""
+        for party, keywords in self._party_keywords.items():
+            # str.find is a C-speed scan, cheaper than walking the rest with the regex
+            if party not in parties and any(lowered.find(keyword, pos) >= 0 for keyword in keywords):
+                parties.add(party)
+
+    def extract(self, text, title=''):
+        """Return {'changes': [...], 'actions': [...], 'parties': [...]} from one pass over text"""
+        changes = {keyword: [] for keyword in self.change_keywords}
+        actions = {keyword: [] for keyword in self.action_keywords}
+        buckets = {'changes': changes, 'actions': actions}
+        parties = set()
+        self._collect_parties(self._lower(title), 0, parties)
+
+        lowered = self._lower(text)
+        seen = set()
+        sentence_end = -1
+        for match in self._pattern.finditer(lowered):
+            start = match.start()
+            if start > sentence_end:
+                sentence_end = text.find('.', start)
+                if sentence_end < 0:
+                    sentence_end = len(text)
+                seen.clear()
+
+            added = False
+            for category, key in self._lookup[match.group(1)]:
+                if category == 'parties':
+                    parties.add(key)
+                    continue
+                if (category, key) in seen:
+                    continue
+                seen.add((category, key))
+                hits = buckets[category][key]
+                if len(hits) < MAX_MATCHES_PER_KEYWORD:
+                    hits.append(text[start:sentence_end])
+                    added = True
+
+            if added and self._settled(changes, self.change_keywords) and self._settled(actions, self.action_keywords):
+                # Only party detection is left
+                if len(parties) < len(self.parties):
+                    self._collect_parties(lowered, start + 1, parties)
+                break
+
+        return {
+            'changes': [hit for keyword in self.change_keywords for hit in changes[keyword]][:MAX_MATCHES_PER_CATEGORY],
+            'actions': [hit for keyword in self.action_keywords for hit in actions[keyword]][:MAX_MATCHES_PER_CATEGORY],
+            'parties': [party for party in self.parties if party in parties],
+        }
+
+
+@lru_cache(maxsize=8)
+def _get_extractor(change_keywords, action_keywords, party_items):
+    return PolicyTextExtractor(change_keywords, action_keywords, dict(party_items))
+
 
 class PolicySummarizer:
     def __init__(self):
         # For hackathon speed, using rule-based approach instead of heavy ML models
         self.change_keywords = ['amend', 'replace', 'effective', 'new', 'revised', 'update', 'modify']
+        self.action_keywords = ['shall', 'must', 'required to', 'need to', 'should']
         self.party_keywords = {
             'taxpayers': ['taxpayer', 'tax', 'income', 'gst', 'revenue'],
             'businesses': ['company', 'business', 'enterprise', 'corporate', 'msme'],
@@ -14,6 +136,12 @@ class PolicySummarizer:
             'farmers': ['farmer', 'agriculture', 'crop', 'rural'],
             'banks': ['bank', 'financial', 'rbi', 'sebi', 'finance']
         }
+        # Compiled once per keyword configuration and shared across instances
+        self.extractor = _get_extractor(
+            tuple(self.change_keywords),
+            tuple(self.action_keywords),
+            tuple((party, tuple(keywords)) for party, keywords in self.party_keywords.items())
+        )
         
     def generate_policy_card(self, policy_text, title):
         """Generate structured policy card with bilingual summaries"""
@@ -50,22 +178,17 @@ class PolicySummarizer:
     
     def _analyze_policy_text(self, text, title):
         """Extract structured information from policy text"""
+        found = self.extractor.extract(text, title)
         analysis = {
-            'what_changed': self._extract_changes(text, title),
-            'who_affected': self._extract_affected_parties(text, title),
-            'what_to_do': self._extract_actions(text, title)
+            'what_changed': self._extract_changes(found['changes'], title),
+            'who_affected': self._extract_affected_parties(found['parties'], title),
+            'what_to_do': self._extract_actions(found['actions'], title)
         }
         return analysis
     
-    def _extract_changes(self, text, title):
-        """Extract what has changed in the policy"""
-        changes = []
-        
-        # Look for change indicators in text
-        for keyword in self.change_keywords:
-            pattern = rf'{keyword}[^.]*'
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            changes.extend(matches[:2])  # Limit to 2 matches per keyword
+    def _extract_changes(self, matches, title):
+        """Extract what has changed in the policy from the extractor's change fragments"""
+        changes = list(matches)
         
         # If no specific changes found, infer from title
         if not changes:
@@ -84,50 +207,29 @@ class PolicySummarizer:
         
         return '. '.join(changes[:3]) if changes else "Policy changes not clearly specified"
     
-    def _extract_affected_parties(self, text, title):
-        """Extract who is affected by the policy"""
-        affected = set()
-        
-        # Check text for party keywords
-        text_lower = text.lower()
+    def _extract_affected_parties(self, parties, title):
+        """Extract who is affected by the policy from the parties found in text and title"""
+        affected = list(parties)
         title_lower = title.lower()
-        combined_text = f"{text_lower} {title_lower}"
-        
-        for party, keywords in self.party_keywords.items():
-            if any(keyword in combined_text for keyword in keywords):
-                affected.add(party)
         
         # Infer from title if nothing found
         if not affected:
             if any(word in title_lower for word in ['gst', 'tax', 'income']):
-                affected.add('taxpayers')
+                affected.append('taxpayers')
             elif any(word in title_lower for word in ['sebi', 'securities', 'listing']):
-                affected.add('businesses')
+                affected.append('businesses')
             elif any(word in title_lower for word in ['education', 'student']):
-                affected.add('students')
+                affected.append('students')
             elif any(word in title_lower for word in ['land', 'property']):
-                affected.add('citizens')
+                affected.append('citizens')
             else:
-                affected.add('citizens')
+                affected.append('citizens')
         
         return ', '.join(affected) if affected else "General public"
     
-    def _extract_actions(self, text, title):
-        """Extract required actions"""
-        actions = []
-        
-        # Look for action patterns
-        action_patterns = [
-            r'shall[^.]*',
-            r'must[^.]*',
-            r'required to[^.]*',
-            r'need to[^.]*',
-            r'should[^.]*'
-        ]
-        
-        for pattern in action_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            actions.extend(matches[:2])
+    def _extract_actions(self, matches, title):
+        """Extract required actions from the extractor's action fragments"""
+        actions = list(matches)
         
         # Default actions based on policy type
         if not actions:
@@ -177,36 +279,12 @@ class PolicySummarizer:
         return ' '.join(summary_parts)[:300] + "..." if len(' '.join(summary_parts)) > 300 else ' '.join(summary_parts)
     
     def _translate_to_nepali(self, text):
-        """Translate to Nepali (simplified mapping for hackathon)"""
-        # Basic word mapping for common policy terms
-        translations = {
-            'GST': 'जीएसटी',
-            'tax': 'कर',
-            'Income Tax': 'आयकर',
-            'policy': 'नीति',
-            'notification': 'सूचना',
-            'update': 'अपडेट',
-            'changes': 'परिवर्तन',
-            'citizens': 'नागरिक',
-            'taxpayers': 'करदाता',
-            'businesses': 'व्यवसाय',
-            'students': 'विद्यार्थी',
-            'education': 'शिक्षा',
-            'compliance': 'अनुपालना',
-            'requirements': 'आवश्यकताहरू',
-            'effective': 'प्रभावकारी',
-            'implementation': 'कार्यान्वयन'
-        }
-        
-        nepali_text = text
-        for english, nepali in translations.items():
-            nepali_text = nepali_text.replace(english, nepali)
-        
-        # If no translations found, provide generic Nepali message
-        if nepali_text == text:
-            return f"नीति अपडेट: {text[:50]}... (पूर्ण नेपाली अनुवाद उपलब्ध छैन)"
-        
-        return nepali_text
+        """Translate to Nepali with the offline policy glossary"""
+        return translate_summary(text, 'ne')
+
+    def _translate_to_hindi(self, text):
+        """Translate to Hindi with the offline policy glossary"""
+        return translate_summary(text, 'hi')
     
     def identify_gaps(self, policy_data):
         """Identify missing information gaps for RTI generation"""
@@ -0,0 +1,241 @@
+"""
+Content-addressed, compressed storage for policy source text.
+
+Scraped gazette text used to sit uncompressed in ``policy_cards``, which made
+the hot table, the SQLite file and its page cache several times larger than
+the cards themselves. The text now lives in ``policy_text_blobs``:
+
+- One row per distinct document, keyed by the SHA-256 of its UTF-8 text, so
+  re-scraped or cross-posted documents are stored once.
+- Compressed with zstd when the ``zstandard`` package is installed, zlib
+  otherwise. Each blob records its codec, so both kinds can be read later.
+- ``policy_cards`` keeps only the hash (``text_sha256``).
+
+``PolicyCard.original_text`` stays a plain attribute for callers: assigning
+it hashes the text, and a ``before_flush`` hook writes the blob in the same
+transaction if it is new. Reading it decompresses on demand. Blobs are
+immutable, so recently read texts are cached by hash.
+
+Rows written before the store existed keep their text in the legacy
+``original_text`` column and are still read from there. ``migrate`` (or
+``flask migrate-policy-text``) moves them into the store in batches and
+drops blobs no policy points to.
+"""
+
+import os
+import zlib
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, func, inspect, text
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models.policy import PolicyCard
+from app.models.policy_text import PolicyTextBlob
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+POLICY_TEXT_CODEC = os.getenv('POLICY_TEXT_CODEC', 'zstd' if ZSTD_AVAILABLE else 'zlib')
+POLICY_TEXT_LEVEL = int(os.getenv('POLICY_TEXT_LEVEL', '9'))
+POLICY_TEXT_CACHE_SIZE = int(os.getenv('POLICY_TEXT_CACHE_SIZE', '32'))
+
+# Instance attribute holding text assigned (or already decompressed) on a PolicyCard
+_TEXT_ATTR = '_policy_text'
+
+
+def text_digest(value: str) -> str:
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+
+def compress(value: str, codec: str = POLICY_TEXT_CODEC, level: int = POLICY_TEXT_LEVEL) -> bytes:
+    raw = value.encode('utf-8')
+    if codec == 'zstd':
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstd codec requested but the zstandard package is not installed")
+        return zstandard.ZstdCompressor(level=level).compress(raw)
+    if codec == 'zlib':
+        return zlib.compress(raw, level)
+    raise ValueError(f"Unknown policy text codec: {codec}")
+
+
+def decompress(data: bytes, codec: str) -> str:
+    if codec == 'zstd':
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("Policy text is zstd-compressed but the zstandard package is not installed")
+        raw = zstandard.ZstdDecompressor().decompress(data)
+    elif codec == 'zlib':
+        raw = zlib.decompress(data)
+    else:
+        raise ValueError(f"Unknown policy text codec: {codec}")
+    return raw.decode('utf-8')
+
+
+def _new_blob(digest: str, value: str, codec: str) -> PolicyTextBlob:
+    data = compress(value, codec)
+    return PolicyTextBlob(sha256=digest, codec=codec, length=len(value),
+                          raw_bytes=len(value.encode('utf-8')), stored_bytes=len(data), data=data)
+
+
+def _blob_exists(session, digest: str) -> bool:
+    return session.query(PolicyTextBlob.sha256).filter(PolicyTextBlob.sha256 == digest).first() is not None
+
+
+def _before_flush(session, flush_context, instances) -> None:
+    """Write blobs for texts assigned since the last flush, once per distinct text"""
+    added = {obj.sha256 for obj in session.new if isinstance(obj, PolicyTextBlob)}
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, PolicyCard) or obj.text_sha256 is None or obj.text_sha256 in added:
+            continue
+        # Only cards whose text was assigned since they were loaded or created
+        if obj.text_sha256 not in inspect(obj).attrs.text_sha256.history.added:
+            continue
+        value = obj.__dict__.get(_TEXT_ATTR)
+        if value is None:
+            continue
+        if not _blob_exists(session, obj.text_sha256):
+            session.add(_new_blob(obj.text_sha256, value, policy_text_store.codec))
+        added.add(obj.text_sha256)
+
+
+_listener_lock = threading.Lock()
+_listening = False
+
+
+class PolicyTextStore:
+    def __init__(self, codec: str = POLICY_TEXT_CODEC, cache_size: int = POLICY_TEXT_CACHE_SIZE):
+        self.codec = codec
+        self.cache_size = cache_size
+        self._cache: 'OrderedDict[str, str]' = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def init_app(self, app) -> None:
+        """Start writing blobs on flush and register the migrate-policy-text command"""
+        global _listening
+        with _listener_lock:
+            if not _listening:
+                event.listen(Session, 'before_flush', _before_flush)
+                _listening = True
+
+        import click
+
+        @app.cli.command('migrate-policy-text')
+        @click.option('--batch-size', default=200, show_default=True)
+        @click.option('--vacuum/--no-vacuum', default=False, help='Compact the SQLite file afterwards')
+        def migrate_policy_text(batch_size, vacuum):
+            """Move policy text from policy_cards into the compressed blob store"""
+            click.echo(self.migrate(batch_size=batch_size, vacuum=vacuum))
+
+    # --- PolicyCard.original_text ---
+
+    def assign(self, card: PolicyCard, value: Optional[str]) -> None:
+        """Point card at value's blob; the blob itself is written on flush if new"""
+        card.__dict__[_TEXT_ATTR] = value
+        card.text_sha256 = text_digest(value) if value is not None else None
+        # Setting a deferred column does not load it first
+        card._legacy_text = None
+
+    def text_of(self, card: PolicyCard) -> Optional[str]:
+        if _TEXT_ATTR in card.__dict__:
+            return card.__dict__[_TEXT_ATTR]
+        if card.text_sha256 is None:
+            return card._legacy_text
+        value = self.get(card.text_sha256)
+        card.__dict__[_TEXT_ATTR] = value
+        return value
+
+    # --- Reads ---
+
+    def get(self, digest: str) -> Optional[str]:
+        """The text stored under digest, decompressed, or None if there is no such blob"""
+        with self._cache_lock:
+            if digest in self._cache:
+                self._cache.move_to_end(digest)
+                return self._cache[digest]
+        row = db.session.query(PolicyTextBlob.codec, PolicyTextBlob.data).filter(
+            PolicyTextBlob.sha256 == digest
+        ).first()
+        if row is None:
+            logger.warning(f"Policy text blob {digest} is missing")
+            return None
+        value = decompress(row.data, row.codec)
+        if self.cache_size > 0:
+            with self._cache_lock:
+                self._cache[digest] = value
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        blobs, raw, stored = db.session.query(
+            func.count(PolicyTextBlob.sha256),
+            func.coalesce(func.sum(PolicyTextBlob.raw_bytes), 0),
+            func.coalesce(func.sum(PolicyTextBlob.stored_bytes), 0),
+        ).one()
+        return {'blobs': blobs, 'raw_bytes': int(raw), 'stored_bytes': int(stored),
+                'ratio': round(raw / stored, 2) if stored else None, 'codec': self.codec}
+
+    # --- Maintenance ---
+
+    def migrate(self, batch_size: int = 200, vacuum: bool = False) -> Dict[str, Any]:
+        """Move legacy original_text values into blobs, a batch per transaction, then prune orphans.
+        Safe to re-run; rows already migrated are skipped.
+        """
+        table = PolicyCard.__table__
+        migrated = blobs_created = 0
+        while True:
+            rows = db.session.query(PolicyCard.id, PolicyCard._legacy_text).filter(
+                PolicyCard._legacy_text.isnot(None), PolicyCard.text_sha256.is_(None)
+            ).order_by(PolicyCard.id).limit(batch_size).all()
+            if not rows:
+                break
+            try:
+                created = set()
+                for policy_id, value in rows:
+                    digest = text_digest(value)
+                    if digest not in created and not _blob_exists(db.session, digest):
+                        db.session.add(_new_blob(digest, value, self.codec))
+                        created.add(digest)
+                    # Core update: only the reference changes, so the policy's counters and tags stay put
+                    db.session.execute(table.update().where(table.c.id == policy_id).values(
+                        text_sha256=digest, original_text=None, updated_at=table.c.updated_at
+                    ))
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+            migrated += len(rows)
+            blobs_created += len(created)
+            logger.info(f"Moved text of {migrated} policies into the blob store")
+        pruned = self.prune()
+        if vacuum and db.engine.dialect.name == 'sqlite':
+            with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+                connection.execute(text('VACUUM'))
+        return dict({'migrated': migrated, 'blobs_created': blobs_created, 'blobs_pruned': pruned},
+                    **self.stats())
+
+    def prune(self) -> int:
+        """Delete blobs no policy refers to (after policies were deleted or their text replaced)"""
+        referenced = db.session.query(PolicyCard.id).filter(PolicyCard.text_sha256 == PolicyTextBlob.sha256)
+        try:
+            pruned = PolicyTextBlob.query.filter(~referenced.exists()).delete(synchronize_session=False)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        with self._cache_lock:
+            self._cache.clear()
+        return pruned
+
+
+# Global instance
+policy_text_store = PolicyTextStore()
@@ -0,0 +1,113 @@
+"""
+Streaming RSS/Atom reader shared by the missing-topics endpoint and the scraper.
+
+The response body is fed to an lxml pull parser chunk by chunk, and each
+finished <item>/<entry> is turned into a normalized record and released.
+Once ``max_items`` records have been yielded the download is abandoned, so a
+long feed costs no more than its first few entries. Records have the shape
+``{'title', 'description', 'link', 'pubDate'}``.
+"""
+
+import re
+import logging
+from typing import Dict, Iterable, Iterator, Optional
+
+import requests
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+FEED_CHUNK_SIZE = 16 * 1024
+ITEM_TAGS = frozenset(('item', 'entry'))
+DESCRIPTION_TAGS = ('description', 'summary', 'content', 'encoded')
+DATE_TAGS = ('pubDate', 'published', 'updated', 'date')
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def _local_name(tag) -> str:
+    # Comments and processing instructions have non-string tags
+    if not isinstance(tag, str):
+        return ''
+    return tag.rsplit('}', 1)[-1]
+
+
+def _clean(text: Optional[str]) -> str:
+    """Drop embedded HTML markup and collapse whitespace"""
+    if not text:
+        return ''
+    return _SPACE_RE.sub(' ', _TAG_RE.sub(' ', text)).strip()
+
+
+def _record(item) -> Dict[str, str]:
+    fields: Dict[str, str] = {}
+    link = ''
+    for child in item:
+        name = _local_name(child.tag)
+        if name == 'link':
+            # RSS puts the URL in the text, Atom in href (prefer rel="alternate")
+            href = child.get('href')
+            if href and (not link or child.get('rel', 'alternate') == 'alternate'):
+                link = href
+            elif not href and not link:
+                link = (child.text or '').strip()
+        elif name and name not in fields:
+            fields[name] = ''.join(child.itertext())
+
+    description = next((fields[tag] for tag in DESCRIPTION_TAGS if fields.get(tag)), '')
+    pub_date = next((fields[tag].strip() for tag in DATE_TAGS if fields.get(tag)), '')
+    return {
+        'title': _clean(fields.get('title')),
+        'description': _clean(description),
+        'link': link,
+        'pubDate': pub_date,
+    }
+
+
+def iter_feed_records(chunks: Iterable[bytes], max_items: int = 10) -> Iterator[Dict[str, str]]:
+    """Incrementally parse feed bytes and yield up to max_items records"""
+    if max_items <= 0:
+        return
+    parser = etree.XMLPullParser(events=('end',), recover=True, resolve_entities=False, no_network=True)
+    yielded = 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+        parser.feed(chunk)
+        for _, element in parser.read_events():
+            if _local_name(element.tag) not in ITEM_TAGS:
+                continue
+            record = _record(element)
+            # Release the finished item and anything parsed before it
+            element.clear()
+            parent = element.getparent()
+            if parent is not None:
+                while element.getprevious() is not None:
+                    del parent[0]
+            if not record['title']:
+                continue
+            yield record
+            yielded += 1
+            if yielded >= max_items:
+                return
+
+
+def iter_response_items(response, max_items: int = 10) -> Iterator[Dict[str, str]]:
+    """Yield records from an open (ideally streaming) requests response, then close it"""
+    try:
+        yield from iter_feed_records(response.iter_content(FEED_CHUNK_SIZE), max_items)
+    finally:
+        response.close()
+
+
+def read_feed(url: str, max_items: int = 10, headers: Optional[Dict[str, str]] = None,
+              timeout: int = 10) -> Iterator[Dict[str, str]]:
+    """Fetch a feed and stream up to max_items records; HTTP errors raise before the first record"""
+    response = requests.get(url, headers=headers, timeout=timeout, stream=True)
+    try:
+        response.raise_for_status()
+    except Exception:
+        response.close()
+        raise
+    return iter_response_items(response, max_items)
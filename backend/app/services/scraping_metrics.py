@@ -0,0 +1,288 @@
+"""
+Per-source instrumentation for the scrapers, served by /api/scraping-status.
+
+Each ``scrape_*`` method is wrapped with ``scraping_metrics.instrument(source)``.
+A run covers one call. For generator scrapers, only the time spent inside the
+generator counts, so the consumer's own work (sentiment batches, trend updates)
+is not charged to the source. For each run the wrapper records:
+
+- fetch: time spent in ``scraping_metrics.get`` or inside a ``fetching()`` block
+  around an API client call
+- parse: the rest of the source's own time, rate-limit pauses included
+- sentiment: reported separately with ``observe`` by whoever scores the posts
+- items yielded, HTTP status and bytes of the last response, and errors
+
+Durations go into fixed-bucket histograms, so memory does not grow with the
+number of runs.
+"""
+
+import time
+import logging
+import threading
+import functools
+import inspect
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds; the last bucket catches everything slower
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+PHASES = ('fetch', 'parse', 'sentiment', 'total')
+
+
+class DurationHistogram:
+    def __init__(self, bounds=DURATION_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        index = next((i for i, bound in enumerate(self.bounds) if seconds <= bound), len(self.bounds))
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile"""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def as_dict(self) -> Dict[str, Any]:
+        labels = [f"le_{bound:g}" for bound in self.bounds] + ['le_inf']
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 4),
+            'mean': round(self.sum / self.count, 4) if self.count else None,
+            'max': round(self.max, 4),
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'buckets': dict(zip(labels, self.counts)),
+        }
+
+
+class _Run:
+    """Counters for one call of an instrumented scraper"""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.started_at = datetime.now()
+        self.own_time = 0.0
+        self.fetch_time = 0.0
+        self.items = 0
+        self.bytes = 0
+        self.http_status: Optional[int] = None
+        self.errors = 0
+        self.last_error: Optional[str] = None
+
+
+class _SourceStats:
+    def __init__(self):
+        self.runs = 0
+        self.items = 0
+        self.errors = 0
+        self.bytes = 0
+        self.last_run: Optional[Dict[str, Any]] = None
+        self.histograms = {phase: DurationHistogram() for phase in PHASES}
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'runs': self.runs,
+            'items_yielded': self.items,
+            'errors': self.errors,
+            'bytes': self.bytes,
+            'last_run': self.last_run,
+            'durations': {phase: histogram.as_dict() for phase, histogram in self.histograms.items()},
+        }
+
+
+class ScrapingMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sources: Dict[str, _SourceStats] = {}
+        # Runs nest (an aggregate scraper drives leaf scrapers), so keep a stack per thread
+        self._local = threading.local()
+
+    def _stack(self) -> List[_Run]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _stats(self, source: str) -> _SourceStats:
+        stats = self._sources.get(source)
+        if stats is None:
+            stats = self._sources[source] = _SourceStats()
+        return stats
+
+    def instrument(self, source: str) -> Callable:
+        """Decorator recording a run of source per call; supports plain and generator functions"""
+        def decorator(func):
+            if inspect.isgeneratorfunction(func):
+                @functools.wraps(func)
+                def generator_wrapper(*args, **kwargs):
+                    run = _Run(source)
+                    generator = func(*args, **kwargs)
+                    try:
+                        while True:
+                            stack = self._stack()
+                            stack.append(run)
+                            started = time.perf_counter()
+                            try:
+                                item = next(generator)
+                            except StopIteration:
+                                break
+                            finally:
+                                run.own_time += time.perf_counter() - started
+                                stack.pop()
+                            run.items += 1
+                            yield item
+                    except Exception as e:
+                        self._error(run, e)
+                        raise
+                    finally:
+                        generator.close()
+                        self._finish(run)
+                return generator_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                run = _Run(source)
+                stack = self._stack()
+                stack.append(run)
+                started = time.perf_counter()
+                try:
+                    result = func(*args, **kwargs)
+                    if isinstance(result, (list, tuple)):
+                        run.items = len(result)
+                    return result
+                except Exception as e:
+                    self._error(run, e)
+                    raise
+                finally:
+                    run.own_time += time.perf_counter() - started
+                    stack.pop()
+                    self._finish(run)
+            return wrapper
+        return decorator
+
+    @contextmanager
+    def fetching(self):
+        """Charge the enclosed block (e.g. an API client call) to the fetch time of the running sources"""
+        runs = list(self._stack())
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            if runs:
+                self._error(runs[-1], e)
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            for run in runs:
+                run.fetch_time += elapsed
+
+    def get(self, url: str, session=None, **kwargs):
+        """requests.get (or session.get) timed as fetch, recording status and size"""
+        with self.fetching():
+            response = (session or requests).get(url, **kwargs)
+        self.observe_response(response, streamed=kwargs.get('stream', False))
+        return response
+
+    def observe_response(self, response, streamed: bool = False) -> None:
+        stack = self._stack()
+        if not stack:
+            return
+        run = stack[-1]
+        run.http_status = response.status_code
+        if response.status_code >= 400:
+            run.errors += 1
+            run.last_error = f"HTTP {response.status_code} for {response.url}"
+        # Streaming bodies are read later by the caller; rely on the declared length
+        if streamed:
+            try:
+                size = int(response.headers.get('Content-Length') or 0)
+            except ValueError:
+                size = 0
+        else:
+            size = len(response.content or b'')
+        for each in stack:
+            each.bytes += size
+
+    def observe(self, source: str, phase: str, seconds: float) -> None:
+        """Record a duration measured outside the source's run, e.g. batch sentiment scoring"""
+        with self._lock:
+            stats = self._stats(source)
+            stats.histograms[phase].observe(seconds)
+            if stats.last_run is not None:
+                stats.last_run[f'{phase}_seconds'] = round(stats.last_run.get(f'{phase}_seconds', 0) + seconds, 4)
+
+    @contextmanager
+    def timed(self, source: str, phase: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(source, phase, time.perf_counter() - started)
+
+    def _error(self, run: _Run, error: Exception) -> None:
+        # An error raised by a fetch and left uncaught would otherwise count twice
+        if getattr(error, '_scrape_counted', False):
+            return
+        # raise_for_status() on a response observe_response already counted
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            return
+        try:
+            error._scrape_counted = True
+        except AttributeError:
+            pass
+        run.errors += 1
+        run.last_error = str(error)
+
+    def _finish(self, run: _Run) -> None:
+        parse_time = max(run.own_time - run.fetch_time, 0.0)
+        with self._lock:
+            stats = self._stats(run.source)
+            stats.runs += 1
+            stats.items += run.items
+            stats.errors += run.errors
+            stats.bytes += run.bytes
+            stats.histograms['total'].observe(run.own_time)
+            stats.histograms['fetch'].observe(run.fetch_time)
+            stats.histograms['parse'].observe(parse_time)
+            stats.last_run = {
+                'started_at': run.started_at.isoformat(),
+                'finished_at': datetime.now().isoformat(),
+                'duration_seconds': round(run.own_time, 4),
+                'fetch_seconds': round(run.fetch_time, 4),
+                'parse_seconds': round(parse_time, 4),
+                'items_yielded': run.items,
+                'http_status': run.http_status,
+                'bytes': run.bytes,
+                'errors': run.errors,
+                'last_error': run.last_error,
+            }
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {source: stats.as_dict() for source, stats in sorted(self._sources.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._sources.clear()
+
+
+# Global metrics registry
+scraping_metrics = ScrapingMetrics()
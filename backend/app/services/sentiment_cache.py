@@ -0,0 +1,179 @@
+"""
+Content-addressed cache for sentiment results.
+
+Keys are a SHA-256 of the analyzer version plus the normalized text, so the
+same headline arriving from several sources or on every poll is scored once.
+A bounded in-memory LRU sits in front of a SQLite store that survives
+restarts. Upgrading VADER or TextBlob changes ANALYZER_VERSION, which makes
+every old key miss; rows written by other versions are pruned on startup.
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+from importlib import metadata
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'instance', 'sentiment_cache.db')
+# Set SENTIMENT_CACHE_PATH to an empty string to keep the cache in memory only
+SENTIMENT_CACHE_PATH = os.getenv('SENTIMENT_CACHE_PATH', DEFAULT_CACHE_PATH)
+SENTIMENT_CACHE_SIZE = int(os.getenv('SENTIMENT_CACHE_SIZE', '10000'))
+# Bump when the scoring logic itself changes
+SCORING_REVISION = 2
+
+
+def _package_version(name: str) -> str:
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return 'unknown'
+
+
+ANALYZER_VERSION = (
+    f"vader-{_package_version('vaderSentiment')}"
+    f"+textblob-{_package_version('textblob')}"
+    f"+r{SCORING_REVISION}"
+)
+
+
+def normalize_text(text: str) -> str:
+    """Unicode-normalize and collapse whitespace; case is kept because VADER scores capitals"""
+    return ' '.join(unicodedata.normalize('NFC', text or '').split())
+
+
+def content_key(text: str, version: str = ANALYZER_VERSION) -> str:
+    return hashlib.sha256(f"{version}\0{normalize_text(text)}".encode('utf-8')).hexdigest()
+
+
+class SentimentCache:
+    """Bounded LRU in front of an optional persistent SQLite store"""
+
+    def __init__(self, path: Optional[str] = SENTIMENT_CACHE_PATH, max_size: int = SENTIMENT_CACHE_SIZE,
+                 version: str = ANALYZER_VERSION):
+        self.version = version
+        self.max_size = max_size
+        self._memory: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.memory_hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        if path:
+            self._open_store(os.path.abspath(path))
+
+    def _open_store(self, path: str) -> None:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, timeout=5)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS sentiment_cache ('
+                'key TEXT PRIMARY KEY, version TEXT NOT NULL, result TEXT NOT NULL)'
+            )
+            # Results from another analyzer version can never be hit again
+            self._db.execute('DELETE FROM sentiment_cache WHERE version != ?', (self.version,))
+            self._db.commit()
+        except Exception as e:
+            logger.warning(f"Sentiment cache store unavailable at {path}, using memory only: {e}")
+            self._db = None
+
+    def key(self, text: str) -> str:
+        return content_key(text, self.version)
+
+    def _remember(self, key: str, result: Dict[str, Any]) -> None:
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Look up keys; returns only the ones that were found"""
+        found: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                if key in found:
+                    continue
+                result = self._memory.get(key)
+                if result is not None:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    found[key] = result
+                else:
+                    missing.append(key)
+
+            if missing and self._db is not None:
+                try:
+                    for start in range(0, len(missing), 500):
+                        chunk = missing[start:start + 500]
+                        placeholders = ','.join('?' * len(chunk))
+                        rows = self._db.execute(
+                            f'SELECT key, result FROM sentiment_cache WHERE key IN ({placeholders})', chunk
+                        ).fetchall()
+                        for key, raw in rows:
+                            result = json.loads(raw)
+                            self._remember(key, result)
+                            found[key] = result
+                            self.store_hits += 1
+                except Exception as e:
+                    logger.warning(f"Sentiment cache read failed: {e}")
+
+            self.misses += sum(1 for key in set(missing) if key not in found)
+        return found
+
+    def put_many(self, items: Dict[str, Dict[str, Any]]) -> None:
+        if not items:
+            return
+        with self._lock:
+            for key, result in items.items():
+                self._remember(key, result)
+            if self._db is not None:
+                try:
+                    self._db.executemany(
+                        'INSERT OR REPLACE INTO sentiment_cache (key, version, result) VALUES (?, ?, ?)',
+                        [(key, self.version, json.dumps(self._cacheable(result))) for key, result in items.items()]
+                    )
+                    self._db.commit()
+                except Exception as e:
+                    logger.warning(f"Sentiment cache write failed: {e}")
+
+    @staticmethod
+    def _cacheable(result: Dict[str, Any]) -> Dict[str, Any]:
+        # Lazy results are stored as computed so far instead of being forced
+        to_cacheable = getattr(result, 'to_cacheable', None)
+        return to_cacheable() if to_cacheable else result
+
+    def get_or_compute(self, texts: List[str], compute) -> List[Dict[str, Any]]:
+        """Return results for texts in order, calling compute(list_of_texts) only for misses"""
+        keys = [self.key(text) for text in texts]
+        found = self.get_many(keys)
+        pending: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in pending:
+                pending[key] = text
+        if pending:
+            computed = dict(zip(pending.keys(), compute(list(pending.values()))))
+            self.put_many(computed)
+            found.update(computed)
+        return [found[key] for key in keys]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.store_hits + self.misses
+        return {
+            'analyzer_version': self.version,
+            'memory_entries': len(self._memory),
+            'memory_hits': self.memory_hits,
+            'store_hits': self.store_hits,
+            'misses': self.misses,
+            'hit_rate': round((self.memory_hits + self.store_hits) / lookups, 4) if lookups else 0.0,
+            'persistent': self._db is not None,
+        }
+
+
+sentiment_cache = SentimentCache()
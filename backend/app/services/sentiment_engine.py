@@ -0,0 +1,192 @@
+"""
+Tiered sentiment scoring, with batches run on a pool of pre-warmed worker processes.
+
+VADER runs first and decides the label. TextBlob is the slower secondary scorer
+and only runs eagerly when VADER's compound score falls inside the ambiguous
+band, or when the caller asks for full detail. Otherwise it runs lazily, the
+first time a consumer reads ``result['textblob']``; until then the entry is
+``None``, which serializes as ``"textblob": null`` (secondary scores not
+computed because VADER was confident, see ``tier``).
+
+VADER and TextBlob are pure Python and CPU-bound, so scoring inside the
+scraping thread is serialized behind the GIL. ``analyze_batch`` splits the
+texts into chunks, scores them on worker processes that build their analyzers
+once at startup, and returns results in input order. Small batches are scored
+inline because shipping them to a worker costs more than it saves.
+"""
+
+import os
+import atexit
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from textblob import TextBlob
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+logger = logging.getLogger(__name__)
+
+SENTIMENT_WORKERS = int(os.getenv('SENTIMENT_WORKERS', str(os.cpu_count() or 1)))
+# Batches smaller than this are scored in-process
+SENTIMENT_POOL_MIN_BATCH = int(os.getenv('SENTIMENT_POOL_MIN_BATCH', '32'))
+SENTIMENT_CHUNK_SIZE = int(os.getenv('SENTIMENT_CHUNK_SIZE', '64'))
+# |compound| below this is treated as uncertain and gets secondary scores up front
+SENTIMENT_AMBIGUOUS_BAND = float(os.getenv('SENTIMENT_AMBIGUOUS_BAND', '0.2'))
+
+NEUTRAL_SENTIMENT = {
+    'overall': 'neutral',
+    'vader': {'compound': 0, 'pos': 0, 'neu': 1, 'neg': 0},
+    'textblob': {'polarity': 0, 'subjectivity': 0},
+    'confidence': 0
+}
+
+
+def textblob_scores(text: str) -> Dict[str, float]:
+    """Secondary scores from TextBlob's pattern analyzer"""
+    try:
+        sentiment = TextBlob(text).sentiment
+        return {'polarity': sentiment.polarity, 'subjectivity': sentiment.subjectivity}
+    except Exception as e:
+        logger.error(f"TextBlob sentiment error: {e}")
+        return {'polarity': 0, 'subjectivity': 0}
+
+
+class SentimentResult(dict):
+    """Sentiment dict whose ``textblob`` entry is computed on first read.
+
+    ``result['textblob']`` and ``result.get('textblob')`` trigger the secondary
+    scorer. Iteration and JSON serialization do not: they see ``textblob`` as
+    None (null) until it has been computed.
+    """
+
+    def __init__(self, data: Dict[str, Any], text: Optional[str] = None):
+        super().__init__(data)
+        self._text = text if data.get('textblob') is None else None
+        if self._text is not None:
+            self['textblob'] = None
+
+    def __getitem__(self, key):
+        if key == 'textblob' and self._text is not None:
+            text, self._text = self._text, None
+            self['textblob'] = textblob_scores(text)
+            self['tier'] = 'vader+textblob'
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_cacheable(self) -> Dict[str, Any]:
+        """Plain dict of the scores computed so far (textblob None if it was not)"""
+        return dict(dict.items(self))
+
+
+def with_lazy_secondary(result: Dict[str, Any], text: str) -> Dict[str, Any]:
+    """Re-attach lazy TextBlob scoring to a result that was stored without it"""
+    if isinstance(result, SentimentResult) or result.get('textblob') is not None:
+        return result
+    return SentimentResult(result, text)
+
+
+def score_sentiment(analyzer: SentimentIntensityAnalyzer, text: str, detail: bool = False) -> Dict[str, Any]:
+    """Score one text. The label and confidence come from VADER's compound score;
+    TextBlob runs now only for ambiguous compounds or when detail is requested.
+    """
+    try:
+        vader_scores = analyzer.polarity_scores(text)
+        compound = vader_scores['compound']
+
+        if compound >= 0.05:
+            overall_sentiment = 'positive'
+        elif compound <= -0.05:
+            overall_sentiment = 'negative'
+        else:
+            overall_sentiment = 'neutral'
+
+        result = {
+            'overall': overall_sentiment,
+            'vader': vader_scores,
+            'confidence': abs(compound),
+            'tier': 'vader'
+        }
+        if detail or abs(compound) < SENTIMENT_AMBIGUOUS_BAND:
+            result['textblob'] = textblob_scores(text)
+            result['tier'] = 'vader+textblob'
+            return SentimentResult(result)
+        return SentimentResult(result, text)
+    except Exception as e:
+        logger.error(f"Sentiment analysis error: {e}")
+        return {key: dict(value) if isinstance(value, dict) else value for key, value in NEUTRAL_SENTIMENT.items()}
+
+
+# --- Worker process side ---
+_worker_analyzer: Optional[SentimentIntensityAnalyzer] = None
+
+
+def _init_worker():
+    """Build the analyzers once per worker so chunks do not pay the lexicon load"""
+    global _worker_analyzer
+    _worker_analyzer = SentimentIntensityAnalyzer()
+    score_sentiment(_worker_analyzer, 'warm up the analyzers')
+
+
+def _score_chunk(texts: List[str]) -> List[Dict[str, Any]]:
+    return [score_sentiment(_worker_analyzer, text) for text in texts]
+
+
+class SentimentPool:
+    """Lazily started process pool shared by every caller in this process"""
+
+    def __init__(self, workers: int = SENTIMENT_WORKERS, min_batch: int = SENTIMENT_POOL_MIN_BATCH,
+                 chunk_size: int = SENTIMENT_CHUNK_SIZE):
+        self.workers = workers
+        self.min_batch = min_batch
+        self.chunk_size = chunk_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._analyzer: Optional[SentimentIntensityAnalyzer] = None
+
+    @property
+    def analyzer(self) -> SentimentIntensityAnalyzer:
+        if self._analyzer is None:
+            self._analyzer = SentimentIntensityAnalyzer()
+        return self._analyzer
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+            return self._executor
+
+    def analyze_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Score texts and return results in input order"""
+        if not texts:
+            return []
+        if self.workers <= 1 or len(texts) < self.min_batch:
+            return [score_sentiment(self.analyzer, text) for text in texts]
+
+        # Spread work evenly so every worker gets at least one chunk
+        chunk_size = max(1, min(self.chunk_size, -(-len(texts) // self.workers)))
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        try:
+            results: List[Dict[str, Any]] = []
+            for chunk_result in self._get_executor().map(_score_chunk, chunks):
+                results.extend(chunk_result)
+            return results
+        except Exception as e:
+            logger.warning(f"Sentiment pool failed, scoring inline: {e}")
+            self.shutdown()
+            return [score_sentiment(self.analyzer, text) for text in texts]
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+sentiment_pool = SentimentPool()
+atexit.register(sentiment_pool.shutdown)
@@ -3,10 +3,9 @@ import time
 import json
 import re
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
-import requests
+from collections import Counter
+from typing import List, Dict, Any, Optional, Iterator, Callable
 from bs4 import BeautifulSoup
-from textblob import TextBlob
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 import praw
 try:
@@ -24,12 +23,28 @@ except ImportError:
     print("YouTube API not available - googleapiclient import failed")
 
 from .additional_social_sources import additional_social_sources
+from .twitter_polling import TwitterPollState, build_query_groups, build_query, iter_search_pages
+from .youth_trends import TrendAccumulator, YouthOpinionPipeline
+from .rss_reader import iter_response_items
+from .mention_counter import YOUTH, mention_counter
+from .sentiment_engine import score_sentiment, sentiment_pool, with_lazy_secondary
+from .sentiment_cache import sentiment_cache
+from .topic_taxonomy import youth_keyword_matcher
+from .scraping_metrics import scraping_metrics
+from app.utils.simhash import NearDuplicateIndex
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Fingerprints kept for near-duplicate detection; oldest are evicted so memory stays bounded
+DUPLICATE_WINDOW = int(os.getenv('DUPLICATE_WINDOW', '5000'))
+# Set by merge_near_duplicate for one scrape; stripped from posts reused across scrapes
+MERGE_FIELDS = ('engagement', 'duplicate_count', 'duplicate_sources')
+# Posts buffered before their sentiment is scored in one batch
+SENTIMENT_BATCH_SIZE = int(os.getenv('SENTIMENT_BATCH_SIZE', '64'))
+
 class SocialMediaScraper:
     """
     Comprehensive social media scraper for youth opinions
@@ -38,6 +53,10 @@ class SocialMediaScraper:
     
     def __init__(self):
         self.sentiment_analyzer = SentimentIntensityAnalyzer()
+        self.twitter_state = TwitterPollState()
+        # Set for the duration of a comprehensive scrape; None disables near-duplicate merging
+        self.duplicate_index: Optional[NearDuplicateIndex] = None
+        self.duplicates_merged = 0
         self.setup_apis()
         
     def setup_apis(self):
@@ -103,48 +122,59 @@ class SocialMediaScraper:
             logger.warning(f"YouTube API not available: {e}")
             self.youtube = None
 
-    def analyze_sentiment(self, text: str) -> Dict[str, Any]:
-        """Analyze sentiment of text using multiple methods"""
-        try:
-            # VADER sentiment
-            vader_scores = self.sentiment_analyzer.polarity_scores(text)
-            
-            # TextBlob sentiment
-            blob = TextBlob(text)
-            textblob_polarity = blob.sentiment.polarity
-            textblob_subjectivity = blob.sentiment.subjectivity
-            
-            # Determine overall sentiment
-            if vader_scores['compound'] >= 0.05:
-                overall_sentiment = 'positive'
-            elif vader_scores['compound'] <= -0.05:
-                overall_sentiment = 'negative'
-            else:
-                overall_sentiment = 'neutral'
-                
-            return {
-                'overall': overall_sentiment,
-                'vader': vader_scores,
-                'textblob': {
-                    'polarity': textblob_polarity,
-                    'subjectivity': textblob_subjectivity
-                },
-                'confidence': abs(vader_scores['compound'])
-            }
-        except Exception as e:
-            logger.error(f"Sentiment analysis error: {e}")
-            return {
-                'overall': 'neutral',
-                'vader': {'compound': 0, 'pos': 0, 'neu': 1, 'neg': 0},
-                'textblob': {'polarity': 0, 'subjectivity': 0},
-                'confidence': 0
-            }
+    def analyze_sentiment(self, text: str, detail: bool = False) -> Dict[str, Any]:
+        """Analyze sentiment of text (memoized by content).
+        VADER decides the label; TextBlob scores are filled in for ambiguous texts,
+        when detail=True, or lazily when result['textblob'] is read.
+        """
+        if detail:
+            return score_sentiment(self.sentiment_analyzer, text, detail=True)
+        result = sentiment_cache.get_or_compute(
+            [text], lambda texts: [score_sentiment(self.sentiment_analyzer, t) for t in texts]
+        )[0]
+        return with_lazy_secondary(result, text)
+
+    def analyze_sentiment_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Analyze many texts at once on the sentiment process pool; results keep input order.
+        Texts already scored (by content) come from the sentiment cache.
+        """
+        texts = list(texts)
+        results = sentiment_cache.get_or_compute(texts, sentiment_pool.analyze_batch)
+        return [with_lazy_secondary(result, text) for result, text in zip(results, texts)]
+
+    @staticmethod
+    def post_engagement(post: Dict[str, Any]) -> int:
+        """Platform-agnostic engagement: votes, likes, shares and comments"""
+        fields = ['score', 'points', 'like_count', 'retweet_count', 'reply_count', 'comments_count', 'num_comments']
+        return sum(int(post.get(field) or 0) for field in fields)
 
-    def scrape_reddit_youth_opinions(self, subreddits: List[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
-        """Scrape youth opinions from Reddit"""
+    def merge_near_duplicate(self, post: Dict[str, Any]) -> bool:
+        """Fold a syndicated copy into the canonical post seen first.
+        Returns True when the post was merged and should be skipped; call before sentiment analysis.
+        """
+        if self.duplicate_index is None:
+            return False
+        engagement = self.post_engagement(post)
+        source = post.get('source') or post.get('platform', 'unknown')
+        canonical, _ = self.duplicate_index.find_or_add(post.get('title') or post.get('content', ''), post)
+        if canonical is None:
+            post['engagement'] = engagement
+            post['duplicate_count'] = 0
+            post['duplicate_sources'] = [source]
+            return False
+        self.duplicates_merged += 1
+        canonical['engagement'] = canonical.get('engagement', 0) + engagement
+        canonical['duplicate_count'] = canonical.get('duplicate_count', 0) + 1
+        if source not in canonical.setdefault('duplicate_sources', []):
+            canonical['duplicate_sources'].append(source)
+        return True
+
+    @scraping_metrics.instrument('reddit')
+    def scrape_reddit_youth_opinions(self, subreddits: List[str] = None, limit: int = 50) -> Iterator[Dict[str, Any]]:
+        """Scrape youth opinions from Reddit, yielding posts as they are found (sentiment is scored in batches downstream)"""
         if not self.reddit:
             logger.warning("Reddit API not available")
-            return []
+            return
             
         if not subreddits:
             subreddits = [
@@ -153,26 +183,23 @@ class SocialMediaScraper:
                 'Mumbai', 'Delhi', 'Bangalore', 'Chennai', 'Hyderabad'
             ]
         
-        youth_posts = []
-        
         try:
             for subreddit_name in subreddits:
                 try:
                     subreddit = self.reddit.subreddit(subreddit_name)
                     
                     # Get hot posts
-                    for post in subreddit.hot(limit=limit//len(subreddits)):
+                    with scraping_metrics.fetching():
+                        hot_posts = list(subreddit.hot(limit=limit//len(subreddits)))
+                    for post in hot_posts:
                         if post.selftext or post.title:
                             content = f"{post.title} {post.selftext}".strip()
                             
-                            # Analyze sentiment
-                            sentiment = self.analyze_sentiment(content)
-                            
                             # Extract youth-relevant keywords
                             youth_keywords = self.extract_youth_keywords(content)
                             
                             if youth_keywords:  # Only include posts with youth relevance
-                                youth_posts.append({
+                                youth_post = {
                                     'platform': 'reddit',
                                     'subreddit': subreddit_name,
                                     'title': post.title,
@@ -182,10 +209,12 @@ class SocialMediaScraper:
                                     'comments_count': post.num_comments,
                                     'created_utc': datetime.fromtimestamp(post.created_utc),
                                     'url': f"https://reddit.com{post.permalink}",
-                                    'sentiment': sentiment,
                                     'youth_keywords': youth_keywords,
                                     'relevance_score': len(youth_keywords) * post.score / 100
-                                })
+                                }
+                                if self.merge_near_duplicate(youth_post):
+                                    continue
+                                yield youth_post
                                 
                 except Exception as e:
                     logger.error(f"Error scraping subreddit {subreddit_name}: {e}")
@@ -195,14 +224,17 @@ class SocialMediaScraper:
                 
         except Exception as e:
             logger.error(f"Reddit scraping error: {e}")
-            
-        return youth_posts
 
-    def scrape_twitter_youth_opinions(self, hashtags: List[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
-        """Scrape youth opinions from Twitter/X"""
+    @scraping_metrics.instrument('twitter')
+    def scrape_twitter_youth_opinions(self, hashtags: List[str] = None, limit: int = 100) -> Iterator[Dict[str, Any]]:
+        """Scrape youth opinions from Twitter/X.
+        Hashtags are packed into OR-ed query groups and polled incrementally from
+        persisted since_id watermarks. New tweets are yielded as they arrive,
+        followed by tweets scored on earlier runs from cache, up to limit in total.
+        """
         if not self.twitter_api:
             logger.warning("Twitter API not available")
-            return []
+            return
             
         if not hashtags:
             hashtags = [
@@ -211,99 +243,149 @@ class SocialMediaScraper:
                 '#IndianStartups', '#TechIndia', '#ClimateAction', '#MentalHealth'
             ]
         
-        youth_tweets = []
+        known, fresh = self.twitter_state.split_by_watermark(hashtags)
+        groups = build_query_groups(known) + build_query_groups(fresh)
+        if not groups:
+            return
+        # search_recent_tweets accepts 10-100 results per request
+        max_results = max(10, min(limit // len(groups), 100))
+        
+        new_ids = set()
+        # Merged into another source's post during this run, so not replayed from cache either
+        merged_ids = set()
         
         try:
-            for hashtag in hashtags:
+            for group in groups:
                 try:
-                    tweets = self.twitter_api.search_recent_tweets(
-                        query=hashtag,
-                        max_results=min(limit//len(hashtags), 100),
+                    since_id = self.twitter_state.group_since_id(group)
+                    pages = iter_search_pages(
+                        self.twitter_api.search_recent_tweets, build_query(group), since_id, max_results,
                         tweet_fields=['created_at', 'public_metrics', 'author_id', 'context_annotations']
                     )
-                    
-                    if tweets.data:
-                        for tweet in tweets.data:
+                    # The first page carries the newest id of the whole result set
+                    newest_id = None
+                    while True:
+                        with scraping_metrics.fetching():
+                            tweets = next(pages, None)
+                        if tweets is None:
+                            break
+                        if newest_id is None:
+                            newest_id = (tweets.meta or {}).get('newest_id')
+                        for tweet in tweets.data or []:
+                            if self.twitter_state.is_scored(tweet.id):
+                                continue
                             content = tweet.text
-                            sentiment = self.analyze_sentiment(content)
                             youth_keywords = self.extract_youth_keywords(content)
-                            
-                            if youth_keywords:
-                                youth_tweets.append({
-                                    'platform': 'twitter',
-                                    'hashtag': hashtag,
-                                    'content': content,
-                                    'author_id': tweet.author_id,
-                                    'created_at': tweet.created_at,
-                                    'retweet_count': tweet.public_metrics.get('retweet_count', 0),
-                                    'like_count': tweet.public_metrics.get('like_count', 0),
-                                    'reply_count': tweet.public_metrics.get('reply_count', 0),
-                                    'sentiment': sentiment,
-                                    'youth_keywords': youth_keywords,
-                                    'relevance_score': len(youth_keywords) * tweet.public_metrics.get('like_count', 1) / 100
-                                })
+                            if not youth_keywords:
+                                self.twitter_state.remember(tweet.id, None)
+                                continue
+                        
+                            content_lower = content.lower()
+                            hashtag = next((tag for tag in group if tag.lower() in content_lower), group[0])
+                            post = {
+                                'platform': 'twitter',
+                                'hashtag': hashtag,
+                                'tweet_id': str(tweet.id),
+                                'content': content,
+                                'author_id': tweet.author_id,
+                                'created_at': tweet.created_at,
+                                'retweet_count': tweet.public_metrics.get('retweet_count', 0),
+                                'like_count': tweet.public_metrics.get('like_count', 0),
+                                'reply_count': tweet.public_metrics.get('reply_count', 0),
+                                'youth_keywords': youth_keywords,
+                                'relevance_score': len(youth_keywords) * tweet.public_metrics.get('like_count', 1) / 100
+                            }
+                            if self.merge_near_duplicate(post):
+                                # Cached as a tweet of its own: whether it is a duplicate is decided again every run
+                                self.twitter_state.remember(tweet.id, {key: value for key, value in post.items()
+                                                                       if key not in MERGE_FIELDS})
+                                merged_ids.add(post['tweet_id'])
+                                continue
+                            self.twitter_state.remember(tweet.id, post)
+                            new_ids.add(post['tweet_id'])
+                            if len(new_ids) <= limit:
+                                yield post
+
+                    # Only once every page was read, so a failure mid-way re-polls from the old watermark
+                    self.twitter_state.advance(group, newest_id)
                                 
                 except Exception as e:
-                    logger.error(f"Error scraping hashtag {hashtag}: {e}")
+                    logger.error(f"Error scraping hashtag group {group}: {e}")
                     continue
                     
                 time.sleep(1)  # Rate limiting
                 
         except Exception as e:
             logger.error(f"Twitter scraping error: {e}")
-            
-        return youth_tweets
+        finally:
+            self.twitter_state.save()
+        
+        logger.info(f"Twitter poll: {len(new_ids)} new tweets across {len(groups)} query groups")
+        remaining = limit - len(new_ids)
+        for cached in self.twitter_state.cached_posts(hashtags):
+            if remaining <= 0:
+                break
+            if cached['tweet_id'] in new_ids or cached['tweet_id'] in merged_ids:
+                continue
+            # A fresh copy, so merges from earlier scrapes are not counted again
+            post = {key: value for key, value in cached.items() if key not in MERGE_FIELDS}
+            if self.merge_near_duplicate(post):
+                continue
+            remaining -= 1
+            yield post
 
-    def scrape_youtube_youth_comments(self, video_ids: List[str] = None, limit: int = 200) -> List[Dict[str, Any]]:
-        """Scrape youth opinions from YouTube comments"""
+    @scraping_metrics.instrument('youtube')
+    def scrape_youtube_youth_comments(self, video_ids: List[str] = None, limit: int = 200) -> Iterator[Dict[str, Any]]:
+        """Scrape youth opinions from YouTube comments, yielding them as they are found"""
         if not self.youtube:
             logger.warning("YouTube API not available")
-            return []
+            return
             
         if not video_ids:
             # Search for youth-relevant videos
-            search_response = self.youtube.search().list(
-                q='Indian youth opinions politics education',
-                part='id',
-                type='video',
-                maxResults=10,
-                order='relevance'
-            ).execute()
+            with scraping_metrics.fetching():
+                search_response = self.youtube.search().list(
+                    q='Indian youth opinions politics education',
+                    part='id',
+                    type='video',
+                    maxResults=10,
+                    order='relevance'
+                ).execute()
             
             video_ids = [item['id']['videoId'] for item in search_response.get('items', [])]
         
-        youth_comments = []
-        
         try:
             for video_id in video_ids:
                 try:
                     # Get video comments
-                    comments_response = self.youtube.commentThreads().list(
-                        part='snippet',
-                        videoId=video_id,
-                        maxResults=min(limit//len(video_ids), 100),
-                        order='relevance'
-                    ).execute()
+                    with scraping_metrics.fetching():
+                        comments_response = self.youtube.commentThreads().list(
+                            part='snippet',
+                            videoId=video_id,
+                            maxResults=min(limit//len(video_ids), 100),
+                            order='relevance'
+                        ).execute()
                     
                     for comment_thread in comments_response.get('items', []):
                         comment = comment_thread['snippet']['topLevelComment']['snippet']
                         content = comment['textDisplay']
                         
-                        sentiment = self.analyze_sentiment(content)
                         youth_keywords = self.extract_youth_keywords(content)
                         
                         if youth_keywords:
-                            youth_comments.append({
+                            youth_comment = {
                                 'platform': 'youtube',
                                 'video_id': video_id,
                                 'content': content,
                                 'author': comment['authorDisplayName'],
                                 'like_count': comment['likeCount'],
                                 'published_at': comment['publishedAt'],
-                                'sentiment': sentiment,
                                 'youth_keywords': youth_keywords,
                                 'relevance_score': len(youth_keywords) * comment['likeCount'] / 100
-                            })
+                            }
+                            if self.merge_near_duplicate(youth_comment):
+                                continue
+                            yield youth_comment
                             
                 except Exception as e:
                     logger.error(f"Error scraping video {video_id}: {e}")
@@ -313,12 +395,10 @@ class SocialMediaScraper:
                 
         except Exception as e:
             logger.error(f"YouTube scraping error: {e}")
-            
-        return youth_comments
 
-    def scrape_general_web_sources(self) -> List[Dict[str, Any]]:
-        """Scrape youth opinions from general web sources"""
-        web_opinions = []
+    @scraping_metrics.instrument('web')
+    def scrape_general_web_sources(self) -> Iterator[Dict[str, Any]]:
+        """Scrape youth opinions from general web sources, yielding them as they are found"""
         
         # Youth-focused websites and forums (using RSS feeds and accessible social platforms)
         sources = [
@@ -385,44 +465,36 @@ class SocialMediaScraper:
         
         for source in sources:
             try:
-                response = requests.get(source['url'], headers=headers, timeout=10)
+                response = scraping_metrics.get(source['url'], headers=headers, timeout=10, stream=True)
                 response.raise_for_status()
                 
                 if source['type'] == 'rss':
-                    # Parse RSS/XML content
-                    soup = BeautifulSoup(response.content, 'xml')
-                    
-                    # Look for items in RSS feeds
-                    items = soup.find_all('item')
-                    
-                    for item in items[:10]:  # Limit to 10 items per RSS feed
-                        title = item.find('title')
-                        description = item.find('description')
-                        link = item.find('link')
+                    # Stream the feed; the download stops after 10 items
+                    for item in iter_response_items(response, max_items=10):
+                        title_text = item['title']
+                        desc_text = item['description']
                         
-                        if title:
-                            title_text = title.get_text(strip=True)
-                            desc_text = description.get_text(strip=True) if description else ''
-                            
-                            # Combine title and description for better context
-                            content = f"{title_text} {desc_text}".strip()
+                        # Combine title and description for better context
+                        content = f"{title_text} {desc_text}".strip()
+                        
+                        if content and len(content) > 20:
+                            youth_keywords = self.extract_youth_keywords(content)
                             
-                            if content and len(content) > 20:
-                                sentiment = self.analyze_sentiment(content)
-                                youth_keywords = self.extract_youth_keywords(content)
-                                
-                                # Only include posts with youth relevance
-                                if youth_keywords:
-                                    web_opinions.append({
-                                        'platform': 'news',
-                                        'source': source['name'],
-                                        'content': content[:500],
-                                        'title': title_text,
-                                        'url': link.get_text(strip=True) if link else '',
-                                        'sentiment': sentiment,
-                                        'youth_keywords': youth_keywords,
-                                        'relevance_score': len(youth_keywords) * 10  # Base relevance score
-                                    })
+                            # Only include posts with youth relevance
+                            if youth_keywords:
+                                opinion = {
+                                    'platform': 'news',
+                                    'source': source['name'],
+                                    'content': content[:500],
+                                    'title': title_text,
+                                    'url': item['link'],
+                                    'published': item['pubDate'],
+                                    'youth_keywords': youth_keywords,
+                                    'relevance_score': len(youth_keywords) * 10  # Base relevance score
+                                }
+                                if self.merge_near_duplicate(opinion):
+                                    continue
+                                yield opinion
                                 
                 elif source['type'] == 'reddit_json':
                     try:
@@ -438,12 +510,11 @@ class SocialMediaScraper:
                             content = f"{title} {selftext}".strip()
                             
                             if content and len(content) > 20:
-                                sentiment = self.analyze_sentiment(content)
                                 youth_keywords = self.extract_youth_keywords(content)
                                 
                                 # Only include posts with youth relevance
                                 if youth_keywords:
-                                    web_opinions.append({
+                                    opinion = {
                                         'platform': 'reddit',
                                         'source': source['name'],
                                         'content': content[:500],
@@ -452,10 +523,12 @@ class SocialMediaScraper:
                                         'num_comments': post.get('num_comments', 0),
                                         'created_utc': datetime.fromtimestamp(post.get('created_utc', 0)),
                                         'url': f"https://reddit.com{post.get('permalink', '')}",
-                                        'sentiment': sentiment,
                                         'youth_keywords': youth_keywords,
                                         'relevance_score': len(youth_keywords) * max(post.get('score', 1), 1) / 100
-                                    })
+                                    }
+                                    if self.merge_near_duplicate(opinion):
+                                        continue
+                                    yield opinion
                     except Exception as e:
                         logger.error(f"Error parsing Reddit JSON from {source['name']}: {e}")
                         continue
@@ -477,20 +550,21 @@ class SocialMediaScraper:
                                 content = f"{title} {desc}".strip()
                                 
                                 if content and len(content) > 20:
-                                    sentiment = self.analyze_sentiment(content)
                                     youth_keywords = self.extract_youth_keywords(content)
                                     
                                     if youth_keywords:
-                                        web_opinions.append({
+                                        opinion = {
                                             'platform': 'github',
                                             'source': source['name'],
                                             'content': content[:500],
                                             'title': title,
                                             'url': f"https://github.com{title_elem.find('a').get('href', '')}",
-                                            'sentiment': sentiment,
                                             'youth_keywords': youth_keywords,
                                             'relevance_score': len(youth_keywords) * 15  # Higher score for tech content
-                                        })
+                                        }
+                                        if self.merge_near_duplicate(opinion):
+                                            continue
+                                        yield opinion
                     except Exception as e:
                         logger.error(f"Error parsing GitHub from {source['name']}: {e}")
                         continue
@@ -512,20 +586,21 @@ class SocialMediaScraper:
                                 content = f"{title} {excerpt}".strip()
                                 
                                 if content and len(content) > 20:
-                                    sentiment = self.analyze_sentiment(content)
                                     youth_keywords = self.extract_youth_keywords(content)
                                     
                                     if youth_keywords:
-                                        web_opinions.append({
+                                        opinion = {
                                             'platform': 'stackoverflow',
                                             'source': source['name'],
                                             'content': content[:500],
                                             'title': title,
                                             'url': f"https://stackoverflow.com{title_elem.find('a').get('href', '')}",
-                                            'sentiment': sentiment,
                                             'youth_keywords': youth_keywords,
                                             'relevance_score': len(youth_keywords) * 12  # Tech-focused score
-                                        })
+                                        }
+                                        if self.merge_near_duplicate(opinion):
+                                            continue
+                                        yield opinion
                     except Exception as e:
                         logger.error(f"Error parsing Stack Overflow from {source['name']}: {e}")
                         continue
@@ -535,121 +610,96 @@ class SocialMediaScraper:
                 continue
                 
             time.sleep(5)  # Increased rate limiting to avoid 429 errors
-            
-        return web_opinions
 
     def extract_youth_keywords(self, text: str) -> List[str]:
-        """Extract youth-relevant keywords from text"""
-        youth_keywords = [
-            'student', 'youth', 'teenager', 'young', 'college', 'university', 'school',
-            'education', 'job', 'career', 'future', 'dream', 'aspiration', 'startup',
-            'entrepreneur', 'technology', 'social media', 'mental health', 'climate',
-            'environment', 'politics', 'government', 'policy', 'reform', 'change',
-            'innovation', 'digital', 'online', 'internet', 'mobile', 'app', 'coding',
-            'programming', 'AI', 'artificial intelligence', 'sustainability', 'equality',
-            'diversity', 'inclusion', 'rights', 'freedom', 'expression', 'voice',
-            'opinion', 'thought', 'idea', 'solution', 'problem', 'challenge', 'opportunity'
-        ]
-        
-        text_lower = text.lower()
-        found_keywords = [kw for kw in youth_keywords if kw in text_lower]
-        
-        return found_keywords
+        """Extract youth-relevant keywords from text (whole words, one pass over the text)"""
+        return youth_keyword_matcher.find(text)
 
     def analyze_youth_sentiment_trends(self, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze sentiment trends from youth posts"""
-        if not posts:
-            return {}
-            
-        total_posts = len(posts)
-        sentiment_counts = {'positive': 0, 'negative': 0, 'neutral': 0}
-        keyword_frequency = {}
-        platform_distribution = {}
-        
+        accumulator = TrendAccumulator()
         for post in posts:
-            # Count sentiments
-            sentiment = post.get('sentiment', {}).get('overall', 'neutral')
-            sentiment_counts[sentiment] += 1
-            
-            # Count keywords
-            keywords = post.get('youth_keywords', [])
-            for keyword in keywords:
-                keyword_frequency[keyword] = keyword_frequency.get(keyword, 0) + 1
-            
-            # Count platforms
-            platform = post.get('platform', 'unknown')
-            platform_distribution[platform] = platform_distribution.get(platform, 0) + 1
-        
-        # Calculate percentages
-        sentiment_percentages = {
-            sentiment: (count / total_posts) * 100 
-            for sentiment, count in sentiment_counts.items()
-        }
-        
-        # Get top keywords
-        top_keywords = sorted(keyword_frequency.items(), key=lambda x: x[1], reverse=True)[:10]
-        
-        return {
-            'total_posts': total_posts,
-            'sentiment_distribution': sentiment_percentages,
-            'top_keywords': top_keywords,
-            'platform_distribution': platform_distribution,
-            'analysis_timestamp': datetime.now().isoformat()
-        }
+            accumulator.add(post)
+        return accumulator.snapshot()
+
+    def _with_sentiment(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Score the posts that have no sentiment yet (cached tweets already do) in one batch"""
+        unscored = [post for post in posts if 'sentiment' not in post]
+        for post, sentiment in zip(unscored, self.analyze_sentiment_batch([post.get('content', '') for post in unscored])):
+            post['sentiment'] = sentiment
+        return posts
+
+    def iter_youth_posts(self) -> Iterator[Dict[str, Any]]:
+        """Chain every scraper into one stream of analyzed, de-duplicated youth posts.
+        Scrapers yield posts without sentiment; they are scored here in batches of SENTIMENT_BATCH_SIZE.
+        """
+        # (label, metrics source, scraper, whether posts still need near-duplicate merging here)
+        sources = [
+            ('Reddit posts', 'reddit', lambda: self.scrape_reddit_youth_opinions(limit=50), False),
+            ('Twitter posts', 'twitter', lambda: self.scrape_twitter_youth_opinions(limit=50), False),
+            ('YouTube comments', 'youtube', lambda: self.scrape_youtube_youth_comments(limit=50), False),
+            ('web posts', 'web', self.scrape_general_web_sources, False),
+            ('additional social media posts', 'additional_sources',
+             additional_social_sources.scrape_all_additional_sources, True),
+        ]
 
-    def get_comprehensive_youth_opinions(self) -> Dict[str, Any]:
-        """Get comprehensive youth opinions from all available sources"""
+        def scored(source, posts):
+            # Sentiment time is charged to the source the batch came from
+            with scraping_metrics.timed(source, 'sentiment'):
+                return self._with_sentiment(posts)
+
+        pending: List[Dict[str, Any]] = []
+        for label, metrics_source, scrape, needs_merge in sources:
+            count = 0
+            try:
+                for post in scrape():
+                    if needs_merge and self.merge_near_duplicate(post):
+                        continue
+                    count += 1
+                    pending.append(post)
+                    if len(pending) >= SENTIMENT_BATCH_SIZE:
+                        yield from scored(metrics_source, pending)
+                        pending = []
+                logger.info(f"Scraped {count} {label}")
+            except Exception as e:
+                logger.error(f"Scraping {label} failed after {count} items: {e}")
+            # Flush at source boundaries so trends keep up with slow, rate-limited sources
+            if pending:
+                yield from scored(metrics_source, pending)
+            pending = []
+
+    def get_comprehensive_youth_opinions(self, top_k: int = 100,
+                                         on_post: Optional[Callable[[YouthOpinionPipeline], None]] = None) -> Dict[str, Any]:
+        """Get comprehensive youth opinions from all available sources.
+        Posts stream through incremental trend counters and a bounded top-k selector;
+        on_post is called with the pipeline after every post so trends can be read mid-scrape.
+        """
         logger.info("Starting comprehensive youth opinion scraping...")
         
-        all_posts = []
+        pipeline = YouthOpinionPipeline(top_k)
+        self.duplicate_index = NearDuplicateIndex(capacity=DUPLICATE_WINDOW)
+        self.duplicates_merged = 0
         
-        # Scrape from different platforms
-        try:
-            reddit_posts = self.scrape_reddit_youth_opinions(limit=50)
-            all_posts.extend(reddit_posts)
-            logger.info(f"Scraped {len(reddit_posts)} Reddit posts")
-        except Exception as e:
-            logger.error(f"Reddit scraping failed: {e}")
-            
-        try:
-            twitter_posts = self.scrape_twitter_youth_opinions(limit=50)
-            all_posts.extend(twitter_posts)
-            logger.info(f"Scraped {len(twitter_posts)} Twitter posts")
-        except Exception as e:
-            logger.error(f"Twitter scraping failed: {e}")
-            
-        try:
-            youtube_posts = self.scrape_youtube_youth_comments(limit=50)
-            all_posts.extend(youtube_posts)
-            logger.info(f"Scraped {len(youtube_posts)} YouTube comments")
-        except Exception as e:
-            logger.error(f"YouTube scraping failed: {e}")
-            
-        try:
-            web_posts = self.scrape_general_web_sources()
-            all_posts.extend(web_posts)
-            logger.info(f"Scraped {len(web_posts)} web posts")
-        except Exception as e:
-            logger.error(f"Web scraping failed: {e}")
-            
+        # Topic counts for the hourly counters behind windowed youth-topic queries,
+        # accumulated per post so no post outlives its pass through the pipeline
+        topic_counts: Counter = Counter()
         try:
-            additional_posts = additional_social_sources.scrape_all_additional_sources()
-            all_posts.extend(additional_posts)
-            logger.info(f"Scraped {len(additional_posts)} additional social media posts")
-        except Exception as e:
-            logger.error(f"Additional social media scraping failed: {e}")
-        
-        # Analyze trends
-        trends = self.analyze_youth_sentiment_trends(all_posts)
-        
-        # Sort posts by relevance score
-        all_posts.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
+            for post in self.iter_youth_posts():
+                pipeline.feed(post)
+                topic_counts.update(mention_counter.count_topics((post.get('content'),), YOUTH))
+                if on_post:
+                    on_post(pipeline)
+        finally:
+            self.duplicate_index = None
+        mention_counter.record(topic_counts, YOUTH)
         
+        result = pipeline.result()
         return {
-            'posts': all_posts[:100],  # Return top 100 most relevant posts
-            'trends': trends,
+            'posts': result['posts'],  # Top k most relevant posts
+            'trends': result['trends'],
             'scraping_timestamp': datetime.now().isoformat(),
-            'total_sources_scraped': len(all_posts)
+            'total_sources_scraped': pipeline.total_posts,
+            'duplicates_merged': self.duplicates_merged
         }
 
 # Global scraper instance
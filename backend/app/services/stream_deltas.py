@@ -0,0 +1,164 @@
+"""
+Delta encoding for the SSE dashboards.
+
+A publisher keeps the last state it sent and publishes only what changed:
+
+- For the keyed list (posts or topic rows): added items, removed keys,
+  changed items and, when the ranking moved, the new key order.
+- For everything else: a JSON merge patch (RFC 7396). Changed values are
+  set, removed keys are null, and lists are replaced whole.
+
+Each delta names the event id it applies on top of (``base``). A client that
+sees ``base`` differ from the last id it applied has missed something; the
+broadcaster sends it a ``resync`` with the full state.
+"""
+
+import hashlib
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from app.services.broadcaster import Broadcaster, broadcaster
+
+_MISSING = object()
+
+
+def post_id(post: Dict[str, Any]) -> str:
+    """Stable id for a scraped post: its own id or URL, else a hash of platform and content"""
+    if post.get('id'):
+        return str(post['id'])
+    if post.get('url'):
+        return post['url']
+    digest = hashlib.sha1(f"{post.get('platform', '')}\n{post.get('content', '')}".encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def merge_patch(previous: Any, current: Any) -> Any:
+    """RFC 7396 patch turning previous into current, or _MISSING when they are equal"""
+    if previous == current:
+        return _MISSING
+    if not isinstance(previous, dict) or not isinstance(current, dict):
+        return current
+    patch = {}
+    for key, value in current.items():
+        change = merge_patch(previous.get(key, _MISSING), value)
+        if change is not _MISSING:
+            patch[key] = change
+    for key in previous:
+        if key not in current:
+            patch[key] = None
+    return patch
+
+
+def apply_merge_patch(target: Any, patch: Any) -> Any:
+    if not isinstance(patch, dict):
+        return patch
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = apply_merge_patch(result.get(key), value)
+    return result
+
+
+def diff_keyed(previous: Sequence[Dict[str, Any]], current: Sequence[Dict[str, Any]],
+               key: Callable[[Dict[str, Any]], str]) -> Dict[str, Any]:
+    """Added/removed/changed items between two ranked lists, plus the new order if it moved"""
+    before = {key(item): item for item in previous}
+    after_keys = [key(item) for item in current]
+    after = dict(zip(after_keys, current))
+
+    delta: Dict[str, Any] = {}
+    added = [item for k, item in zip(after_keys, current) if k not in before]
+    removed = [k for k in before if k not in after]
+    changed = [item for k, item in zip(after_keys, current) if k in before and before[k] != item]
+    if added:
+        delta['added'] = added
+    if removed:
+        delta['removed'] = removed
+    if changed:
+        delta['changed'] = changed
+    # Clients drop removed keys and append added ones; send the order only when that is wrong
+    expected = [k for k in before if k in after] + [k for k in after_keys if k not in before]
+    if expected != after_keys:
+        delta['order'] = after_keys
+    return delta
+
+
+def apply_keyed(items: Sequence[Dict[str, Any]], delta: Dict[str, Any],
+                key: Callable[[Dict[str, Any]], str]) -> List[Dict[str, Any]]:
+    removed = set(delta.get('removed', ()))
+    changed = {key(item): item for item in delta.get('changed', ())}
+    result = [changed.get(key(item), item) for item in items if key(item) not in removed]
+    result.extend(delta.get('added', ()))
+    if 'order' in delta:
+        by_key = {key(item): item for item in result}
+        result = [by_key[k] for k in delta['order']]
+    return result
+
+
+class DeltaPublisher:
+    """Publishes a full snapshot first and merge-patch/keyed-list deltas after it.
+
+    ``list_path`` locates the keyed list inside the state, e.g. ('data', 'posts').
+    """
+
+    def __init__(self, channel: str, list_path: Sequence[str], key: Callable[[Dict[str, Any]], str],
+                 hub: Optional[Broadcaster] = None):
+        self.channel = channel
+        self.list_path = tuple(list_path)
+        self.key = key
+        self.hub = hub or broadcaster
+        self._lock = threading.Lock()
+        self._state: Optional[Dict[str, Any]] = None
+        self._seq = 0
+
+    def _split(self, state: Dict[str, Any]):
+        """(keyed list, the rest of the state without it)"""
+        rest = dict(state)
+        node = rest
+        for part in self.list_path[:-1]:
+            node[part] = dict(node.get(part) or {})
+            node = node[part]
+        items = node.pop(self.list_path[-1], None) or []
+        return items, rest
+
+    def diff(self, previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+        previous_items, previous_rest = self._split(previous)
+        current_items, current_rest = self._split(current)
+        delta: Dict[str, Any] = {}
+        items = diff_keyed(previous_items, current_items, self.key)
+        if items:
+            delta['items'] = items
+        patch = merge_patch(previous_rest, current_rest)
+        if patch is not _MISSING:
+            delta['patch'] = patch
+        return delta
+
+    def apply(self, state: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+        """The client-side update, used by tests and as the reference for dashboards"""
+        items, rest = self._split(state)
+        result = apply_merge_patch(rest, delta['patch']) if 'patch' in delta else rest
+        node = result
+        for part in self.list_path[:-1]:
+            node[part] = dict(node.get(part) or {})
+            node = node[part]
+        node[self.list_path[-1]] = apply_keyed(items, delta.get('items', {}), self.key)
+        return result
+
+    def has_state(self) -> bool:
+        return self._state is not None
+
+    def publish(self, state: Dict[str, Any]) -> Optional[int]:
+        """Publish state as a snapshot (first time) or a delta; returns the event id, None if unchanged"""
+        with self._lock:
+            if self._state is None:
+                event_id = self.hub.publish(self.channel, state, event='snapshot', snapshot=state)
+            else:
+                delta = self.diff(self._state, state)
+                if not delta:
+                    return None
+                delta['base'] = self._seq
+                event_id = self.hub.publish(self.channel, delta, event='delta', snapshot=state)
+            self._state, self._seq = state, event_id
+            return event_id
@@ -0,0 +1,137 @@
+"""
+Deterministic TF-IDF scoring of scraped headlines for the missing-topics view.
+
+All headlines are scored in one batch. Near-identical headlines (the same
+story from several feeds) are first clustered with SimHash. The cluster
+representatives are joined into one corpus and scanned once with a compiled
+pattern over the youth and political topic vocabularies. The matches are
+turned into a count matrix with NumPy and weighted by TF-IDF. Each topic's
+youth and political mass then becomes a mention score.
+
+The same headlines always produce the same scores, so results can be cached
+and compared between runs.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.services.topic_taxonomy import POLITICAL_KEYWORDS, TOPIC_YOUTH_KEYWORDS
+from app.utils.keyword_matcher import trie_alternation
+from app.utils.simhash import NearDuplicateIndex, simhash_many
+
+# Scores keep the ranges of the earlier heuristic: a base level plus a weight per
+# unit of keyword mass, capped
+YOUTH_BASE, YOUTH_WEIGHT, YOUTH_CAP = 35, 8.0, 60
+POLITICAL_BASE, POLITICAL_WEIGHT, POLITICAL_CAP = 27, 6.0, 50
+# Each extra copy of a headline adds this fraction of its keyword mass
+DUPLICATE_BOOST = 0.25
+HEADLINE_MAX_DISTANCE = 3
+
+
+class TopicScorer:
+    """Vectorized youth vs. political scoring over a fixed keyword vocabulary"""
+
+    def __init__(self, youth_keywords: Sequence[str] = TOPIC_YOUTH_KEYWORDS,
+                 political_keywords: Sequence[str] = POLITICAL_KEYWORDS,
+                 max_distance: int = HEADLINE_MAX_DISTANCE):
+        self.vocabulary: List[str] = []
+        for keyword in list(youth_keywords) + list(political_keywords):
+            if keyword.lower() not in self.vocabulary:
+                self.vocabulary.append(keyword.lower())
+        self._column = {term: i for i, term in enumerate(self.vocabulary)}
+        youth = {k.lower() for k in youth_keywords}
+        political = {k.lower() for k in political_keywords}
+        self._youth_mask = np.array([term in youth for term in self.vocabulary], dtype=float)
+        self._political_mask = np.array([term in political for term in self.vocabulary], dtype=float)
+        # Whole words with an optional plural, the same rule as KeywordMatcher
+        self._pattern = re.compile(rf'(?<!\w)({trie_alternation(self.vocabulary)})(?:es|s)?(?!\w)')
+        self.max_distance = max_distance
+
+    def cluster(self, texts: Sequence[str]) -> List[List[int]]:
+        """Group indexes of near-identical headlines; the first index is the representative"""
+        index = NearDuplicateIndex(max_distance=self.max_distance)
+        clusters: List[List[int]] = []
+        for i, fingerprint in enumerate(simhash_many(texts)):
+            if not index.matchable(texts[i]):
+                clusters.append([i])
+                continue
+            existing = index.find_or_add_fingerprint(fingerprint, len(clusters))
+            if existing is None:
+                clusters.append([i])
+            else:
+                clusters[existing].append(i)
+        return clusters
+
+    def term_counts(self, texts: Sequence[str]) -> np.ndarray:
+        """(len(texts), len(vocabulary)) keyword count matrix from a single scan of all texts"""
+        n, width = len(texts), len(self.vocabulary)
+        if not n:
+            return np.zeros((0, width))
+        # One corpus with a separator that can never be part of a match
+        lowered = [text.lower() for text in texts]
+        corpus = '\n'.join(lowered)
+        lengths = np.fromiter((len(text) + 1 for text in lowered), dtype=np.int64, count=n)
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+        starts, columns = [], []
+        for match in self._pattern.finditer(corpus):
+            starts.append(match.start())
+            columns.append(self._column[match.group(1)])
+        if not starts:
+            return np.zeros((n, width))
+        rows = np.searchsorted(offsets, np.asarray(starts), side='right') - 1
+        flat = rows * width + np.asarray(columns)
+        return np.bincount(flat, minlength=n * width).reshape(n, width).astype(float)
+
+    @staticmethod
+    def tfidf(counts: np.ndarray) -> np.ndarray:
+        """Sublinear TF times smoothed IDF"""
+        if not counts.size:
+            return counts
+        document_frequency = np.count_nonzero(counts, axis=0)
+        idf = np.log((1 + counts.shape[0]) / (1 + document_frequency)) + 1.0
+        return np.log1p(counts) * idf
+
+    def score(self, items: Sequence[Dict[str, Any]], text_key: str = 'text') -> List[Dict[str, Any]]:
+        """Score scraped items, one row per headline cluster, sorted by gap score"""
+        texts = [item.get(text_key) or '' for item in items]
+        clusters = self.cluster(texts)
+        if not clusters:
+            return []
+        representatives = [texts[members[0]] for members in clusters]
+
+        weights = self.tfidf(self.term_counts(representatives))
+        sizes = np.array([len(members) for members in clusters], dtype=float)
+        boost = 1.0 + DUPLICATE_BOOST * (sizes - 1)
+        youth_mass = (weights @ self._youth_mask) * boost
+        political_mass = (weights @ self._political_mask) * boost
+
+        youth_mentions = np.minimum(np.rint(YOUTH_BASE + YOUTH_WEIGHT * youth_mass), YOUTH_CAP).astype(int)
+        politician_mentions = np.minimum(
+            np.rint(POLITICAL_BASE + POLITICAL_WEIGHT * political_mass), POLITICAL_CAP
+        ).astype(int)
+
+        rows = []
+        for i, members in enumerate(clusters):
+            rows.append({
+                'topic': representatives[i],
+                'youth_mentions': int(youth_mentions[i]),
+                'politician_mentions': int(politician_mentions[i]),
+                'gap_score': int(youth_mentions[i] - politician_mentions[i]),
+                'frequency': len(members),
+                'sources': sorted({items[j].get('source') for j in members if items[j].get('source')}),
+            })
+        rows.sort(key=lambda row: (-row['gap_score'], -row['frequency'], row['topic']))
+        return rows
+
+
+_default_scorer: Optional[TopicScorer] = None
+
+
+def score_topics(items: Sequence[Dict[str, Any]], text_key: str = 'text') -> List[Dict[str, Any]]:
+    global _default_scorer
+    if _default_scorer is None:
+        _default_scorer = TopicScorer()
+    return _default_scorer.score(items, text_key)
@@ -0,0 +1,76 @@
+"""
+Shared keyword taxonomy for youth relevance and topic scoring.
+
+The scrapers and the missing-topics endpoint used to carry their own copies
+of these lists; they now share one definition and matchers compiled once at
+import time.
+"""
+
+from typing import List, Tuple
+
+from app.utils.keyword_matcher import KeywordMatcher
+
+# Youth-relevant keywords used to filter and tag scraped posts
+YOUTH_KEYWORDS = [
+    'student', 'youth', 'teenager', 'young', 'college', 'university', 'school',
+    'education', 'job', 'career', 'future', 'dream', 'aspiration', 'startup',
+    'entrepreneur', 'technology', 'social media', 'mental health', 'climate',
+    'environment', 'politics', 'government', 'policy', 'reform', 'change',
+    'innovation', 'digital', 'online', 'internet', 'mobile', 'app', 'coding',
+    'programming', 'AI', 'artificial intelligence', 'sustainability', 'equality',
+    'diversity', 'inclusion', 'rights', 'freedom', 'expression', 'voice',
+    'opinion', 'thought', 'idea', 'solution', 'problem', 'challenge', 'opportunity'
+]
+
+# Topic scoring vocabularies for youth interest vs. political focus
+TOPIC_YOUTH_KEYWORDS = [
+    'student', 'job', 'education', 'climate', 'mental health',
+    'social media', 'technology', 'startup', 'youth'
+]
+
+POLITICAL_KEYWORDS = [
+    'government', 'minister', 'policy', 'parliament',
+    'election', 'budget', 'scheme', 'law'
+]
+
+# Topic categories used for mention counting; each keyword belongs to one topic
+TOPIC_CATEGORIES = {
+    'Jobs and Careers': ['job', 'career', 'employment', 'unemployment', 'hiring', 'internship', 'salary', 'layoff'],
+    'Education': ['education', 'student', 'college', 'university', 'school', 'exam', 'curriculum', 'scholarship'],
+    'Mental Health': ['mental health', 'anxiety', 'depression', 'stress', 'burnout', 'suicide'],
+    'Climate and Environment': ['climate', 'environment', 'pollution', 'air quality', 'sustainability', 'heatwave', 'flood'],
+    'Technology and Digital': ['technology', 'digital', 'internet', 'AI', 'artificial intelligence', 'social media', 'data privacy', 'cybersecurity'],
+    'Startups and Entrepreneurship': ['startup', 'entrepreneur', 'entrepreneurship', 'msme', 'funding'],
+    'Housing and Cost of Living': ['housing', 'rent', 'inflation', 'cost of living', 'prices'],
+    'Safety and Rights': ['women safety', 'harassment', 'rights', 'equality', 'freedom', 'lgbtq'],
+    'Budget and Taxation': ['budget', 'tax', 'gst', 'income tax', 'subsidy'],
+    'Governance and Elections': ['election', 'parliament', 'minister', 'government', 'law', 'scheme', 'policy'],
+    'Infrastructure and Transport': ['infrastructure', 'transport', 'metro', 'railway', 'highway'],
+    'Agriculture and Rural': ['farmer', 'agriculture', 'rural', 'crop', 'msp'],
+    'Defence and Security': ['defence', 'defense', 'army', 'border', 'national security'],
+}
+
+youth_keyword_matcher = KeywordMatcher(YOUTH_KEYWORDS)
+topic_keyword_matcher = KeywordMatcher(TOPIC_YOUTH_KEYWORDS + POLITICAL_KEYWORDS)
+
+_KEYWORD_TOPIC = {
+    keyword.lower(): topic for topic, keywords in TOPIC_CATEGORIES.items() for keyword in keywords
+}
+topic_category_matcher = KeywordMatcher(keyword for keywords in TOPIC_CATEGORIES.values() for keyword in keywords)
+
+_TOPIC_YOUTH_SET = frozenset(TOPIC_YOUTH_KEYWORDS)
+_POLITICAL_SET = frozenset(POLITICAL_KEYWORDS)
+
+
+def topic_relevance(text: str) -> Tuple[int, int]:
+    """Distinct youth and political topic keywords found in text, from a single scan"""
+    matched = topic_keyword_matcher.count(text)
+    youth = sum(1 for keyword in matched if keyword in _TOPIC_YOUTH_SET)
+    political = sum(1 for keyword in matched if keyword in _POLITICAL_SET)
+    return youth, political
+
+
+def topic_categories(text: str) -> List[str]:
+    """Distinct topic categories mentioned in text, in TOPIC_CATEGORIES order"""
+    matched = {_KEYWORD_TOPIC[keyword.lower()] for keyword in topic_category_matcher.find(text)}
+    return [topic for topic in TOPIC_CATEGORIES if topic in matched]
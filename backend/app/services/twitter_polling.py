@@ -0,0 +1,181 @@
+"""
+Incremental polling helpers for the Twitter/X recent search API.
+
+Keeps per-hashtag ``since_id`` watermarks on disk between runs, packs hashtags
+into OR-ed queries that fit the search query length limit, and remembers the
+tweets that were already scored so steady-state polls only pay for new ones.
+The scored tweets are saved in the same file as the watermarks: a watermark
+without them would hide every tweet older than it after a restart, so a file
+holding only watermarks is ignored and the next poll starts over.
+A poll follows ``next_token`` through every page of new tweets before the
+watermark moves, so bursts larger than one page are not skipped.
+"""
+
+import os
+import json
+import logging
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'instance', 'twitter_poll_state.json')
+TWITTER_STATE_PATH = os.getenv('TWITTER_STATE_PATH', DEFAULT_STATE_PATH)
+# Recent search allows 512 characters per query on the standard access level
+TWITTER_QUERY_MAX_LENGTH = int(os.getenv('TWITTER_QUERY_MAX_LENGTH', '512'))
+TWITTER_CACHE_SIZE = int(os.getenv('TWITTER_CACHE_SIZE', '1000'))
+# Pages followed per query group and poll; tweets beyond the cap are skipped (and logged)
+TWITTER_MAX_PAGES = int(os.getenv('TWITTER_MAX_PAGES', '10'))
+
+
+def _json_default(value):
+    # created_at comes from tweepy as a datetime
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _tweet_id_key(tweet_id) -> int:
+    """Tweet ids are snowflakes; compare them numerically, not as strings"""
+    try:
+        return int(tweet_id)
+    except (TypeError, ValueError):
+        return 0
+
+
+def build_query_groups(hashtags: List[str], max_length: int = TWITTER_QUERY_MAX_LENGTH) -> List[List[str]]:
+    """Pack hashtags into groups whose OR-ed query stays under max_length.
+    Duplicate hashtags (case-insensitive) are only queried once.
+    """
+    seen = set()
+    unique = []
+    for tag in hashtags:
+        key = tag.strip().lower()
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(tag.strip())
+
+    groups: List[List[str]] = []
+    current: List[str] = []
+    for tag in unique:
+        candidate = current + [tag]
+        if current and len(build_query(candidate)) > max_length:
+            groups.append(current)
+            current = [tag]
+        else:
+            current = candidate
+    if current:
+        groups.append(current)
+    return groups
+
+
+def build_query(group: List[str]) -> str:
+    """OR-ed search query for a hashtag group, excluding retweets"""
+    terms = ' OR '.join(group)
+    if len(group) > 1:
+        terms = f"({terms})"
+    return f"{terms} -is:retweet"
+
+
+def iter_search_pages(search: Callable[..., Any], query: str, since_id: Optional[str], max_results: int,
+                      max_pages: int = TWITTER_MAX_PAGES, **params) -> Iterator[Any]:
+    """Every response page for query newer than since_id, following meta.next_token.
+    Stops at max_pages and logs how far behind the poll is left.
+    """
+    next_token = None
+    for page in range(1, max_pages + 1):
+        request = dict(params, query=query, max_results=max_results, since_id=since_id)
+        if next_token:
+            request['next_token'] = next_token
+        response = search(**request)
+        yield response
+        next_token = (response.meta or {}).get('next_token')
+        if not next_token:
+            return
+    logger.warning(f"Twitter query {query!r} still had more results after {max_pages} pages; "
+                   f"older tweets since {since_id} were skipped")
+
+
+class TwitterPollState:
+    """since_id watermarks and the bounded cache of scored tweets, persisted together"""
+
+    def __init__(self, path: str = TWITTER_STATE_PATH, cache_size: int = TWITTER_CACHE_SIZE):
+        self.path = os.path.abspath(path)
+        self.cache_size = cache_size
+        self.since_ids: Dict[str, str] = {}
+        self.scored_tweets: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if 'scored_tweets' not in data:
+                # Written before the cache was saved: its watermarks would skip tweets we no longer have
+                logger.info(f"Twitter poll state at {self.path} has no scored tweets; polling from scratch")
+                self.since_ids, self.scored_tweets = {}, OrderedDict()
+                return
+            scored = data['scored_tweets'][-self.cache_size:] if self.cache_size > 0 else []
+            self.scored_tweets = OrderedDict((str(tweet_id), post) for tweet_id, post in scored)
+            self.since_ids = {k.lower(): str(v) for k, v in data.get('since_ids', {}).items()}
+        except FileNotFoundError:
+            self.since_ids, self.scored_tweets = {}, OrderedDict()
+        except Exception as e:
+            logger.warning(f"Could not load Twitter poll state from {self.path}: {e}")
+            self.since_ids, self.scored_tweets = {}, OrderedDict()
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'since_ids': self.since_ids,
+                           'scored_tweets': [[tweet_id, post] for tweet_id, post in self.scored_tweets.items()]},
+                          f, default=_json_default)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Could not save Twitter poll state to {self.path}: {e}")
+
+    def group_since_id(self, group: List[str]) -> Optional[str]:
+        """Oldest watermark in the group so no member misses tweets; None if any member is new"""
+        ids = [self.since_ids.get(tag.lower()) for tag in group]
+        if not ids or any(i is None for i in ids):
+            return None
+        return min(ids, key=_tweet_id_key)
+
+    def advance(self, group: List[str], newest_id) -> None:
+        if not newest_id:
+            return
+        newest_id = str(newest_id)
+        for tag in group:
+            current = self.since_ids.get(tag.lower())
+            if current is None or _tweet_id_key(newest_id) > _tweet_id_key(current):
+                self.since_ids[tag.lower()] = newest_id
+
+    def split_by_watermark(self, hashtags: List[str]):
+        """Separate hashtags that already have a watermark from ones polled for the first time,
+        so a newly added hashtag does not force a full re-download for its whole group
+        """
+        known = [tag for tag in hashtags if tag.lower() in self.since_ids]
+        fresh = [tag for tag in hashtags if tag.lower() not in self.since_ids]
+        return known, fresh
+
+    def is_scored(self, tweet_id) -> bool:
+        return str(tweet_id) in self.scored_tweets
+
+    def remember(self, tweet_id, post: Optional[Dict[str, Any]]) -> None:
+        """Cache a scored tweet; post is None for tweets that were scored but not youth-relevant"""
+        key = str(tweet_id)
+        self.scored_tweets[key] = post
+        self.scored_tweets.move_to_end(key)
+        while len(self.scored_tweets) > self.cache_size:
+            self.scored_tweets.popitem(last=False)
+
+    def cached_posts(self, hashtags: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Cached scored tweets, newest first; only those found through hashtags if given"""
+        wanted = {tag.lower() for tag in hashtags} if hashtags else None
+        return [
+            post for post in reversed(self.scored_tweets.values())
+            if post is not None and (wanted is None or str(post.get('hashtag', '')).lower() in wanted)
+        ]
@@ -0,0 +1,97 @@
+"""
+Incremental aggregation for the streaming youth opinion pipeline.
+
+Posts are fed one at a time; sentiment, keyword and platform counters and a
+bounded top-k of the most relevant posts are kept up to date, so memory does
+not grow with the number of scraped posts and trends can be read mid-scrape.
+"""
+
+import heapq
+import itertools
+from datetime import datetime
+from typing import Any, Dict, List
+
+
+class TrendAccumulator:
+    """Running sentiment, keyword and platform counts over youth posts"""
+
+    def __init__(self, top_keywords: int = 10):
+        self.top_keywords = top_keywords
+        self.total_posts = 0
+        self.sentiment_counts = {'positive': 0, 'negative': 0, 'neutral': 0}
+        self.keyword_frequency: Dict[str, int] = {}
+        self.platform_distribution: Dict[str, int] = {}
+
+    def add(self, post: Dict[str, Any]) -> None:
+        self.total_posts += 1
+
+        sentiment = (post.get('sentiment') or {}).get('overall', 'neutral')
+        self.sentiment_counts[sentiment] = self.sentiment_counts.get(sentiment, 0) + 1
+
+        for keyword in post.get('youth_keywords', []):
+            self.keyword_frequency[keyword] = self.keyword_frequency.get(keyword, 0) + 1
+
+        platform = post.get('platform', 'unknown')
+        self.platform_distribution[platform] = self.platform_distribution.get(platform, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Trends in the shape returned by analyze_youth_sentiment_trends"""
+        if not self.total_posts:
+            return {}
+        return {
+            'total_posts': self.total_posts,
+            'sentiment_distribution': {
+                sentiment: (count / self.total_posts) * 100
+                for sentiment, count in self.sentiment_counts.items()
+            },
+            'top_keywords': heapq.nlargest(self.top_keywords, self.keyword_frequency.items(), key=lambda x: x[1]),
+            'platform_distribution': dict(self.platform_distribution),
+            'analysis_timestamp': datetime.now().isoformat()
+        }
+
+
+class TopKPosts:
+    """Keeps the k posts with the highest relevance_score using a min-heap"""
+
+    def __init__(self, k: int = 100, key: str = 'relevance_score'):
+        self.k = k
+        self.key = key
+        self._heap: List[tuple] = []
+        # Tie-breaker so equal scores keep arrival order and dicts are never compared
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def add(self, post: Dict[str, Any]) -> None:
+        entry = (post.get(self.key) or 0, -next(self._counter), post)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self) -> List[Dict[str, Any]]:
+        """Posts sorted by score, highest first"""
+        return [entry[2] for entry in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
+
+
+class YouthOpinionPipeline:
+    """Feeds each analyzed post into the trend accumulator and the top-k selector"""
+
+    def __init__(self, top_k: int = 100):
+        self.trends = TrendAccumulator()
+        self.top_posts = TopKPosts(top_k)
+
+    @property
+    def total_posts(self) -> int:
+        return self.trends.total_posts
+
+    def feed(self, post: Dict[str, Any]) -> None:
+        self.trends.add(post)
+        self.top_posts.add(post)
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            'posts': self.top_posts.items(),
+            'trends': self.trends.snapshot(),
+        }
@@ -0,0 +1,53 @@
+"""
+Conditional GET helpers.
+
+A read endpoint first computes a cheap validator for what it would return
+(the policy generation counter, a row's updated_at) and only then does the
+real work. When the client's If-None-Match or If-Modified-Since still
+matches, it answers 304 with no body, skipping the query and serialization
+behind it as well as the transfer.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from flask import Response, request
+
+
+def make_etag(*parts: Any) -> str:
+    """Opaque tag for a representation built from parts (generation, query args, ...)"""
+    raw = '|'.join(str(part) for part in parts)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:20]
+
+
+def http_datetime(value: Optional[datetime]) -> Optional[datetime]:
+    """A naive UTC timestamp as an aware one at HTTP-date (whole second) precision"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(microsecond=0)
+
+
+def is_not_modified(etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """Whether the request's validators still match; If-None-Match wins over If-Modified-Since"""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return http_datetime(last_modified) <= request.if_modified_since
+    return False
+
+
+def add_validators(response: Response, etag: str, last_modified: Optional[datetime],
+                   cache_control: str) -> Response:
+    # Weak: the tag identifies the data, not the exact bytes (compression may differ)
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = http_datetime(last_modified)
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+
+def not_modified(etag: str, last_modified: Optional[datetime], cache_control: str) -> Response:
+    return add_validators(Response(status=304), etag, last_modified, cache_control)
@@ -0,0 +1,200 @@
+"""
+Database engine profiles and read/write session routing.
+
+Engine options depend on the database behind each URL:
+
+- SQLite: WAL journaling, so readers no longer block on the single writer
+  (and the writer not on readers), ``synchronous=NORMAL`` and a busy timeout
+  instead of failing at once with "database is locked".
+- Other databases (PostgreSQL): a sized connection pool with pre-ping and
+  recycling, from ``DB_POOL_*``.
+
+With ``DATABASE_REPLICA_URL`` set, ``db.session`` routes reads made by views
+marked ``@replica_reads`` to the replica bind and everything else (writes,
+flushes, unmarked views, background jobs) to the primary. Views opt in one by
+one because a GET is not necessarily read-only. To read your own writes, a
+session that has written in its current transaction stays on the primary, and
+so does the rest of a request that committed. The response then sets a
+short-lived cookie that keeps that client's reads on the primary for
+``READ_YOUR_WRITES_SECONDS``, long enough for the replica to catch up.
+
+Schema changes (create_all, the search index) only run on the primary.
+``check_replica`` runs at startup and leaves reads on the primary, with an
+error logged, while the replica is unreachable or lacks any of the primary's
+tables.
+
+Without a replica every statement goes to the primary, as before. Two SQLite
+files are enough to try routing locally.
+"""
+
+import os
+import math
+import time
+import logging
+from functools import wraps
+from typing import Any, Dict
+
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.sql.elements import TextClause
+
+logger = logging.getLogger(__name__)
+
+REPLICA_BIND = 'replica'
+PRIMARY_COOKIE = 'db_primary_until'
+# app.config flag set by check_replica
+REPLICA_READY = 'DATABASE_REPLICA_READY'
+READ_YOUR_WRITES_SECONDS = float(os.getenv('READ_YOUR_WRITES_SECONDS', '5'))
+
+SQLITE_WAL = os.getenv('SQLITE_WAL', 'true').lower() == 'true'
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'))
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '10'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '30'))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == 'sqlite'
+
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """SQLAlchemy engine options for the database at url"""
+    if is_sqlite(url):
+        # pysqlite's own busy wait, in seconds; the PRAGMA below covers connections made elsewhere
+        return {'connect_args': {'timeout': SQLITE_BUSY_TIMEOUT_MS / 1000}}
+    return {
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        'pool_recycle': DB_POOL_RECYCLE,
+        'pool_pre_ping': True,
+    }
+
+
+def _sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f'PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}')
+        if SQLITE_WAL:
+            cursor.execute('PRAGMA journal_mode = WAL')
+            cursor.execute('PRAGMA synchronous = NORMAL')
+    except Exception as e:
+        # Read-only replicas cannot switch journal mode; they still work
+        logger.warning(f"Could not apply SQLite pragmas: {e}")
+    finally:
+        cursor.close()
+
+
+def database_config(primary_url: str, replica_url: str = None) -> Dict[str, Any]:
+    """Flask-SQLAlchemy settings for the primary database and an optional read replica"""
+    config = {
+        'SQLALCHEMY_DATABASE_URI': primary_url,
+        'SQLALCHEMY_ENGINE_OPTIONS': engine_options(primary_url),
+    }
+    if replica_url:
+        config['SQLALCHEMY_BINDS'] = {REPLICA_BIND: dict(engine_options(replica_url), url=replica_url)}
+    return config
+
+
+def init_engines(app, db) -> None:
+    """Apply per-connection settings to the app's engines and the read-your-writes cookie"""
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == 'sqlite':
+                event.listen(engine, 'connect', _sqlite_pragmas)
+
+    if REPLICA_BIND not in app.config.get('SQLALCHEMY_BINDS', {}):
+        return
+
+    @app.after_request
+    def _keep_writer_on_primary(response):
+        if g.get('db_wrote'):
+            response.set_cookie(PRIMARY_COOKIE, str(time.time() + READ_YOUR_WRITES_SECONDS),
+                                max_age=math.ceil(READ_YOUR_WRITES_SECONDS), httponly=True, samesite='Lax')
+        return response
+
+
+def check_replica(app, db) -> bool:
+    """Allow replica reads only if the replica has every table of the primary.
+    Run again (e.g. after a new replica caught up) to re-enable it.
+    """
+    if REPLICA_BIND not in app.config.get('SQLALCHEMY_BINDS', {}):
+        return False
+    with app.app_context():
+        try:
+            missing = set(inspect(db.engine).get_table_names()) - set(
+                inspect(db.engines[REPLICA_BIND]).get_table_names()
+            )
+        except Exception as e:
+            missing = {f'(unreachable: {e})'}
+    app.config[REPLICA_READY] = not missing
+    if missing:
+        logger.error(f"Read replica is missing {', '.join(sorted(missing))}; reading from the primary")
+    return not missing
+
+
+def replica_reads(view):
+    """Mark a read-only view: its reads may be served by the replica"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.db_replica_reads = True
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def _is_read(statement) -> bool:
+    if statement is None:
+        return False
+    if isinstance(statement, TextClause):
+        return statement.text.lstrip()[:6].upper() == 'SELECT'
+    return bool(getattr(statement, 'is_select', False))
+
+
+def _request_reads_replica() -> bool:
+    if not has_request_context() or not g.get('db_replica_reads') or g.get('db_wrote'):
+        return False
+    if not current_app.config.get(REPLICA_READY):
+        return False
+    try:
+        primary_until = float(request.cookies.get(PRIMARY_COOKIE, 0))
+    except ValueError:
+        primary_until = 0
+    return time.time() >= primary_until
+
+
+class RoutingSession(Session):
+    """db.session: reads in @replica_reads views go to the replica bind when one is configured"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and not self._flushing and not self.info.get('wrote') and _is_read(clause)
+                and _request_reads_replica()):
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _after_flush(session, flush_context) -> None:
+    session.info['wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _on_execute(orm_execute_state) -> None:
+    # Core and bulk writes through session.execute() do not flush
+    if not _is_read(orm_execute_state.statement):
+        orm_execute_state.session.info['wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _after_commit(session) -> None:
+    if session.info.pop('wrote', False) and has_request_context():
+        g.db_wrote = True
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _after_rollback(session) -> None:
+    session.info.pop('wrote', None)
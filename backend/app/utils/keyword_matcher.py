@@ -0,0 +1,134 @@
+"""
+Aho-Corasick multi-keyword matcher with word-boundary semantics.
+
+The automaton is compiled once from a keyword list; each scan walks the text a
+single time and reports every keyword occurrence, however many keywords there
+are. Matching is case-insensitive and only accepts whole words, so "app" does
+not fire inside "happy" while "AI" still matches "AI" in the original text.
+A trailing plural "s"/"es" is accepted ("student" matches "students").
+
+``trie_alternation`` covers the other common case, plain substring search for
+many literals with ``re``: it factors the keywords into a prefix trie so the
+regex engine tests one branch per leading character instead of every keyword.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+def trie_alternation(keywords: Iterable[str]) -> str:
+    """Regex source matching any of the keywords, longest first, factored by shared prefixes"""
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def emit(node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            # A keyword ends here; the greedy optional tail still prefers the longer one
+            return body + '?' if len(branches) > 1 else '(?:' + body + ')?'
+        return body
+
+    # An empty keyword list must not match the empty string everywhere
+    return emit(trie) or '(?!)'
+
+
+class KeywordMatcher:
+    """Compiled multi-pattern matcher; keywords keep their original spelling in results"""
+
+    def __init__(self, keywords: Iterable[str], allow_plural: bool = True):
+        self.keywords: List[str] = []
+        self.allow_plural = allow_plural
+        # Trie as a list of transition dicts; node 0 is the root
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        seen = set()
+        for keyword in keywords:
+            pattern = keyword.strip().lower()
+            if not pattern or pattern in seen:
+                continue
+            seen.add(pattern)
+            self.keywords.append(keyword.strip())
+            self._insert(pattern, len(self.keywords) - 1)
+        self._lengths = [len(k) for k in self.keywords]
+        self._build_failure_links()
+
+    def _insert(self, pattern: str, index: int) -> None:
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(index)
+
+    def _build_failure_links(self) -> None:
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child].extend(self._out[self._fail[child]])
+
+    def _accept_end(self, text: str, end: int) -> int:
+        """Return the end of the whole word match at ``end``, or -1 if it ends mid-word"""
+        if end >= len(text) or not _is_word_char(text[end]):
+            return end
+        if self.allow_plural:
+            for suffix in ('s', 'es'):
+                stop = end + len(suffix)
+                if text.startswith(suffix, end) and (stop >= len(text) or not _is_word_char(text[stop])):
+                    return stop
+        return -1
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[str, int, int]]:
+        """Yield (keyword, start, end) for every whole-word occurrence, in one pass"""
+        lowered = text.lower()
+        goto, fail, out, lengths = self._goto, self._fail, self._out, self._lengths
+        node = 0
+        for i, ch in enumerate(lowered):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            for index in out[node]:
+                start = i + 1 - lengths[index]
+                if start > 0 and _is_word_char(lowered[start - 1]):
+                    continue
+                end = self._accept_end(lowered, i + 1)
+                if end >= 0:
+                    yield self.keywords[index], start, end
+
+    def count(self, text: str) -> Counter:
+        """Occurrences per matched keyword"""
+        return Counter(keyword for keyword, _, _ in self.iter_matches(text or ''))
+
+    def find(self, text: str) -> List[str]:
+        """Distinct matched keywords, in the order they were given to the matcher"""
+        counts = self.count(text)
+        return [keyword for keyword in self.keywords if keyword in counts]
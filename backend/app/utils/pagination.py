@@ -0,0 +1,90 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A page is read as "the next N rows after the last row you saw" in a fixed
+(sort key, id) order, rather than with OFFSET. With a composite index on
+those columns every page is an index range scan, however deep the client
+has paged. Cursors are opaque base64 tokens that record which listing they
+belong to and the sort values of the last row returned.
+"""
+
+import os
+import json
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_
+
+PAGE_SIZE_DEFAULT = int(os.getenv('PAGE_SIZE_DEFAULT', '20'))
+PAGE_SIZE_MAX = int(os.getenv('PAGE_SIZE_MAX', '100'))
+
+
+class InvalidCursor(ValueError):
+    """The cursor is malformed or belongs to a different listing"""
+
+
+def page_size(value: Optional[int], default: int = PAGE_SIZE_DEFAULT, maximum: int = PAGE_SIZE_MAX) -> int:
+    if not value or value < 1:
+        return default
+    return min(value, maximum)
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and 'dt' in value:
+        return datetime.fromisoformat(value['dt'])
+    return value
+
+
+def encode_cursor(kind: str, values: Sequence[Any]) -> str:
+    raw = json.dumps({'k': kind, 'v': [_encode_value(v) for v in values]}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: Optional[str], kind: str, size: int) -> Optional[List[Any]]:
+    """Sort values stored in token, or None for the first page"""
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        values = [_decode_value(v) for v in data['v']]
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {e}")
+    if data.get('k') != kind or len(values) != size:
+        raise InvalidCursor("Cursor does not belong to this listing")
+    return values
+
+
+def after_descending(columns: Sequence[Any], values: Sequence[Any]):
+    """Filter for rows after values in descending (columns...) order"""
+    clauses = []
+    for i, column in enumerate(columns):
+        equal = [columns[j] == values[j] for j in range(i)]
+        clauses.append(and_(*equal, column < values[i]))
+    return or_(*clauses)
+
+
+def keyset_page(query, columns: Sequence[Any], kind: str, cursor: Optional[str],
+                limit: int) -> Tuple[List[Any], Optional[str]]:
+    """One page of query in descending (columns...) order and the cursor for the next page"""
+    values = decode_cursor(cursor, kind, len(columns))
+    if values is not None:
+        query = query.filter(after_descending(columns, values))
+    rows = query.order_by(*[column.desc() for column in columns]).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(kind, [getattr(last, column.key) for column in columns])
+
+
+def page_metadata(next_cursor: Optional[str], limit: int) -> Dict[str, Any]:
+    return {'next_cursor': next_cursor, 'page_size': limit, 'has_more': next_cursor is not None}
@@ -0,0 +1,155 @@
+"""
+Single-value cache with a TTL, background refresh and last-known-good fallback.
+
+Built for endpoints whose payload is expensive to produce (scraping several
+feeds) but cheap to serve once computed:
+
+- Fresh values are returned straight from memory.
+- Expired values are still returned while one background thread refreshes
+  them, so readers never wait on the loader once a value exists.
+- Concurrent cold reads are single-flighted. One caller runs the loader and
+  the others wait for its result, instead of each starting its own scrape.
+- A result rejected by ``is_good`` (for example when every live source
+  failed) does not replace the last good value. It is only served when no
+  good value exists yet, and then only for ``retry_ttl`` seconds.
+- ``on_refresh`` is called with every new good value, so a producer can push
+  it to live subscribers.
+"""
+
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshingCache:
+    def __init__(self, loader: Callable[[], Any], ttl: float, retry_ttl: Optional[float] = None,
+                 is_good: Optional[Callable[[Any], bool]] = None, name: str = 'cache',
+                 background: bool = True, wait_timeout: float = 120.0,
+                 on_refresh: Optional[Callable[[Any], None]] = None):
+        self.loader = loader
+        self.ttl = ttl
+        self.retry_ttl = ttl if retry_ttl is None else retry_ttl
+        self.is_good = is_good or (lambda value: True)
+        self.name = name
+        self.background = background
+        self.wait_timeout = wait_timeout
+        self.on_refresh = on_refresh
+
+        self._lock = threading.Lock()
+        self._inflight: Optional[threading.Event] = None
+        self._value: Any = None
+        self._has_value = False
+        self._good = False
+        self._loaded_at = 0.0
+        self._expires_at = 0.0
+        self._last_error: Optional[str] = None
+        self._refresher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.hits = 0
+        self.stale_hits = 0
+        self.loads = 0
+        self.failures = 0
+
+    def _info(self, now: float) -> Dict[str, Any]:
+        return {
+            'cache': self.name,
+            'age_seconds': round(now - self._loaded_at, 1) if self._has_value else None,
+            'stale': now >= self._expires_at,
+            'last_known_good': self._good,
+            'last_error': self._last_error,
+        }
+
+    def get(self) -> Tuple[Any, Dict[str, Any]]:
+        """Return (value, cache info), loading synchronously only when nothing is cached"""
+        if self.background:
+            self._ensure_refresher()
+        now = time.time()
+        with self._lock:
+            if self._has_value:
+                if now < self._expires_at:
+                    self.hits += 1
+                else:
+                    self.stale_hits += 1
+                    if self._inflight is None:
+                        threading.Thread(target=self.refresh, name=f'{self.name}-refresh', daemon=True).start()
+                return self._value, self._info(now)
+
+        self.refresh()
+        with self._lock:
+            return self._value, self._info(time.time())
+
+    def refresh(self) -> Any:
+        """Run the loader once; callers arriving while a load is in flight wait for it"""
+        with self._lock:
+            event = self._inflight
+            leader = event is None
+            if leader:
+                event = self._inflight = threading.Event()
+        if not leader:
+            event.wait(self.wait_timeout)
+            return self._value
+
+        try:
+            value, error = self.loader(), None
+        except Exception as e:
+            value, error = None, e
+            logger.error(f"{self.name} refresh failed: {e}")
+
+        with self._lock:
+            now = time.time()
+            self.loads += 1
+            good = error is None and self.is_good(value)
+            if good:
+                self._value, self._good, self._has_value = value, True, True
+                self._loaded_at, self._expires_at = now, now + self.ttl
+                self._last_error = None
+            else:
+                self.failures += 1
+                self._last_error = str(error) if error else 'loader returned no usable data'
+                if not self._good and error is None:
+                    # Nothing better to serve yet; retry sooner than a normal refresh
+                    self._value, self._has_value = value, True
+                    self._loaded_at = now
+                # Keep serving the last known good value until the next attempt
+                self._expires_at = now + (self.retry_ttl if not self._good else self.ttl)
+            self._inflight = None
+        event.set()
+        if good and self.on_refresh:
+            try:
+                self.on_refresh(value)
+            except Exception as e:
+                logger.error(f"{self.name} on_refresh callback failed: {e}")
+        return self._value
+
+    def _ensure_refresher(self) -> None:
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+        with self._lock:
+            if self._refresher is None or not self._refresher.is_alive():
+                self._stop.clear()
+                self._refresher = threading.Thread(target=self._refresh_loop, name=f'{self.name}-refresher',
+                                                   daemon=True)
+                self._refresher.start()
+
+    def _refresh_loop(self) -> None:
+        """Refresh whenever the value expires, so readers rarely see a stale one"""
+        while not self._stop.is_set():
+            with self._lock:
+                wait = self._expires_at - time.time() if self._has_value else self.retry_ttl
+            if wait > 0 and self._stop.wait(min(wait, self.ttl)):
+                return
+            if not self._has_value or time.time() >= self._expires_at:
+                self.refresh()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            info = self._info(time.time())
+            info.update({'hits': self.hits, 'stale_hits': self.stale_hits, 'loads': self.loads,
+                         'failures': self.failures, 'ttl_seconds': self.ttl})
+            return info
@@ -0,0 +1,66 @@
+"""
+Additive schema upkeep for existing databases.
+
+``db.create_all()`` creates missing tables but leaves existing ones alone, so
+columns and indexes added to a model later never reach a database created
+before them. ``ensure_columns`` adds declared nullable columns that are
+missing and ``ensure_indexes`` creates missing indexes; neither drops or
+alters anything that exists.
+"""
+
+import logging
+
+from sqlalchemy import inspect, text
+
+logger = logging.getLogger(__name__)
+
+
+def ensure_columns(db) -> list:
+    """Add nullable columns declared on the models but missing from existing tables; returns table.column names"""
+    added = []
+    engine = db.engine
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present:
+                continue
+            if not column.nullable or column.primary_key:
+                logger.warning(f"Cannot add required column {table.name}.{column.name} automatically")
+                continue
+            column_type = column.type.compile(dialect=engine.dialect)
+            try:
+                with engine.begin() as connection:
+                    connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                added.append(f'{table.name}.{column.name}')
+            except Exception as e:
+                logger.warning(f"Could not add column {table.name}.{column.name}: {e}")
+    if added:
+        logger.info(f"Added missing columns: {', '.join(added)}")
+    return added
+
+
+def ensure_indexes(db) -> list:
+    """Create indexes declared on the models but missing from the database; returns their names"""
+    created = []
+    engine = db.engine
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in present:
+                continue
+            try:
+                index.create(bind=engine, checkfirst=True)
+                created.append(index.name)
+            except Exception as e:
+                logger.warning(f"Could not create index {index.name}: {e}")
+    if created:
+        logger.info(f"Created missing indexes: {', '.join(created)}")
+    return created
@@ -0,0 +1,184 @@
+"""
+SimHash fingerprints and an incremental banded index for near-duplicate text.
+
+Two texts whose 64-bit fingerprints differ in at most ``max_distance`` bits are
+treated as the same story. The index splits fingerprints into
+``max_distance + 1`` bands, so by pigeonhole any near duplicate shares at least
+one exact band value with the original and lookups only touch a few buckets.
+
+Texts shorter than ``MIN_FINGERPRINT_TOKENS`` words are never matched: an empty
+text fingerprints to 0 and a two-word one has too few features to say anything,
+so unrelated short posts would otherwise collapse into one.
+"""
+
+import os
+import re
+import hashlib
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+FINGERPRINT_BITS = 64
+MIN_FINGERPRINT_TOKENS = int(os.getenv('MIN_FINGERPRINT_TOKENS', '3'))
+
+_URL_RE = re.compile(r'https?://\S+|www\.\S+')
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def normalize_content(text: str) -> str:
+    """Lowercase, drop URLs and punctuation, collapse whitespace"""
+    text = _URL_RE.sub(' ', (text or '').lower())
+    text = _NON_WORD_RE.sub(' ', text)
+    return _SPACE_RE.sub(' ', text).strip()
+
+
+def token_count(text: str) -> int:
+    return len(normalize_content(text).split())
+
+
+def _feature_hash(feature: str) -> int:
+    # blake2b is stable across processes, unlike the built-in hash()
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def _features(text: str) -> List[str]:
+    tokens = normalize_content(text).split()
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+def simhash(text: str, bits: int = FINGERPRINT_BITS) -> int:
+    """SimHash over word unigrams and bigrams of the normalized text"""
+    features = _features(text)
+    if not features:
+        return 0
+    weights = [0] * bits
+    for feature in features:
+        h = _feature_hash(feature)
+        for i in range(bits):
+            if h >> i & 1:
+                weights[i] += 1
+            else:
+                weights[i] -= 1
+    fingerprint = 0
+    for i, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << i
+    return fingerprint
+
+
+def simhash_many(texts: Sequence[str]) -> List[int]:
+    """64-bit fingerprints for many texts at once, equal to calling simhash() on each.
+
+    Feature hashing stays in Python, but the per-bit voting runs as one NumPy
+    reduction over every feature of every text.
+    """
+    if not NUMPY_AVAILABLE:
+        return [simhash(text) for text in texts]
+    hashes: List[int] = []
+    counts: List[int] = []
+    for text in texts:
+        features = _features(text)
+        hashes.extend(_feature_hash(feature) for feature in features)
+        counts.append(len(features))
+    if not hashes:
+        return [0] * len(texts)
+
+    shifts = np.arange(FINGERPRINT_BITS, dtype=np.uint64)
+    bits = ((np.array(hashes, dtype=np.uint64)[:, None] >> shifts) & np.uint64(1)).astype(np.int32)
+    votes = 2 * bits - 1
+    counts_arr = np.array(counts)
+    present = counts_arr > 0
+    starts = np.concatenate(([0], np.cumsum(counts_arr)[:-1]))[present]
+    weights = np.add.reduceat(votes, starts, axis=0)
+    packed = ((weights > 0).astype(np.uint64) << shifts).sum(axis=1, dtype=np.uint64)
+
+    fingerprints = [0] * len(texts)
+    for index, fingerprint in zip(np.flatnonzero(present), packed.tolist()):
+        fingerprints[index] = int(fingerprint)
+    return fingerprints
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+class NearDuplicateIndex:
+    """Incremental SimHash index mapping fingerprints to the first item seen with them.
+
+    ``capacity`` bounds memory by evicting the oldest fingerprints first; texts
+    under ``min_tokens`` words are neither matched nor stored.
+    """
+
+    def __init__(self, max_distance: int = 3, capacity: Optional[int] = None, bits: int = FINGERPRINT_BITS,
+                 min_tokens: int = MIN_FINGERPRINT_TOKENS):
+        self.max_distance = max_distance
+        self.min_tokens = min_tokens
+        self.bits = bits
+        self.num_bands = max_distance + 1
+        self.band_width = bits // self.num_bands
+        self.capacity = capacity
+        self._bands: List[Dict[int, List[int]]] = [{} for _ in range(self.num_bands)]
+        self._items: Dict[int, Any] = {}
+        self._order: deque = deque()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _band_values(self, fingerprint: int) -> List[int]:
+        mask = (1 << self.band_width) - 1
+        return [(fingerprint >> (i * self.band_width)) & mask for i in range(self.num_bands)]
+
+    def matchable(self, text: str) -> bool:
+        """Whether text is long enough for its fingerprint to identify it"""
+        return token_count(text) >= self.min_tokens
+
+    def find(self, fingerprint: int) -> Optional[Any]:
+        """Return the item stored for a near-duplicate fingerprint, if any"""
+        for band, value in zip(self._bands, self._band_values(fingerprint)):
+            for candidate in band.get(value, ()):
+                if hamming_distance(candidate, fingerprint) <= self.max_distance:
+                    return self._items[candidate]
+        return None
+
+    def add(self, fingerprint: int, item: Any) -> None:
+        if fingerprint in self._items:
+            return
+        self._items[fingerprint] = item
+        self._order.append(fingerprint)
+        for band, value in zip(self._bands, self._band_values(fingerprint)):
+            band.setdefault(value, []).append(fingerprint)
+        if self.capacity and len(self._order) > self.capacity:
+            self._evict(self._order.popleft())
+
+    def _evict(self, fingerprint: int) -> None:
+        self._items.pop(fingerprint, None)
+        for band, value in zip(self._bands, self._band_values(fingerprint)):
+            bucket = band.get(value)
+            if bucket:
+                bucket.remove(fingerprint)
+                if not bucket:
+                    del band[value]
+
+    def find_or_add(self, text: str, item: Any) -> Tuple[Optional[Any], int]:
+        """Look up ``text``; store ``item`` under its fingerprint when it is new.
+        Returns (existing item or None, fingerprint); texts too short to match always come back new.
+        """
+        fingerprint = simhash(text, self.bits)
+        if not self.matchable(text):
+            return None, fingerprint
+        return self.find_or_add_fingerprint(fingerprint, item), fingerprint
+
+    def find_or_add_fingerprint(self, fingerprint: int, item: Any) -> Optional[Any]:
+        """Like find_or_add, for a fingerprint computed up front (e.g. by simhash_many).
+        Callers check matchable() first.
+        """
+        existing = self.find(fingerprint)
+        if existing is None:
+            self.add(fingerprint, item)
+        return existing
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full VADER+TextBlob scoring vs. the tiered engine, inline vs. the process pool
+
+Usage: python bench_sentiment.py [num_texts]
+"""
+
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.sentiment_engine import SentimentPool, score_sentiment
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+SAMPLES = [
+    "I love this new education policy! It's amazing for students across the country.",
+    "This is terrible, the government doesn't care about students or their mental health.",
+    "Campus hiring drives are picking up this quarter, but salaries are still low.",
+    "Rising rent in Bangalore is making it impossible for freshers to save anything.",
+    "The new startup scheme sounds good on paper; let's see if banks actually lend.",
+    "The exam timetable for the semester was published on the university website.",
+]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    texts = [f"{SAMPLES[i % len(SAMPLES)]} #{i}" for i in range(n)]
+    print(f"Scoring {n} texts ({os.cpu_count()} CPUs)")
+
+    analyzer = SentimentIntensityAnalyzer()
+    start = time.perf_counter()
+    [score_sentiment(analyzer, text, detail=True) for text in texts]
+    detail_secs = time.perf_counter() - start
+    print(f"VADER+TextBlob for every text: {detail_secs:.2f}s  ({n / detail_secs:,.0f} texts/s)")
+
+    start = time.perf_counter()
+    inline = [score_sentiment(analyzer, text) for text in texts]
+    inline_secs = time.perf_counter() - start
+    tiered = sum(1 for r in inline if r['tier'] == 'vader+textblob')
+    print(f"tiered inline loop:  {inline_secs:.2f}s  ({n / inline_secs:,.0f} texts/s, TextBlob on {tiered})")
+
+    pool = SentimentPool()
+    pool.analyze_batch(texts[:pool.min_batch * pool.workers])  # start and warm the workers
+    start = time.perf_counter()
+    batched = pool.analyze_batch(texts)
+    batch_secs = time.perf_counter() - start
+    pool.shutdown()
+    print(f"batch ({pool.workers} workers): {batch_secs:.2f}s  ({n / batch_secs:,.0f} texts/s)")
+
+    assert [r['overall'] for r in batched] == [r['overall'] for r in inline], "results out of order"
+    print(f"speedup: {inline_secs / batch_secs:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
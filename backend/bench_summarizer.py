@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-keyword regex scans vs. the single-pass PolicyTextExtractor on large gazette text
+
+Usage: python bench_summarizer.py [megabytes]
+"""
+
+import os
+import re
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.policy_summarizer import PolicySummarizer
+
+FILLER = [
+    "In exercise of the powers conferred by sub-section (1) of section 9 of the Act, the Central Government hereby notifies the schedule annexed hereto",
+    "The said schedule lists the items, their tariff headings and the applicable conditions as set out in the table below",
+    "Serial numbers 14 to 27 of the table are omitted with effect from the date of publication in the Official Gazette",
+    "Explanation: for the purposes of this notification the expression unit means the smallest marketable quantity",
+]
+CUES = [
+    "The rate for the said goods is revised to five per cent",
+    "Every registered person shall furnish the return in Form GSTR-9 electronically",
+    "Applicants are required to file the declaration before the end of the quarter",
+    "This notification amends notification No. 1/2017 dated the 28th June, 2017",
+    "Banks and financial institutions must report such transactions to the RBI",
+    "The new procedure applies to students enrolled in any recognised university",
+    "Entry 12 is replaced by the following entry, effective from the 1st day of April, 2025",
+]
+
+
+def legacy_extract(summarizer, text, title):
+    """The per-keyword scans the extractor replaced, kept here as the reference output"""
+    changes = []
+    for keyword in summarizer.change_keywords:
+        changes.extend(re.findall(rf'{keyword}[^.]*', text, re.IGNORECASE)[:2])
+    actions = []
+    for keyword in summarizer.action_keywords:
+        actions.extend(re.findall(rf'{keyword}[^.]*', text, re.IGNORECASE)[:2])
+    combined_text = f"{text.lower()} {title.lower()}"
+    parties = {party for party, keywords in summarizer.party_keywords.items()
+               if any(keyword in combined_text for keyword in keywords)}
+    return changes[:3], actions[:3], parties
+
+
+def build_gazette(megabytes, cue_every):
+    """Mostly boilerplate sentences, with a cue sentence every cue_every sentences"""
+    sentences = []
+    size = 0
+    i = 0
+    while size < megabytes * 1024 * 1024:
+        sentence = CUES[(i // cue_every) % len(CUES)] if cue_every and i % cue_every == cue_every - 1 \
+            else FILLER[i % len(FILLER)]
+        sentences.append(sentence)
+        size += len(sentence) + 2
+        i += 1
+    return '. '.join(sentences) + '.'
+
+
+def run(label, summarizer, text, title):
+    start = time.perf_counter()
+    expected = legacy_extract(summarizer, text, title)
+    legacy_secs = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = summarizer.extractor.extract(text, title)
+    single_secs = time.perf_counter() - start
+
+    assert (found['changes'], found['actions'], set(found['parties'])) == expected, "outputs differ"
+    print(f"{label}: per-keyword {legacy_secs:.3f}s, single pass {single_secs:.3f}s "
+          f"({legacy_secs / single_secs:.1f}x)")
+
+
+def main():
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 4
+    summarizer = PolicySummarizer()
+    title = "Central Tax Notification No. 12/2025"
+    print(f"Synthetic gazette text, {megabytes:g} MB")
+    # Cues throughout: the caps fill early and the walk stops
+    run("dense cues ", summarizer, build_gazette(megabytes, 3), title)
+    # A few cues near the end: the whole text has to be walked
+    sparse = build_gazette(megabytes, 0) + ' ' + '. '.join(CUES) + '.'
+    run("sparse cues", summarizer, sparse, title)
+
+
+if __name__ == "__main__":
+    main()
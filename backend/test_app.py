@@ -63,6 +63,77 @@ def test_policy_summarizer():
         print(f"✗ Policy summarizer error: {e}")
         return False
 
+def test_policy_text_extractor():
+    """Single-pass extractor keeps the per-keyword caps and keyword ordering"""
+    from app.services.policy_summarizer import PolicySummarizer
+    summarizer = PolicySummarizer()
+
+    text = ("Rates are revised for medicines. Every taxpayer shall file by June, and shall pay the new rate. "
+            "The schedule is AMENDED. Importers must register. The entry is amended again. "
+            "Entries amended a third time. Banks should report.")
+    found = summarizer.extractor.extract(text, "Notice for Students")
+
+    # 'amend' comes first in keyword order and keeps only two fragments
+    assert found['changes'] == ["AMENDED", "amended again", "new rate"]
+    # 'shall' counts once per sentence, from its first occurrence
+    assert found['actions'] == ["shall file by June, and shall pay the new rate", "must register", "should report"]
+    assert found['parties'] == ['taxpayers', 'students', 'banks']
+
+    card = summarizer.generate_policy_card("Nothing specific here", "GST Rate Notification")
+    assert card['what_changed'] == "GST rates and exemptions have been updated"
+    assert card['who_affected'] == 'taxpayers'
+    print("✓ Policy text extractor works")
+    return True
+
+def test_glossary_translator():
+    """Glossary translation prefers the longest term and never rewrites inside words"""
+    from app.services.glossary_translator import GlossaryTranslator, translate_summary
+
+    translator = GlossaryTranslator({'tax': 'कर', 'Income Tax': 'आयकर', 'taxpayers': 'करदाता'})
+    translated, replaced = translator.translate_terms("Income Tax rules for taxpayers; tax is due. Taxation")
+    assert translated == "आयकर rules for करदाता; कर is due. Taxation"
+    assert replaced == 3
+    translator.translate_terms("Income Tax rules for taxpayers; tax is due. Taxation")
+    assert translator.cache_info().hits == 1
+
+    assert translate_summary("GST policy update for students", 'hi') == "जीएसटी नीति अपडेट for छात्र"
+    assert translate_summary("GST policy update for students", 'ne') == "जीएसटी नीति अपडेट for विद्यार्थी"
+    assert "उपलब्ध छैन" in translate_summary("Nothing to translate here", 'ne')
+    print("✓ Glossary translator works")
+    return True
+
+def test_pdf_page_budget():
+    """PDF text is extracted page by page and stops at the page and character budgets"""
+    import tempfile
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+    from app.services.pdf_ingest import iter_pdf_pages, looks_like_pdf
+
+    fd, path = tempfile.mkstemp(suffix='.pdf')
+    os.close(fd)
+    try:
+        c = canvas.Canvas(path, pagesize=A4)
+        for page in range(1, 6):
+            c.drawString(72, 760, f"Notification page {page}: every taxpayer shall file the return.")
+            c.showPage()
+        c.save()
+
+        pages = list(iter_pdf_pages(path, max_pages=3, max_chars=10000))
+        assert [number for number, _ in pages] == [1, 2, 3]
+        assert "page 2" in pages[1][1]
+
+        pages = list(iter_pdf_pages(path, max_pages=10, max_chars=80))
+        assert sum(len(text) for _, text in pages) == 80
+        assert len(pages) == 2
+    finally:
+        os.remove(path)
+
+    assert looks_like_pdf("https://egazette.gov.in/WriteReadData/2025/265620.pdf")
+    assert looks_like_pdf("https://example.gov.in/view?id=1", "application/pdf; charset=binary")
+    assert not looks_like_pdf("https://pib.gov.in/PressReleasePage.aspx?PRID=1")
+    print("✓ PDF page budget works")
+    return True
+
 def main():
     """Run all tests"""
     print("PolicyPulse Backend Test Suite")
@@ -72,7 +143,10 @@ def main():
         test_imports,
         test_app_creation,
         test_policy_fetcher,
-        test_policy_summarizer
+        test_policy_summarizer,
+        test_policy_text_extractor,
+        test_glossary_translator,
+        test_pdf_page_budget
     ]
     
     passed = 0
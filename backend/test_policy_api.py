@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+Tests for the policy API against a throwaway SQLite database
+"""
+
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+@contextmanager
+def temporary_app(replica=False):
+    """A fresh app bound to its own database file, and a second file as read replica if asked"""
+    paths = []
+    for _ in range(2 if replica else 1):
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        paths.append(path)
+    previous = {name: os.environ.get(name) for name in ('DATABASE_URL', 'DATABASE_REPLICA_URL')}
+    os.environ['DATABASE_URL'] = f'sqlite:///{paths[0]}'
+    os.environ.pop('DATABASE_REPLICA_URL', None)
+    if replica:
+        os.environ['DATABASE_REPLICA_URL'] = f'sqlite:///{paths[1]}'
+    try:
+        from app import create_app
+        yield create_app()
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        for path in paths:
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+
+
+def add_policies(app, rows):
+    from app import db
+    from app.models.policy import PolicyCard
+    with app.app_context():
+        now = datetime.utcnow()
+        for i, row in enumerate(rows):
+            fields = {
+                'ministry': 'Ministry of Education',
+                'notification_number': f'TEST-{i}',
+                'publication_date': now - timedelta(days=i),
+            }
+            fields.update(row)
+            db.session.add(PolicyCard(**fields))
+        db.session.commit()
+
+
+def test_policy_search():
+    """Search is ranked, matches prefixes, highlights snippets and follows edits"""
+    from app import db
+    from app.models.policy import PolicyCard
+
+    with temporary_app() as app:
+        add_policies(app, [
+            {'title': 'Scholarship scheme for rural students',
+             'summary_english': 'Merit scholarships for students from rural districts.'},
+            {'title': 'Fertiliser subsidy revision', 'ministry': 'Ministry of Agriculture',
+             'summary_english': 'Revised subsidy rates; students of agriculture colleges are unaffected.'},
+            {'title': 'GST rate notification', 'ministry': 'Ministry of Finance',
+             'summary_english': 'Changes to GST slabs.'},
+        ])
+        client = app.test_client()
+
+        body = client.get('/api/policies/search?q=scholar').get_json()
+        assert body['search_backend'] == 'fts5'
+        assert [p['title'] for p in body['policies']] == ['Scholarship scheme for rural students']
+        assert '<mark>' in body['policies'][0]['search']['snippet']
+
+        # A title match outranks a passing mention in the summary
+        titles = [p['title'] for p in client.get('/api/policies/search?q=student').get_json()['policies']]
+        assert titles == ['Scholarship scheme for rural students', 'Fertiliser subsidy revision']
+        body = client.get('/api/policies/search?q=student&ministry=Agriculture').get_json()
+        assert body['count'] == 1
+
+        with app.app_context():
+            policy = PolicyCard.query.filter_by(notification_number='TEST-2').first()
+            policy.summary_english = 'Changes to GST slabs for student laptops.'
+            db.session.commit()
+            db.session.delete(PolicyCard.query.filter_by(notification_number='TEST-0').first())
+            db.session.commit()
+        titles = [p['title'] for p in client.get('/api/policies/search?q=student').get_json()['policies']]
+        assert titles == ['Fertiliser subsidy revision', 'GST rate notification'] or \
+            titles == ['GST rate notification', 'Fertiliser subsidy revision']
+        # Query syntax characters are treated as plain words
+        assert client.get('/api/policies/search?q=%22GST%22%20OR%20(').status_code == 200
+    print("✓ Policy search works")
+    return True
+
+
+def test_keyset_pagination():
+    """Listings page through every row exactly once with opaque cursors"""
+    from app import db
+    from app.models.policy import UserComplaint
+
+    with temporary_app() as app:
+        add_policies(app, [{'title': f'Education notice {i}'} for i in range(7)])
+        with app.app_context():
+            stamp = datetime.utcnow()
+            # Identical timestamps are ordered by id
+            for i in range(5):
+                db.session.add(UserComplaint(url='https://pib.gov.in/x', complaint_text=f'c{i}',
+                                             created_at=stamp, validation_status='pending'))
+            db.session.commit()
+        client = app.test_client()
+
+        def collect(path, key):
+            seen, cursor = [], ''
+            while True:
+                body = client.get(f'{path}&cursor={cursor}').get_json()
+                assert body['count'] <= 3
+                seen.extend(item['id'] for item in body[key])
+                if not body['has_more']:
+                    assert body['next_cursor'] is None
+                    return seen
+                cursor = body['next_cursor']
+
+        recent = collect('/api/policies/recent?limit=3', 'policies')
+        assert len(recent) == len(set(recent)) == 7
+        assert collect('/api/policies/search?q=educat&limit=3', 'policies') and \
+            sorted(collect('/api/policies/search?q=educat&limit=3', 'policies')) == sorted(recent)
+        complaints = collect('/api/rti/complaints?limit=2', 'complaints')
+        assert complaints == [5, 4, 3, 2, 1]
+
+        assert client.get('/api/rti/complaints?cursor=garbage').status_code == 400
+        search_cursor = client.get('/api/policies/search?q=educat&limit=3').get_json()['next_cursor']
+        # A cursor only resumes the listing it came from
+        assert client.get(f'/api/policies/recent?cursor={search_cursor}').status_code == 400
+
+        with app.app_context():
+            indexes = {index['name'] for index in db.inspect(db.engine).get_indexes('policy_cards')}
+            assert 'ix_policy_cards_publication_date_id' in indexes
+    print("✓ Keyset pagination works")
+    return True
+
+
+def test_policy_stats_maintained_on_write():
+    """Stats and ministry counters follow inserts, edits and deletes and can be rebuilt"""
+    from app import db
+    from app.models.policy import PolicyCard
+
+    with temporary_app() as app:
+        add_policies(app, [
+            {'title': 'A', 'missing_dates': True},
+            {'title': 'B', 'ministry': 'Ministry of Finance', 'missing_urls': True, 'missing_dates': True},
+            {'title': 'C', 'ministry': 'Ministry of Finance', 'publication_date': datetime.utcnow() - timedelta(days=30)},
+        ])
+        client = app.test_client()
+        stats = client.get('/api/policies/stats').get_json()['stats']
+        assert stats['total_policies'] == 3 and stats['recent_policies'] == 2
+        assert stats['policies_with_gaps'] == 2 and stats['gap_flags']['missing_dates'] == 2
+        assert stats['ministry_count'] == 2
+
+        with app.app_context():
+            card = PolicyCard.query.filter_by(title='B').first()
+            card.ministry = 'Ministry of Education'
+            card.missing_urls = False
+            card.missing_dates = False
+            db.session.delete(PolicyCard.query.filter_by(title='C').first())
+            db.session.commit()
+        stats = client.get('/api/policies/stats').get_json()['stats']
+        assert stats['total_policies'] == 2 and stats['policies_with_gaps'] == 1
+        assert stats['ministry_count'] == 1 and stats['recent_policies'] == 2
+        assert client.get('/api/policies/ministries').get_json()['ministries'] == [
+            {'name': 'Ministry of Education', 'policy_count': 2}
+        ]
+        assert client.get('/api/policies/stats/consistency').get_json()['consistent']
+
+        # A bulk write bypasses the counters; the checker finds and repairs the drift
+        with app.app_context():
+            PolicyCard.query.filter_by(title='A').delete()
+            db.session.commit()
+        report = client.get('/api/policies/stats/consistency').get_json()
+        assert not report['consistent']
+        assert client.post('/api/policies/stats/consistency').get_json()['rebuilt']
+        assert client.get('/api/policies/stats').get_json()['stats']['total_policies'] == 1
+        assert client.get('/api/policies/stats/consistency').get_json()['consistent']
+
+    # The recent count is the rolling 7 x 24 hours, not the last 7 or 8 calendar days;
+    # policies without a ministry are left out of the ministry counters on both paths
+    with temporary_app() as app:
+        now = datetime.utcnow()
+        add_policies(app, [
+            {'title': 'Inside', 'publication_date': now - timedelta(days=7) + timedelta(hours=1)},
+            {'title': 'Outside', 'publication_date': now - timedelta(days=7) - timedelta(hours=1)},
+            {'title': 'Today', 'ministry': '', 'publication_date': now},
+        ])
+        client = app.test_client()
+        stats = client.get('/api/policies/stats').get_json()['stats']
+        assert stats['recent_policies'] == 2 and stats['ministry_count'] == 1
+        assert client.get('/api/policies/stats/consistency').get_json()['consistent']
+    print("✓ Policy stats are maintained on write")
+    return True
+
+
+def test_policy_text_is_opt_in():
+    """List and detail endpoints never select original_text; /<id>/text serves it on request"""
+    from sqlalchemy import event
+    from app import db
+
+    with temporary_app() as app:
+        add_policies(app, [{'title': f'Gazette notice {i}', 'original_text': f'Section {i}. ' + 'x' * 50000}
+                           for i in range(3)])
+        client = app.test_client()
+        statements = []
+        with app.app_context():
+            engine = db.engine
+
+        def capture(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, 'before_cursor_execute', capture)
+        try:
+            recent = client.get('/api/policies/recent').get_json()
+            policy_id = recent['policies'][0]['id']
+            detail = client.get(f'/api/policies/{policy_id}').get_json()
+            client.get('/api/policies/search?q=gazette')
+            client.get(f'/api/policies/{policy_id}/gaps')
+        finally:
+            event.remove(engine, 'before_cursor_execute', capture)
+        assert statements and not any('original_text' in s for s in statements if 'policy_cards_fts' not in s)
+        assert recent['count'] == 3 and detail['policy']['title'] == recent['policies'][0]['title']
+        assert 'original_text' not in detail['policy']
+
+        text = client.get(f'/api/policies/{policy_id}/text?max_chars=10').get_json()
+        assert text['original_text'].startswith('Section') and len(text['original_text']) == 10
+        assert text['total_length'] > 50000
+        assert client.get(f'/api/policies/{policy_id}/text?offset=50000').get_json()['original_text'] == 'x' * 11
+        assert client.get('/api/policies/999/text').status_code == 404
+        # A failing read is a JSON error, not an HTML error page
+        from unittest import mock
+        from app.services.policy_text_store import policy_text_store
+        with mock.patch.object(policy_text_store, 'get', side_effect=RuntimeError('corrupt blob')):
+            failed = client.get(f'/api/policies/{policy_id}/text')
+        assert failed.status_code == 500 and failed.get_json()['success'] is False
+    print("✓ Policy text is opt-in")
+    return True
+
+
+def test_conditional_get():
+    """Polled endpoints answer 304 until a policy write changes what they would return"""
+    from app import db
+    from app.models.policy import PolicyCard
+
+    with temporary_app() as app:
+        add_policies(app, [{'title': 'Notice A'}, {'title': 'Notice B', 'ministry': 'Ministry of Finance'}])
+        client = app.test_client()
+        paths = ['/api/policies/recent', '/api/policies/stats', '/api/policies/ministries']
+        with app.app_context():
+            policy_id = PolicyCard.query.filter_by(title='Notice A').first().id
+        paths.append(f'/api/policies/{policy_id}')
+
+        first = {}
+        for path in paths:
+            response = client.get(path)
+            assert response.status_code == 200 and response.headers['ETag'].startswith('W/')
+            assert response.headers['Cache-Control'] and response.headers['Last-Modified']
+            first[path] = response
+            repeat = client.get(path, headers={'If-None-Match': response.headers['ETag']})
+            assert repeat.status_code == 304 and repeat.data == b''
+            assert repeat.headers['ETag'] == response.headers['ETag']
+            assert client.get(path, headers={'If-Modified-Since': response.headers['Last-Modified']}).status_code == 304
+        assert 'no-cache' in first['/api/policies/recent'].headers['Cache-Control']
+        # A different page of the same listing is a different representation
+        assert client.get('/api/policies/recent?limit=1', headers={
+            'If-None-Match': first['/api/policies/recent'].headers['ETag']}).status_code == 200
+
+        with app.app_context():
+            PolicyCard.query.filter_by(title='Notice A').first().status = 'Updated'
+            db.session.commit()
+        for path in paths:
+            etag = first[path].headers['ETag']
+            response = client.get(path, headers={'If-None-Match': etag})
+            assert response.status_code == 200 and response.headers['ETag'] != etag
+
+        # Edits to other policies leave a policy's own tag alone
+        detail = client.get(f'/api/policies/{policy_id}')
+        with app.app_context():
+            PolicyCard.query.filter_by(title='Notice B').first().status = 'Updated'
+            db.session.commit()
+        assert client.get(f'/api/policies/{policy_id}', headers={
+            'If-None-Match': detail.headers['ETag']}).status_code == 304
+        # A rebuild after bulk writes moves the generation on
+        stats = client.get('/api/policies/stats')
+        with app.app_context():
+            from app.services.policy_stats import policy_stats
+            policy_stats.rebuild()
+            assert policy_stats.check()['consistent']
+        assert client.get('/api/policies/stats', headers={
+            'If-None-Match': stats.headers['ETag']}).status_code == 200
+    print("✓ Conditional GET works")
+    return True
+
+
+def test_recent_refreshes_in_background():
+    """Stale data is served at once while a single background refresh runs"""
+    import threading
+    from app import db
+    from app.models.policy import PolicyCard
+    from app.services.policy_ingest import PolicyRefresher
+    from app.services.policy_stats import LAST_REFRESH, policy_stats
+
+    with temporary_app() as app:
+        add_policies(app, [{'title': 'Old notice', 'created_at': datetime.utcnow() - timedelta(days=3)}])
+        release, calls = threading.Event(), []
+
+        def ingest(days_back):
+            calls.append(days_back)
+            release.wait(5)
+            db.session.add(PolicyCard(title='Fresh notice', ministry='Ministry of Education',
+                                      notification_number='FRESH-1', publication_date=datetime.utcnow()))
+            policy_stats.bump(LAST_REFRESH)
+            db.session.commit()
+            return {'new_policies': 1, 'total_checked': 1}
+
+        refresher = PolicyRefresher(ingest=ingest, stale_after=3600, retry_after=60)
+        refresher.init_app(app)
+        with app.app_context():
+            assert refresher.data_age() >= 3 * 86400 - 5
+            first = refresher.refresh_if_stale()
+            # Concurrent stale reads do not start a second refresh
+            assert first['refresh_in_progress'] and refresher.refresh_if_stale()['refresh_in_progress']
+            assert not refresher.start()
+        release.set()
+        for _ in range(50):
+            if not refresher.in_progress:
+                break
+            threading.Event().wait(0.1)
+        assert calls == [7] and refresher.last_result == {'new_policies': 1, 'total_checked': 1}
+        with app.app_context():
+            assert refresher.data_age() < 60
+            assert PolicyCard.query.filter_by(notification_number='FRESH-1').count() == 1
+            # Fresh data again: no refresh
+            assert not refresher.refresh_if_stale()['refresh_in_progress'] and calls == [7]
+            assert policy_stats.check()['consistent']
+        client = app.test_client()
+        recent = client.get('/api/policies/recent')
+        assert recent.get_json()['count'] == 2 and 'data_age' not in recent.get_json()
+        assert int(recent.headers['X-Data-Age']) < 60 and recent.headers['X-Refresh-In-Progress'] == 'false'
+        # A 304 still carries the current freshness
+        revalidated = client.get('/api/policies/recent', headers={'If-None-Match': recent.headers['ETag']})
+        assert revalidated.status_code == 304 and 'X-Data-Age' in revalidated.headers
+        assert revalidated.headers['X-Refresh-In-Progress'] == 'false'
+    print("✓ Recent policies refresh in the background")
+    return True
+
+
+def test_policy_text_blob_store():
+    """Source text is stored compressed once per document and read back transparently"""
+    from app import db
+    from app.models.policy import PolicyCard
+    from app.models.policy_text import PolicyTextBlob
+    from app.services.policy_text_store import policy_text_store, text_digest
+
+    gazette = 'The notification amends rule 4 of the scholarship rules. ' * 2000
+    with temporary_app() as app:
+        add_policies(app, [
+            {'title': 'Original', 'original_text': gazette},
+            {'title': 'Cross-posted copy', 'original_text': gazette},
+            {'title': 'Other', 'original_text': 'Short notice.'},
+            {'title': 'No text'},
+        ])
+        with app.app_context():
+            assert PolicyTextBlob.query.count() == 2
+            blob = db.session.get(PolicyTextBlob, text_digest(gazette))
+            assert blob.length == len(gazette) and blob.stored_bytes * 20 < blob.raw_bytes
+            # Only the reference is on the hot row
+            assert db.session.query(PolicyCard._legacy_text).filter(PolicyCard._legacy_text.isnot(None)).count() == 0
+
+            db.session.expunge_all()
+            policy_text_store._cache.clear()
+            copy = PolicyCard.query.filter_by(title='Cross-posted copy').first()
+            assert copy.original_text == gazette
+            assert PolicyCard.query.filter_by(title='No text').first().original_text is None
+
+            copy.original_text = 'Corrigendum.'
+            db.session.commit()
+            copy_id = copy.id
+            # Rows written before the blob store kept their text inline
+            db.session.execute(PolicyCard.__table__.insert().values(
+                title='Legacy', ministry='Ministry of Education', notification_number='LEGACY-1',
+                publication_date=datetime.utcnow(), original_text=gazette + 'legacy'))
+            db.session.commit()
+            legacy = PolicyCard.query.filter_by(title='Legacy').first()
+            assert legacy.text_sha256 is None and legacy.original_text == gazette + 'legacy'
+            legacy_id = legacy.id
+
+        client = app.test_client()
+        assert client.get(f'/api/policies/{copy_id}/text').get_json()['original_text'] == 'Corrigendum.'
+        assert client.get(f'/api/policies/{legacy_id}/text?max_chars=3').get_json()['original_text'] == 'The'
+
+        with app.app_context():
+            report = policy_text_store.migrate(batch_size=1)
+            assert report['migrated'] == 1 and report['blobs_created'] == 1 and report['blobs_pruned'] == 0
+            assert policy_text_store.migrate()['migrated'] == 0
+            db.session.expunge_all()
+            legacy = db.session.get(PolicyCard, legacy_id)
+            assert legacy.text_sha256 and legacy.original_text == gazette + 'legacy'
+
+            # Deleting the last policy that points at a blob leaves it for prune
+            db.session.delete(PolicyCard.query.filter_by(title='Other').first())
+            db.session.commit()
+            assert policy_text_store.prune() == 1
+            assert PolicyTextBlob.query.count() == 3
+        text = client.get(f'/api/policies/{legacy_id}/text?offset=5&max_chars=4').get_json()
+        assert text['original_text'] == 'otif' and text['total_length'] == len(gazette) + 6
+    print("✓ Policy text blob store works")
+    return True
+
+
+def test_read_replica_routing():
+    """Read-only views read from the replica, writes go to the primary, and a writer then reads its own writes"""
+    import shutil
+    from sqlalchemy import text
+    from app import db
+    from app.utils.database import REPLICA_BIND, REPLICA_READY, check_replica
+
+    with temporary_app(replica=True) as app:
+        with app.app_context():
+            primary, replica = db.engine, db.engines[REPLICA_BIND]
+            primary_path, replica_path = primary.url.database, replica.url.database
+            with primary.connect() as connection:
+                assert connection.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+                assert connection.execute(text('PRAGMA busy_timeout')).scalar() == 5000
+        # The empty replica has none of the schema: reads stay on the primary instead of failing
+        assert app.config[REPLICA_READY] is False
+        # Writes outside a request go to the primary only
+        add_policies(app, [{'title': 'Notice A'}, {'title': 'Notice B'}])
+        assert app.test_client().get('/api/policies/stats').get_json()['stats']['total_policies'] == 2
+        with app.app_context():
+            db.session.remove()
+            primary.dispose()
+            # "Replicate": copy the primary's committed state to the replica file
+            with primary.connect() as connection:
+                connection.execute(text('PRAGMA wal_checkpoint(TRUNCATE)'))
+            shutil.copyfile(primary_path, replica_path)
+            replica.dispose()
+        assert check_replica(app, db)
+
+        client = app.test_client()
+        assert client.get('/api/policies/stats').get_json()['stats']['total_policies'] == 2
+        assert client.get('/api/rti/complaints').get_json()['count'] == 0
+
+        response = client.post('/api/rti/submit-complaint',
+                               json={'url': 'https://pib.gov.in/notice', 'complaint': 'When does it apply?'})
+        assert response.status_code == 200 and 'db_primary_until' in response.headers.get('Set-Cookie', '')
+        # The replica has not caught up: the writer still sees its complaint, another client does not yet
+        assert client.get('/api/rti/complaints').get_json()['count'] == 1
+        assert app.test_client().get('/api/rti/complaints').get_json()['count'] == 0
+        with app.app_context():
+            assert db.session.execute(text('SELECT count(*) FROM user_complaints')).scalar() == 1
+        # Plain GETs set no cookie
+        assert 'Set-Cookie' not in app.test_client().get('/api/policies/stats').headers
+        # GETs that write are not opted in and run on the primary
+        with app.app_context():
+            complaint_id = db.session.execute(text('SELECT id FROM user_complaints')).scalar()
+        # (The replica has not seen the complaint yet, so reading it there would be a 404)
+        assert app.test_client().get(f'/api/rti/validate/{complaint_id}').get_json()['success']
+    print("✓ Read replica routing works")
+    return True
+
+
+def main():
+    tests = [
+        test_policy_search,
+        test_keyset_pagination,
+        test_policy_stats_maintained_on_write,
+        test_policy_text_is_opt_in,
+        test_conditional_get,
+        test_recent_refreshes_in_background,
+        test_policy_text_blob_store,
+        test_read_replica_routing,
+    ]
+    passed = sum(1 for test in tests if test())
+    print(f"Results: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()
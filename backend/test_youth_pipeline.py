@@ -0,0 +1,548 @@
+#!/usr/bin/env python3
+"""
+Offline checks for the youth opinion pipeline (no network or API keys needed)
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_near_duplicate_index():
+    """Syndicated headlines collapse onto one fingerprint bucket"""
+    from app.utils.simhash import NearDuplicateIndex, simhash, hamming_distance
+
+    a = "India announces new scholarship scheme for engineering students"
+    b = "India announces new scholarship scheme for engineering students!"
+    c = "Monsoon floods disrupt train services across Kerala"
+    assert hamming_distance(simhash(a), simhash(b)) == 0
+
+    index = NearDuplicateIndex()
+    assert index.find_or_add(a, 'a')[0] is None
+    assert index.find_or_add(b, 'b')[0] == 'a'
+    assert index.find_or_add(c, 'c')[0] is None
+
+    bounded = NearDuplicateIndex(capacity=1)
+    bounded.find_or_add(a, 'a')
+    bounded.find_or_add(c, 'c')
+    assert len(bounded) == 1 and bounded.find_or_add(a, 'a2')[0] is None
+
+    # Empty and very short texts never match each other
+    assert index.find_or_add('', 'empty')[0] is None and index.find_or_add('!!', 'bang')[0] is None
+    assert index.find_or_add('Exams', 'x')[0] is None and index.find_or_add('exams!', 'y')[0] is None
+    print("✓ Near-duplicate index works")
+    return True
+
+
+def test_merge_near_duplicate():
+    """Duplicates merge into the canonical post with combined engagement"""
+    from app.services.social_media_scraper import SocialMediaScraper
+    from app.utils.simhash import NearDuplicateIndex
+
+    scraper = SocialMediaScraper.__new__(SocialMediaScraper)
+    scraper.duplicate_index = NearDuplicateIndex()
+    scraper.duplicates_merged = 0
+    first = {'platform': 'news', 'source': 'BBC India RSS', 'title': 'Students protest exam paper leak in Delhi'}
+    repost = {'platform': 'reddit', 'source': 'Reddit India Hot', 'title': 'Students protest exam paper leak in Delhi', 'score': 40, 'num_comments': 2}
+
+    assert scraper.merge_near_duplicate(first) is False
+    assert scraper.merge_near_duplicate(repost) is True
+    assert first['engagement'] == 42
+    assert first['duplicate_count'] == 1
+    assert first['duplicate_sources'] == ['BBC India RSS', 'Reddit India Hot']
+
+    # Tweets served again from the scored-tweet cache start each scrape unmerged
+    import tempfile
+    from types import SimpleNamespace
+    from unittest import mock
+    from app.services.twitter_polling import TwitterPollState
+
+    text = 'Students demand lower exam fees across India #StudentLife'
+    tweet = SimpleNamespace(id='7', text=text, author_id='1', created_at=None,
+                            public_metrics={'like_count': 5, 'retweet_count': 0, 'reply_count': 0})
+    responses = [SimpleNamespace(data=[tweet], meta={'newest_id': '7'}), SimpleNamespace(data=[], meta={})]
+    scraper.twitter_api = SimpleNamespace(search_recent_tweets=lambda **params: responses.pop(0))
+    with tempfile.TemporaryDirectory() as tmp, mock.patch('time.sleep'):
+        scraper.twitter_state = TwitterPollState(path=os.path.join(tmp, 'state.json'))
+        for run in range(2):
+            scraper.duplicate_index = NearDuplicateIndex()
+            posts = list(scraper.scrape_twitter_youth_opinions(['#StudentLife'], limit=10))
+            assert len(posts) == 1
+            assert scraper.merge_near_duplicate({'platform': 'news', 'title': text, 'score': 3}) is True
+            assert posts[0]['duplicate_count'] == 1 and posts[0]['engagement'] == 8
+
+        # A tweet merged into a news story comes back on its own once the story is gone
+        responses[:] = [SimpleNamespace(data=[tweet], meta={'newest_id': '7'}), SimpleNamespace(data=[], meta={})]
+        scraper.twitter_state = TwitterPollState(path=os.path.join(tmp, 'merged.json'))
+        scraper.duplicate_index = NearDuplicateIndex()
+        story = {'platform': 'news', 'title': text, 'score': 3}
+        scraper.merge_near_duplicate(story)
+        assert list(scraper.scrape_twitter_youth_opinions(['#StudentLife'], limit=10)) == []
+        assert story['duplicate_count'] == 1 and story['engagement'] == 8
+        scraper.duplicate_index = NearDuplicateIndex()
+        posts = list(scraper.scrape_twitter_youth_opinions(['#StudentLife'], limit=10))
+        assert [p['tweet_id'] for p in posts] == ['7'] and posts[0]['duplicate_count'] == 0
+    print("✓ Near-duplicate merging works")
+    return True
+
+
+def test_streaming_pipeline():
+    """Incremental trends are correct and top-k keeps the best posts in order"""
+    from app.services.youth_trends import YouthOpinionPipeline
+
+    posts = [
+        {'platform': 'reddit' if i % 2 else 'news', 'relevance_score': i % 7,
+         'sentiment': {'overall': ['positive', 'neutral', 'negative'][i % 3]},
+         'youth_keywords': ['student', 'job'][: i % 3]}
+        for i in range(50)
+    ]
+    pipeline = YouthOpinionPipeline(top_k=5)
+    for post in posts:
+        pipeline.feed(post)
+
+    result = pipeline.result()
+    assert result['trends']['sentiment_distribution'] == {'positive': 34.0, 'negative': 32.0, 'neutral': 34.0}
+    assert result['trends']['top_keywords'] == [('student', 33), ('job', 16)]
+    assert result['trends']['platform_distribution'] == {'news': 25, 'reddit': 25}
+    expected = sorted(posts, key=lambda p: p['relevance_score'], reverse=True)[:5]
+    assert result['posts'] == expected
+    print("✓ Streaming pipeline works")
+    return True
+
+
+def test_sentiment_batch_order():
+    """Pooled batch scoring returns the same results, in order, as scoring one by one"""
+    from app.services.sentiment_engine import SentimentPool, score_sentiment
+
+    texts = ["Great news for students!", "Exams were cancelled again, awful", "The bus was on time"] * 4
+    pool = SentimentPool(workers=2, min_batch=4, chunk_size=3)
+    try:
+        batched = pool.analyze_batch(texts)
+    finally:
+        pool.shutdown()
+    inline = [score_sentiment(pool.analyzer, text) for text in texts]
+    assert batched == inline
+    print("✓ Batch sentiment keeps input order")
+    return True
+
+
+def test_keyword_matcher():
+    """Whole-word, case-insensitive matching in one pass"""
+    from app.services.topic_taxonomy import youth_keyword_matcher, topic_relevance
+
+    text = "So happy: AI tools help students at university with mental health"
+    assert youth_keyword_matcher.find(text) == ['student', 'university', 'mental health', 'AI']
+    assert youth_keyword_matcher.count("app apps happy") == {'app': 2}
+    assert topic_relevance("Government launches student job scheme") == (2, 2)
+    print("✓ Keyword matcher works")
+    return True
+
+
+def test_sentiment_cache():
+    """Repeated content is scored once and versions do not share keys"""
+    from app.services.sentiment_cache import SentimentCache
+
+    calls = []
+
+    def compute(texts):
+        calls.append(list(texts))
+        return [{'overall': 'neutral', 'text': t} for t in texts]
+
+    cache = SentimentCache(path=None, max_size=10)
+    first = cache.get_or_compute(["Fees hiked  again", "Fees hiked again", "Hostel food"], compute)
+    again = cache.get_or_compute(["Fees hiked again"], compute)
+    assert calls == [["Fees hiked  again", "Hostel food"]]
+    assert first[0] is first[1] and again[0] is first[0]
+    stats = cache.stats()
+    assert (stats['memory_hits'], stats['misses']) == (1, 2)
+    assert SentimentCache(path=None, version='other').key("Fees hiked again") != cache.key("Fees hiked again")
+    print("✓ Sentiment cache works")
+    return True
+
+
+def test_tiered_sentiment():
+    """TextBlob only runs up front for ambiguous texts; otherwise on first read"""
+    import json
+    from app.services.sentiment_engine import score_sentiment
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+    analyzer = SentimentIntensityAnalyzer()
+    clear = score_sentiment(analyzer, "I absolutely love this wonderful scholarship!")
+    # Not computed yet: serialized as an explicit null
+    assert clear['tier'] == 'vader' and json.loads(json.dumps(clear))['textblob'] is None
+    assert clear['textblob']['polarity'] > 0 and clear['tier'] == 'vader+textblob'
+    assert json.loads(json.dumps(clear))['textblob'] == clear['textblob']
+
+    ambiguous = score_sentiment(analyzer, "The exam timetable was published")
+    assert ambiguous['tier'] == 'vader+textblob' and 'textblob' in json.loads(json.dumps(ambiguous))
+    assert score_sentiment(analyzer, "I love it!", detail=True)['tier'] == 'vader+textblob'
+    print("✓ Tiered sentiment works")
+    return True
+
+
+def test_topic_scoring():
+    """TF-IDF topic scores are deterministic and near-identical headlines collapse into one row"""
+    from app.services.topic_scoring import score_topics
+    from app.utils.simhash import simhash, simhash_many
+
+    items = [
+        {'text': 'Students protest rising college fees and job losses', 'source': 'BBC India RSS'},
+        {'text': 'Students protest rising college fees and job losses', 'source': 'The Hindu National RSS'},
+        {'text': 'Parliament passes budget law on election spending', 'source': 'BBC India RSS'},
+        {'text': 'Monsoon rain floods Mumbai suburbs', 'source': 'TOI Education RSS'},
+    ]
+    first = score_topics(items)
+    assert first == score_topics(items)
+    assert len(first) == 3
+
+    top, bottom = first[0], first[-1]
+    assert top['topic'].startswith('Students protest')
+    assert top['frequency'] == 2
+    assert top['sources'] == ['BBC India RSS', 'The Hindu National RSS']
+    assert top['gap_score'] > 0
+    assert bottom['topic'].startswith('Parliament') and bottom['gap_score'] < 0
+
+    texts = [item['text'] for item in items] + ['', '!!!']
+    assert simhash_many(texts) == [simhash(text) for text in texts]
+    print("✓ Topic scoring works")
+    return True
+
+def test_refreshing_cache():
+    """Cold reads are single-flighted and a failed refresh keeps the last good value"""
+    import threading
+    import time
+    from app.utils.refresh_cache import RefreshingCache
+
+    calls = []
+    results = iter([{'live': True, 'n': 1}, {'live': False, 'n': 2}, {'live': True, 'n': 3}])
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.1)
+        return next(results)
+
+    cache = RefreshingCache(loader, ttl=0.2, is_good=lambda value: value['live'], background=False)
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(cache.get()[0]['n'])) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1 and seen == [1] * 5
+
+    time.sleep(0.25)
+    value, info = cache.get()
+    assert value['n'] == 1 and info['stale']  # served stale while a refresh runs
+    time.sleep(0.2)
+    value, info = cache.get()
+    assert len(calls) == 2
+    assert value['n'] == 1 and info['last_known_good'] and info['last_error']
+
+    cache.refresh()
+    value, info = cache.get()
+    assert value['n'] == 3 and not info['stale'] and info['last_error'] is None
+    print("✓ Refreshing cache works")
+    return True
+
+def test_rss_reader():
+    """Feed items stream out normalized and parsing stops after max_items"""
+    from app.services.rss_reader import iter_feed_records
+
+    rss = b"""<?xml version="1.0"?><rss version="2.0"><channel><title>Feed title</title>
+    <item><title>Students rally for jobs</title><description><![CDATA[<p>Campus <b>protest</b></p>]]></description>
+    <link>https://example.com/1</link><pubDate>Mon, 01 Sep 2025 10:00:00 GMT</pubDate></item>
+    <item><title>Second story</title><link>https://example.com/2</link></item>
+    <item><title>Third story</title></item></channel></rss>"""
+    # Feed the document in small chunks, as a streamed response would
+    chunks = (rss[i:i + 40] for i in range(0, len(rss), 40))
+    records = list(iter_feed_records(chunks, max_items=2))
+    assert [r['title'] for r in records] == ['Students rally for jobs', 'Second story']
+    assert records[0]['description'] == 'Campus protest'
+    assert records[0]['link'] == 'https://example.com/1'
+    assert records[0]['pubDate'].startswith('Mon, 01 Sep 2025')
+
+    atom = b"""<feed xmlns="http://www.w3.org/2005/Atom"><title>Atom</title>
+    <entry><title>Exam results out</title><link rel="alternate" href="https://example.com/a"/>
+    <summary>Board results</summary><updated>2025-09-01T10:00:00Z</updated></entry></feed>"""
+    records = list(iter_feed_records([atom]))
+    assert records == [{'title': 'Exam results out', 'description': 'Board results',
+                        'link': 'https://example.com/a', 'pubDate': '2025-09-01T10:00:00Z'}]
+    print("✓ RSS reader works")
+    return True
+
+def test_mention_counters():
+    """Scrapes add to hourly buckets and windows are answered from range sums"""
+    import tempfile
+    from datetime import datetime, timedelta
+    from app import create_app
+    from app.services.mention_counter import MentionCounter, POLITICAL, YOUTH
+
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    previous_url = os.environ.get('DATABASE_URL')
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+    try:
+        app = create_app()
+        counter = MentionCounter()
+        counter.init_app(app)
+        now = datetime.utcnow()
+
+        posts = ["Students worried about jobs and exam stress", "Rent is eating my whole salary"]
+        assert counter.record_texts(posts, YOUTH, at=now) == 5
+        # The same posts on the next poll are not counted again
+        assert counter.record_texts(posts, YOUTH, at=now) == 0
+        counter.record_texts(["New jobs scheme announced", "Budget raises GST on fuel"], POLITICAL, at=now)
+        counter.record({'Jobs and Careers': 4}, YOUTH, at=now - timedelta(days=3))
+        counter.record({'Jobs and Careers': 7}, YOUTH, at=now - timedelta(days=40))
+
+        day = {row['topic']: row for row in counter.rollup('24h', now=now)}
+        assert day['Jobs and Careers']['youth_mentions'] == 2
+        assert day['Jobs and Careers']['politician_mentions'] == 1
+        assert day['Budget and Taxation']['gap_score'] == -1
+        week = {row['topic']: row for row in counter.rollup('7d', now=now)}
+        assert week['Jobs and Careers']['youth_mentions'] == 6
+        month = {row['topic']: row for row in counter.rollup('30d', now=now)}
+        assert month['Jobs and Careers']['youth_mentions'] == 6
+        assert month['Jobs and Careers']['trend']['youth_change'] == -1
+
+        # Existing buckets are incremented in place, by the upsert and by the fallback path
+        with app.app_context():
+            from app.services.mention_counter import bucket_start
+            assert counter.record({'Jobs and Careers': 3}, YOUTH, at=now) == 3
+            counter._read_modify_write({'Jobs and Careers': 1, 'Mental Health': 2}, YOUTH, bucket_start(now))
+        day = {row['topic']: row for row in counter.rollup('24h', now=now)}
+        assert day['Jobs and Careers']['youth_mentions'] == 6 and day['Mental Health']['youth_mentions'] >= 2
+    finally:
+        if previous_url is None:
+            os.environ.pop('DATABASE_URL', None)
+        else:
+            os.environ['DATABASE_URL'] = previous_url
+        os.remove(path)
+    print("✓ Mention counters work")
+    return True
+
+def test_broadcaster():
+    """Subscribers resume from the ring buffer and slow clients drop their oldest frames"""
+    from app.services.broadcaster import Broadcaster, HEARTBEAT_FRAME
+
+    hub = Broadcaster(ring_size=4, queue_size=2, heartbeat=0.05, redis_url='')
+    first = hub.publish('topics', {'n': 1})
+    # A new client gets the latest event straight away
+    fresh = hub.subscribe('topics')
+    assert fresh.get(0.1)[0] == first
+
+    slow = hub.subscribe('topics', last_event_id=first)
+    for n in range(2, 6):
+        hub.publish('topics', {'n': n})
+    assert slow.dropped == 2
+    frames = [slow.get(0.1)[1] for _ in range(2)]
+    assert frames[0].startswith('id: 4\n') and frames[1].endswith('data: {"n":5}\n\n')
+
+    # Resuming inside the ring replays only what was missed
+    resumed = hub.subscribe('topics', last_event_id=3)
+    assert [resumed.get(0.1)[0] for _ in range(2)] == [4, 5] and not resumed.missed
+    # Ids older than the ring are flagged so the client can refetch
+    assert hub.subscribe('topics', last_event_id=0).missed
+
+    stream = hub.stream('topics', last_event_id=5)
+    assert next(stream).startswith('retry:')
+    assert next(stream) == HEARTBEAT_FRAME
+    hub.publish('topics', {'n': 6})
+    assert next(stream).startswith('id: 6\n')
+    stream.close()
+    assert hub.subscriber_count('topics') == 4
+
+    # Concurrent publishers get distinct ids and no event is lost
+    import threading
+    watcher = hub.subscribe('race', replay_latest=False)
+    watcher.max_size = 1000
+    workers = [threading.Thread(target=lambda: [hub.publish('race', {'n': n}) for n in range(50)])
+               for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    received = [watcher.get(0.1)[0] for _ in range(200)]
+    assert received == list(range(1, 201)) and hub.last_event_id('race') == 200
+    print("✓ Broadcaster works")
+    return True
+
+def test_stream_deltas():
+    """Streams open with a snapshot, send small deltas, and resync clients that fell behind"""
+    import json
+    from app.services.broadcaster import Broadcaster
+    from app.services.stream_deltas import DeltaPublisher
+
+    def frame_data(frame):
+        lines = dict(line.split(': ', 1) for line in frame.strip().split('\n'))
+        return int(lines['id']), lines['event'], json.loads(lines['data'])
+
+    hub = Broadcaster(ring_size=8, queue_size=2, heartbeat=0.05, redis_url='')
+    publisher = DeltaPublisher('topics', ('data',), key=lambda row: row['topic'], hub=hub)
+    rows = [{'topic': f'Topic {i}', 'youth_mentions': 40 + i, 'gap_score': i, 'description': 'x' * 200}
+            for i in range(30)]
+    state = {'data': rows, 'metadata': {'timestamp': 't0', 'data_source': 'live_scraped'}}
+    first = publisher.publish(state)
+    assert publisher.publish(state) is None  # nothing changed, nothing sent
+
+    stream = hub.stream_with_snapshot('topics')
+    next(stream)  # retry hint
+    event_id, event, client_state = frame_data(next(stream))
+    assert (event_id, event) == (first, 'snapshot') and client_state == state
+
+    rows = [dict(row) for row in rows]
+    rows[5]['youth_mentions'] = 90
+    rows.insert(0, rows.pop(5))
+    rows.pop()
+    state = {'data': rows, 'metadata': {'timestamp': 't1', 'data_source': 'live_scraped'}}
+    publisher.publish(state)
+    delta_frame = next(stream)
+    event_id, event, delta = frame_data(delta_frame)
+    assert event == 'delta' and delta['base'] == first
+    assert delta['items']['removed'] == ['Topic 29'] and delta['patch'] == {'metadata': {'timestamp': 't1'}}
+    assert publisher.apply(client_state, delta) == state
+    assert len(delta_frame) * 10 < len(json.dumps(state))
+
+    # A client resuming from an id that is still in the ring gets only the delta
+    resumed = hub.stream_with_snapshot('topics', last_event_id=first)
+    next(resumed)
+    assert frame_data(next(resumed))[1] == 'delta'
+
+    # A client whose queue overflowed gets the full state instead of a broken delta chain
+    slow = hub.subscribe('topics', last_event_id=event_id)
+    lagging = hub.stream_with_snapshot('topics', last_event_id=event_id)
+    next(lagging)
+    for n in range(3):
+        state = {'data': rows, 'metadata': {'timestamp': f't{n + 2}', 'data_source': 'live_scraped'}}
+        latest = publisher.publish(state)
+    assert slow.dropped == 1
+    resync_id, event, resync_state = frame_data(next(lagging))
+    assert (resync_id, event) == (latest, 'resync') and resync_state == state
+    for generator in (stream, resumed, lagging):
+        generator.close()
+    print("✓ Stream deltas work")
+    return True
+
+def test_scraping_metrics():
+    """Instrumented scrapers record per-source runs, fetch/parse time, yield and errors"""
+    import time
+    import requests
+    from app.services.scraping_metrics import ScrapingMetrics
+
+    metrics = ScrapingMetrics()
+
+    class FakeSession:
+        def get(self, url, **kwargs):
+            time.sleep(0.02)
+            response = requests.Response()
+            response.status_code = 404 if 'missing' in url else 200
+            response._content = b'<rss>' * 10
+            response.url = url
+            return response
+
+    session = FakeSession()
+
+    @metrics.instrument('feed')
+    def scrape_feed():
+        for url in ('https://example.com/a', 'https://example.com/missing'):
+            response = metrics.get(url, session=session)
+            if response.status_code == 200:
+                yield {'content': 'post'}
+                yield {'content': 'post'}
+
+    @metrics.instrument('broken')
+    def scrape_broken():
+        raise ValueError('markup changed')
+
+    consumed = []
+    for post in scrape_feed():
+        time.sleep(0.05)  # consumer work is not charged to the source
+        consumed.append(post)
+    try:
+        scrape_broken()
+    except ValueError:
+        pass
+    with metrics.timed('feed', 'sentiment'):
+        time.sleep(0.01)
+
+    snapshot = metrics.snapshot()
+    feed = snapshot['feed']
+    assert feed['runs'] == 1 and feed['items_yielded'] == 2 == len(consumed)
+    assert feed['errors'] == 1 and feed['bytes'] == 100
+    assert feed['last_run']['http_status'] == 404
+    assert 0.04 <= feed['last_run']['fetch_seconds'] <= feed['last_run']['duration_seconds'] < 0.09
+    assert feed['durations']['sentiment']['count'] == 1
+    assert snapshot['broken']['errors'] == 1 and snapshot['broken']['last_run']['last_error'] == 'markup changed'
+    print("✓ Scraping metrics work")
+    return True
+
+def test_twitter_paging():
+    """Polls follow next_token (up to a cap) and cached tweets stay with their hashtags"""
+    import tempfile
+    from types import SimpleNamespace
+    from app.services.twitter_polling import TwitterPollState, iter_search_pages
+
+    pages = {None: (['3', '2'], {'newest_id': '3', 'next_token': 'p2'}),
+             'p2': (['1'], {'newest_id': '1'})}
+    calls = []
+
+    def search(**params):
+        calls.append(params)
+        ids, meta = pages[params.get('next_token')]
+        return SimpleNamespace(data=[SimpleNamespace(id=i) for i in ids], meta=meta)
+
+    responses = list(iter_search_pages(search, '#a', '0', 10, tweet_fields=['created_at']))
+    assert [t.id for r in responses for t in r.data] == ['3', '2', '1']
+    assert calls[0]['since_id'] == '0' and 'next_token' not in calls[0] and calls[1]['next_token'] == 'p2'
+    assert calls[1]['tweet_fields'] == ['created_at']
+    assert len(list(iter_search_pages(search, '#a', '0', 10, max_pages=1))) == 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state = TwitterPollState(path=os.path.join(tmp, 'state.json'))
+        state.remember('1', {'tweet_id': '1', 'hashtag': '#Nepal'})
+        state.remember('2', {'tweet_id': '2', 'hashtag': '#GenZ'})
+        state.remember('3', None)
+        assert [p['tweet_id'] for p in state.cached_posts()] == ['2', '1']
+        assert [p['tweet_id'] for p in state.cached_posts(['#nepal'])] == ['1']
+
+        # A restart (or another worker) gets the cached tweets along with the watermarks
+        from datetime import datetime
+        state.remember('4', {'tweet_id': '4', 'hashtag': '#GenZ', 'created_at': datetime(2026, 1, 2)})
+        state.advance(['#GenZ'], '5')
+        state.save()
+        reloaded = TwitterPollState(path=state.path, cache_size=3)
+        assert reloaded.since_ids == {'#genz': '5'}
+        assert [p['tweet_id'] for p in reloaded.cached_posts()] == ['4', '2']
+        assert reloaded.cached_posts()[0]['created_at'] == '2026-01-02T00:00:00' and reloaded.is_scored('3')
+
+        # Watermarks saved without their tweets are not trusted
+        with open(state.path, 'w') as f:
+            f.write('{"since_ids": {"#genz": "5"}}')
+        assert TwitterPollState(path=state.path).since_ids == {}
+    print("✓ Twitter paging works")
+    return True
+
+def main():
+    tests = [
+        test_near_duplicate_index,
+        test_merge_near_duplicate,
+        test_streaming_pipeline,
+        test_sentiment_batch_order,
+        test_keyword_matcher,
+        test_sentiment_cache,
+        test_tiered_sentiment,
+        test_topic_scoring,
+        test_refreshing_cache,
+        test_rss_reader,
+        test_mention_counters,
+        test_broadcaster,
+        test_stream_deltas,
+        test_scraping_metrics,
+        test_twitter_paging,
+    ]
+    passed = sum(1 for test in tests if test())
+    print(f"Results: {passed}/{len(tests)} tests passed")
+
+
+if __name__ == "__main__":
+    main()